@@ -79,6 +79,7 @@ if not PYPY:
 
     for mod_name, deps in (
             ('singleton', ()),
+            ('integer_strings', ()),
             ('_base_interfaces', ()),
             ('internalization.legacy_factories', ()),
             ('internalization.factories', ()),
@@ -94,6 +95,7 @@ if not PYPY:
             ('externalization.dictionary', ('_base_interfaces',)),
             ('externalization.externalizer', ('_base_interfaces',)),
             ('externalization.decorate', ()),
+            ('externalization.leaves', ('_base_interfaces',)),
             #('externalization', ('_base_interfaces',)),
             ('_interface_cache', ()),
             ('datastructures', (
@@ -148,7 +150,7 @@ if not PYPY:
 
 setup(
     name='nti.externalization',
-    version='3.3.2.dev0',
+    version='3.4.0.dev0',
     author='Jason Madden',
     author_email='jason@seecoresoftware.com',
     description="NTI Externalization",
@@ -215,7 +217,10 @@ setup(
         ],
         'orjson': [
             'orjson >= 3.11.9',
-        ]
+        ],
+        'msgpack': [
+            'msgpack >= 1.0.0',
+        ],
     },
     entry_points=entry_points,
     python_requires=">=3.11",
@@ -63,6 +63,9 @@ cpdef StandardInternalFields get_standard_internal_fields()
 @cython.final
 cdef class ExternalizationPolicy(object):
     cdef readonly bint use_iso8601_for_unix_timestamp
+    cdef readonly dict leaf_converters
+    cdef object _decimal_converter
+    cdef object __weakref__
 
 cdef ExternalizationPolicy DEFAULT_EXTERNALIZATION_POLICY
 
@@ -9,6 +9,7 @@ cdef class InterfaceCache(object):
     cdef __weakref__
     cdef iface
     cdef frozenset ext_all_possible_keys
+    cdef dict ext_ordered_keys
     cdef ext_accept_external_id
     cdef frozenset ext_primitive_out_ivars
     cdef dict modified_event_attributes
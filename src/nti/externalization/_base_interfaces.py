@@ -287,18 +287,44 @@ class ExternalizationPolicy(object):
 
     __slots__ = (
         'use_iso8601_for_unix_timestamp',
+        'leaf_converters',
+        '_decimal_converter',
+        '__weakref__',
     )
 
-    def __init__(self, use_iso8601_for_unix_timestamp=False):
+    def __init__(self, use_iso8601_for_unix_timestamp=False, leaf_converters=None):
+        """
+        .. versionchanged:: 3.4.0
+           Add *leaf_converters*.
+        """
         #: Should unix timestamp fields be output as their numeric value,
         #: or be converted into an ISO 8601 timestamp string? By default,
         #: the numeric value is output. This is known to specifically apply
         #: to "Created Time" and "Last Modified."
         self.use_iso8601_for_unix_timestamp = use_iso8601_for_unix_timestamp
+        #: A dictionary mapping exact types to functions of one argument
+        #: that externalize values of that type, or None. Values of those
+        #: types are externalized by calling the function, without any
+        #: adapters or decorators; a None value makes values of that type
+        #: go through the full externalization process. Other values are
+        #: looked up in the table built by
+        #: :func:`nti.externalization.externalization.leaves.find_leaf_converter`.
+        #:
+        #: :class:`decimal.Decimal` is otherwise treated as a primitive
+        #: and passed through unchanged; an entry for it here is applied
+        #: to every Decimal value, including those found directly in
+        #: dictionaries and sequences.
+        #:
+        #: This should not be modified.
+        self.leaf_converters = dict(leaf_converters) if leaf_converters else None
+        # Looked up once here because the driver checks it for
+        # every primitive value in a container.
+        self._decimal_converter = (self.leaf_converters or {}).get(decimal.Decimal)
 
     def __repr__(self): # pragma: no cover
-        return "ExternalizationPolicy(use_iso8601_for_unix_timestamp=%s)" % (
-            self.use_iso8601_for_unix_timestamp
+        return "ExternalizationPolicy(use_iso8601_for_unix_timestamp=%s, leaf_converters=%r)" % (
+            self.use_iso8601_for_unix_timestamp,
+            self.leaf_converters,
         )
 
 #: The default externalization policy.
@@ -55,6 +55,7 @@ cdef class AbstractDynamicObjectIO(ExternalizableDictionaryMixin):
     cpdef _ext_getattr(self, ext_self, k, default=*)
     cpdef _ext_replacement_getattr(self, k, default=*)
 
+    cpdef _ext_ordered_keys(self)
     @cython.locals(
         k=str # cython can optimize k.startswith('constantstring')
     )
@@ -71,10 +72,16 @@ cdef class _ExternalizableInstanceDict(AbstractDynamicObjectIO):
     cdef context
 
     cpdef _ext_accept_update_key(self, k, ext_self, ext_keys)
+    cpdef frozenset _ext_all_possible_keys(self)
+    @cython.locals(
+        keys=frozenset,
+        ordered=list,
+    )
+    cpdef _ext_ordered_keys(self)
     @cython.locals(
         ext_dict=dict,
     )
-    cpdef frozenset _ext_all_possible_keys(self)
+    cdef dict _ext_instance_dict(self)
 
 cdef class InterfaceObjectIO(AbstractDynamicObjectIO):
     cdef readonly _ext_self
@@ -88,6 +95,14 @@ cdef class InterfaceObjectIO(AbstractDynamicObjectIO):
 
     cpdef _ext_find_schema(self, ext_self, iface_upper_bound)
     cpdef _ext_find_primitive_keys(self)
+    @cython.locals(
+        keys=frozenset,
+        by_keys=dict,
+        ordered=tuple,
+        by_order=list,
+        schemas=list,
+    )
+    cpdef _ext_ordered_keys(self)
     cpdef _ext_schemas_to_consider(self, ext_self)
     cpdef _validate_after_update(self, iface, ext_self)
 
@@ -101,3 +116,5 @@ cdef class ModuleScopedInterfaceObjectIO(InterfaceObjectIO):
 
 
 cdef tuple _primitives
+cdef _NO_ORDER
+cdef _MAX_ORDERED_KEY_SETS
@@ -0,0 +1,25 @@
+# definitions for integer_strings.py
+import cython
+
+# Imports
+cdef string
+
+# Constants
+cdef unicode _VERSION
+cdef unicode _REMOVED
+cdef unicode _REPLACE
+cdef unicode _VOCABULARY
+cdef _BASE
+cdef dict _DIGIT_VALUES
+cdef _BASE_SQUARED
+cdef tuple _DIGIT_PAIRS
+cdef unicode _ZERO_MARKER
+
+
+cpdef from_external_string(key)
+
+@cython.locals(pairs=list)
+cpdef unicode to_external_string(integer)
+
+cpdef list to_external_strings(integers)
+cpdef list from_external_strings(keys)
@@ -24,6 +24,7 @@ class InterfaceCache(object):
     __slots__ = (
         'iface',
         'ext_all_possible_keys',
+        'ext_ordered_keys',
         'ext_accept_external_id',
         'ext_primitive_out_ivars',
         'modified_event_attributes',
@@ -33,6 +34,8 @@ class InterfaceCache(object):
     def __init__(self):
         self.iface = None
         self.ext_all_possible_keys = None
+        # {ext_all_possible_keys: ordered tuple}
+        self.ext_ordered_keys = None
         self.ext_accept_external_id = None
         self.ext_primitive_out_ivars = None
         # {'attrname': InterfaceDeclaringAttrname}
@@ -5,7 +5,11 @@ Support for handling the IO for all the objects in a *package*,
 typically via a ZCML directive.
 """
 
+import importlib.util
+import json
 import logging
+import os
+import sys
 from collections.abc import Iterable
 
 from zope import interface
@@ -27,6 +31,129 @@ logger = logging.getLogger(__name__)
 class _ClassNameRegistry(object):
     __name__ = ''
 
+
+class AutoPackageManifest(object):
+    """
+    A JSON file that records the results of scanning modules for
+    factories, so that later processes can skip the scanning.
+
+    Each entry is stored under a key, together with a *stamp* (see
+    :meth:`stamp`) describing the modules that the results were
+    derived from; it's only used while the stamp still matches. Any
+    number of processes may share the file: an entry is written by
+    reading the file again, adding the entry, and atomically
+    replacing the file. A manifest that can't be read is treated as
+    empty, and one that can't be written is ignored.
+
+    Use :func:`get_manifest` to share one instance for each path.
+
+    .. versionadded:: 3.4.0
+    """
+
+    #: The version of the file format.
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != self.VERSION:
+            return {}
+        entries = data.get('entries')
+        return entries if isinstance(entries, dict) else {}
+
+    @staticmethod
+    def stamp(modules):
+        """
+        Return a list describing the files of *modules* (their
+        names, modification times and sizes), or None if any of them
+        can't be found. Built-in modules are ignored.
+
+        *modules* may also contain the names of modules; those are
+        found without being imported (though their parent packages
+        are).
+        """
+        by_name = {}
+        for module in modules:
+            if isinstance(module, str):
+                try:
+                    spec = importlib.util.find_spec(module)
+                except (ImportError, ValueError):
+                    return None
+                if spec is None:
+                    return None
+                if spec.has_location:
+                    by_name[module] = spec.origin
+            elif module is not None and hasattr(module, '__file__'):
+                by_name[module.__name__] = module.__file__
+        result = []
+        for name, path in sorted(by_name.items()):
+            try:
+                st = os.stat(path)
+            except (TypeError, OSError):
+                return None
+            result.append([name, st.st_mtime_ns, st.st_size])
+        return result
+
+    def get(self, key, stamp):
+        """
+        Return the value recorded for *key*, or None if there is none
+        or it was recorded with a different *stamp*.
+        """
+        entry = self._entries.get(key)
+        if stamp is not None and isinstance(entry, dict) and entry.get('stamp') == stamp:
+            return entry.get('value')
+        return None
+
+    def set(self, key, stamp, value):
+        """
+        Record *value*, which must be serializable as JSON, for *key*
+        and *stamp*, and write the file.
+        """
+        if stamp is None:
+            return
+        entry = {'stamp': stamp, 'value': value}
+        self._entries[key] = entry
+        entries = self._read()
+        entries[key] = entry
+        tmp = '%s.%d.tmp' % (self.path, os.getpid())
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'entries': entries}, f, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError:
+            logger.warning("Failed to write autopackage manifest %s", self.path, exc_info=True)
+
+
+_manifests = {}
+
+try:
+    from zope.testing import cleanup
+except ImportError: # pragma: no cover
+    pass
+else:
+    cleanup.addCleanUp(_manifests.clear)
+
+
+def get_manifest(path):
+    """
+    Return the :class:`AutoPackageManifest` for *path*, reading it
+    only the first time.
+
+    .. versionadded:: 3.4.0
+    """
+    path = os.path.abspath(path)
+    try:
+        return _manifests[path]
+    except KeyError:
+        return _manifests.setdefault(path, AutoPackageManifest(path))
+
 class AutoPackageSearchingScopedInterfaceObjectIO(ModuleScopedInterfaceObjectIO):
     """
     A special, magic, type of interface-driven input and output, one designed
@@ -47,6 +174,14 @@ class AutoPackageSearchingScopedInterfaceObjectIO(ModuleScopedInterfaceObjectIO)
     You can still customize the behaviour by providing the ``iobase`` argument.
     """
 
+    #: If set to an :class:`AutoPackageManifest`, the classes found by
+    #: :meth:`_ap_find_factories` are recorded there, and later
+    #: processes only examine those classes instead of every class in
+    #: every module. See :meth:`_ap_manifest_stamp`.
+    #:
+    #: .. versionadded:: 3.4.0
+    _ap_manifest = None
+
     @staticmethod
     def _ap_iface_queryTaggedValue(iface, name):
         # zope.interface 4.7.0 caused tagged values to become
@@ -171,31 +306,96 @@ class AutoPackageSearchingScopedInterfaceObjectIO(ModuleScopedInterfaceObjectIO)
 
         Each class that is found is also marked as implementing
         :class:`zope.mimetype.interfaces.IContentTypeAware`.
+
+        .. versionchanged:: 3.4.0
+           Use the :attr:`_ap_manifest`, if there is one.
         """
 
         registry = _ClassNameRegistry()
         registry.__name__ = package_name
 
-        for mod_name in cls._ap_enumerate_module_names():
-            mod = dottedname.resolve(package_name + '.' + mod_name)
+        modules = [dottedname.resolve(package_name + '.' + mod_name)
+                   for mod_name in cls._ap_enumerate_module_names()]
+
+        manifest = cls._ap_manifest
+        key = stamp = recorded = None
+        if manifest is not None:
+            ifaces = cls._ap_enumerate_externalizable_root_interfaces(cls._ext_search_module)
+            key = 'factories:%s:%s:%s' % (
+                package_name,
+                ','.join(sorted(mod.__name__ for mod in modules)),
+                ','.join(sorted(iface.__identifier__ for iface in ifaces)))
+            stamp = cls._ap_manifest_stamp(modules)
+            recorded = manifest.get(key, stamp)
+
+        if recorded is not None:
+            for mod in modules:
+                for name in recorded.get(mod.__name__, ()):
+                    potential_factory = getattr(mod, name, None)
+                    if potential_factory is not None:
+                        cls._ap_handle_one_potential_factory_class(registry,
+                                                                   package_name,
+                                                                   potential_factory)
+            return registry
+
+        found = {}
+        cacheable = True
+        for mod in modules:
+            names = {id(v): k for k, v in vars(mod).items()}
+            found_in_mod = found[mod.__name__] = []
             for potential_factory in cls._ap_find_potential_factories_in_module(mod):
-                cls._ap_handle_one_potential_factory_class(registry,
-                                                           package_name,
-                                                           potential_factory)
+                if cls._ap_handle_one_potential_factory_class(registry,
+                                                              package_name,
+                                                              potential_factory):
+                    name = names.get(id(potential_factory))
+                    if name is None:
+                        # Not something we could find again
+                        cacheable = False
+                    else:
+                        found_in_mod.append(name)
+
+        if manifest is not None and cacheable:
+            manifest.set(key, stamp, found)
         return registry
 
+    @classmethod
+    def _ap_manifest_stamp(cls, modules):
+        """
+        Return the stamp (see :meth:`AutoPackageManifest.stamp`) for
+        the classes found in *modules*.
+
+        This covers the *modules* themselves, the interface module
+        (:meth:`_ap_find_package_interface_module`), the modules
+        defining the root interfaces, and the modules defining this
+        class and its bases. If a class becomes externalizable
+        because of a change anywhere else, the manifest must be
+        deleted.
+
+        .. versionadded:: 3.4.0
+        """
+        related = list(modules)
+        iface_module = getattr(cls, '_ext_search_module', None)
+        related.append(iface_module)
+        if iface_module is not None:
+            related.extend(sys.modules.get(iface.__module__)
+                           for iface in cls._ap_enumerate_externalizable_root_interfaces(
+                               iface_module))
+        related.extend(sys.modules.get(kind.__module__) for kind in cls.__mro__)
+        return AutoPackageManifest.stamp(related)
+
     @classmethod
     def _ap_handle_one_potential_factory_class(cls, namespace, package_name, implementation_class):
         # Private helper function
         # Does this implement something that should be externalizable?
         # Recall that __external_class_name__ was set on the root interfaces
         # identified by ``_ap_enumerate_externalizable_root_interfaces()`` in ``__class_init__``
+        # Returns whether it was.
 
         interfaces_implemented = list(interface.implementedBy(implementation_class))
         check_ext = any(cls._ap_iface_queryTaggedValue(iface, '__external_class_name__')
                         for iface in interfaces_implemented)
         if not check_ext:
-            return
+            return False
 
         most_derived = find_most_derived_interface(None, interface.Interface,
                                                    interfaces_implemented)
@@ -246,6 +446,7 @@ class AutoPackageSearchingScopedInterfaceObjectIO(ModuleScopedInterfaceObjectIO)
             # Let them have containers
             if not hasattr(implementation_class, 'containerId'):
                 implementation_class.containerId = None
+        return True
 
     @classmethod
     def _ap_find_package_name(cls) -> str:
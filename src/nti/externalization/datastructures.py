@@ -11,6 +11,7 @@ Datastructures to help externalization.
 # pylint:disable=keyword-arg-before-vararg
 # stdlib imports
 import numbers
+import sys
 import warnings
 from collections.abc import Collection
 from collections.abc import Mapping
@@ -239,6 +240,20 @@ class AbstractDynamicObjectIO(ExternalizableDictionaryMixin):
         """
         return self._ext_getattr(self._ext_replacement(), name, default)
 
+    def _ext_ordered_keys(self):
+        """
+        Return an iterable of the keys from :meth:`_ext_all_possible_keys`,
+        in the order they should appear in the external dictionary.
+
+        This implementation simply returns :meth:`_ext_all_possible_keys`,
+        whose iteration order can vary between processes. Subclasses that
+        know a fixed order should override this so that their external
+        form is byte-for-byte reproducible without sorting it.
+
+        .. versionadded:: 3.4.0
+        """
+        return self._ext_all_possible_keys()
+
     def _ext_keys(self):
         """
         Return only the names of attributes that should be externalized.
@@ -249,13 +264,16 @@ class AbstractDynamicObjectIO(ExternalizableDictionaryMixin):
         and those listed in ``_excluded_in_ivars_``.
 
         This method must return a set of native strings.
+
+        .. versionchanged:: 3.4.0
+           Return the keys in the order of :meth:`_ext_ordered_keys`.
         """
         # Sadly, we cannot yet enforce what type _excluded_out_ivars_ is.
         # Mostly it is a set or frozen set (depending on how it was
         # combined with the declaration in this class) but some overrides
         # in the wild have it as a tuple. We need a metaclass to fix that.
         excluded = self._excluded_out_ivars_
-        return [k for k in self._ext_all_possible_keys()
+        return [k for k in self._ext_ordered_keys()
                 if (k not in excluded  # specifically excluded
                     and not k.startswith('_'))]  # private
         # and not callable(getattr(ext_self,k)))]    # avoid functions
@@ -401,6 +419,21 @@ class _ExternalizableInstanceDict(AbstractDynamicObjectIO):
         return self.context
 
     def _ext_all_possible_keys(self):
+        return frozenset(self._ext_instance_dict())
+
+    def _ext_ordered_keys(self):
+        # The order of the instance dictionary, which is the order
+        # the attributes were first assigned (and is preserved by
+        # pickling). Subclasses may override _ext_all_possible_keys,
+        # so only its keys are used, and any it adds come last, in
+        # name order.
+        keys = self._ext_all_possible_keys()
+        ordered = [k for k in self._ext_instance_dict() if k in keys]
+        if len(ordered) != len(keys):
+            ordered.extend(sorted(keys.difference(ordered)))
+        return ordered
+
+    def _ext_instance_dict(self):
         # Be sure that this returns native strings, even if the dict
         # has unicode (Python 2) or bytes (Python 3) values.
         # Because we are likely to turn around and pass the strings
@@ -423,7 +456,7 @@ class _ExternalizableInstanceDict(AbstractDynamicObjectIO):
                         ext_dict[new_k] = val
 
                 break
-        return frozenset(ext_dict)
+        return ext_dict
 
     def _ext_getattr(self, ext_self, k, default=NotGiven):
         if default is NotGiven:
@@ -500,6 +533,9 @@ class ExternalizableInstanceDict(object):
 interface.classImplements(ExternalizableInstanceDict, IInternalObjectIO)
 
 _primitives = (str, numbers.Number, bool)
+# Sorts attributes that aren't fields after those that are.
+_NO_ORDER = sys.maxsize
+_MAX_ORDERED_KEY_SETS = 32
 
 class _AnonymousDictFactory(AnonymousObjectFactory):
     __external_factory_wants_arg__ = True
@@ -641,6 +677,46 @@ class InterfaceObjectIO(AbstractDynamicObjectIO):
             ])
         return cache.ext_all_possible_keys
 
+    def _ext_ordered_keys(self):
+        """
+        Return the keys in the order their fields were defined (see
+        :func:`zope.schema.getFieldNamesInOrder`), followed by any
+        other attributes in name order.
+
+        A key's field is looked for in the schema and then in each of
+        the :meth:`_ext_schemas_to_consider`.
+
+        .. versionadded:: 3.4.0
+        """
+        keys = self._ext_all_possible_keys()
+        cache = cache_for(self, self._ext_self)
+        # {ext_all_possible_keys: ordered}. Subclasses may override
+        # _ext_all_possible_keys to return something other than the
+        # (cached, so identical each time) schema names.
+        by_keys = cache.ext_ordered_keys
+        if by_keys is None:
+            by_keys = cache.ext_ordered_keys = {}
+        ordered = by_keys.get(keys)
+        if ordered is None:
+            schemas = [self._iface]
+            schemas.extend(self._ext_schemas_to_consider(self._ext_self))
+            by_order = []
+            for n in keys:
+                order = _NO_ORDER
+                for schema in schemas:
+                    order = getattr(schema.get(n), 'order', _NO_ORDER)
+                    if order != _NO_ORDER:
+                        break
+                by_order.append((order, n))
+            # (No lambda for a sort key: Cython doesn't allow closures here.)
+            by_order.sort()
+            ordered = tuple([n for _, n in by_order])
+            if len(by_keys) >= _MAX_ORDERED_KEY_SETS:
+                # Only overrides that vary per object get here.
+                by_keys.clear()
+            by_keys[keys] = ordered
+        return ordered
+
     def _ext_getattr(self, ext_self, k, default=NotGiven):
         # TODO: Should this be directed through IField.get?
         if default is NotGiven:
@@ -33,6 +33,8 @@ from .interfaces import StandardExternalFields
 __all__ = [
     'get_current_request',
     'set_external_identifiers',
+    'prepare_external_identifiers',
+    'prefetch_external_objects',
 ]
 
 @hookable
@@ -91,3 +93,47 @@ def set_external_identifiers(self, result):
         result[_StandardExternalFields_OID] = oid
         result[_StandardExternalFields_NTIID] = ntiid
     return (oid, ntiid)
+
+
+@hookable
+def prepare_external_identifiers(objects):
+    """
+    prepare_external_identifiers(objects) -> None
+
+    Called with a sequence of objects that are about to be
+    externalized together, before `set_external_identifiers` is called
+    for each of them, giving a chance to compute their identifiers in
+    bulk.
+
+    By default, this does nothing. Applications using the default
+    `set_external_identifiers` whose sequences hold many persistent
+    objects may want to install `.prepare_external_oids`, which
+    caches the results where `.to_external_oid` will find them::
+
+        from nti.externalization.oids import prepare_external_oids
+        prepare_external_identifiers.sethook(prepare_external_oids)
+
+    This is called when externalizing a sequence.
+
+    .. versionadded:: 3.4.0
+    """
+
+
+@hookable
+def prefetch_external_objects(objects):
+    """
+    prefetch_external_objects(objects) -> None
+
+    Called with the items of a sequence, or the values of a mapping,
+    before they are externalized one at a time, giving a chance to
+    load them in bulk.
+
+    By default, this does nothing. Applications whose ZODB storage can
+    prefetch (such as ZEO or RelStorage) will usually want to install
+    `nti.externalization.persistence.prefetch_ghosts`::
+
+        from nti.externalization.persistence import prefetch_ghosts
+        prefetch_external_objects.sethook(prefetch_ghosts)
+
+    .. versionadded:: 3.4.0
+    """
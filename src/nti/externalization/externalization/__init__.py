@@ -26,12 +26,16 @@ from nti.externalization._base_interfaces import isSyntheticKey
 from nti.externalization.extension_points import get_current_request
 
 from .decorate import decorate_external_mapping as _decorate_external_mapping
+from .delta import apply_external_delta
+from .delta import to_external_delta
 from .dictionary import to_minimal_standard_external_dictionary
 from .dictionary import to_standard_external_dictionary
 from .externalizer import to_external_object
+from .references import collapse_shared_references
 from .fields import choose_field
 from .replacers import NonExternalizableObjectError
 from .standard_fields import SYSTEM_USER_NAME
+from .standard_fields import LastModifiedCollector
 from .standard_fields import get_created_time
 from .standard_fields import get_last_modified_time
 
@@ -40,6 +44,7 @@ __all__ = [
     'NonExternalizableObjectError',
     'get_last_modified_time',
     'get_created_time',
+    'LastModifiedCollector',
 
     'to_standard_external_dictionary',
     'to_minimal_standard_external_dictionary',
@@ -47,6 +52,9 @@ __all__ = [
     'decorate_external_mapping',
 
     'to_external_object',
+    'to_external_delta',
+    'apply_external_delta',
+    'collapse_shared_references',
     'catch_replace_action',
 ]
 
@@ -6,9 +6,14 @@ from nti.externalization.__base_interfaces cimport LocatedExternalDict as LED
 from nti.externalization.__base_interfaces cimport ExternalizationPolicy
 from nti.externalization.__base_interfaces cimport get_default_externalization_policy
 from nti.externalization.externalization._decorate cimport decorate_external_object
+from nti.externalization.externalization._leaves cimport find_leaf_converter
+from nti.externalization.externalization._standard_fields cimport get_last_modified_time
+from nti.externalization.__base_interfaces cimport get_standard_external_fields
+from nti.externalization.__base_interfaces cimport StandardExternalFields as SEF
 
 # Imports
 cdef defaultdict
+cdef Decimal
 cdef six
 cdef numbers
 
@@ -21,6 +26,8 @@ cdef IFiniteSequence
 cdef ThreadLocalManager
 cdef get_current_request
 cdef set_external_identifiers
+cdef prepare_external_identifiers
+cdef prefetch_external_objects
 cdef IExternalStandardDictionaryDecorator
 cdef IExternalObject
 cdef IExternalObjectDecorator
@@ -32,6 +39,7 @@ cdef NotGiven
 cdef IInternalObjectExternalizer
 cdef IExternalizationPolicy
 cdef ExternalizationPolicy DEFAULT_EXTERNALIZATION_POLICY
+cdef SEF StandardExternalFields
 
 # Constants
 cdef logger
@@ -61,6 +69,8 @@ cdef class _ExternalizationState(object):
     cdef decorate_callback
 
     cdef ExternalizationPolicy policy
+    cdef fragment_cache
+    cdef last_modified_collector
 
     cdef dict _kwargs
 
@@ -86,7 +96,9 @@ cpdef to_external_object(
     decorate_callback=*,
     default_non_externalizable_replacer=*,
     policy_name=*,
-    policy=*
+    policy=*,
+    fragment_cache=*,
+    last_modified_collector=*
 )
 
 cdef LED _externalize_mapping(obj, _ExternalizationState state)
@@ -103,6 +115,12 @@ cpdef _obj_has_usable_externalObject(obj)
 
 cdef _externalize_object(obj, _ExternalizationState state)
 
+cdef _externalize_and_decorate(obj, _ExternalizationState state)
+
+cdef _collect_last_modified(obj, result, collector)
+
+cpdef ExternalizationPolicy _current_policy()
+
 @cython.locals(
     obj_has_usable_external_object=bint,
 )
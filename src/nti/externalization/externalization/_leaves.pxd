@@ -0,0 +1,35 @@
+# definitions for leaves.py
+import cython
+
+from nti.externalization.__base_interfaces cimport ExternalizationPolicy
+
+# Imports
+cdef WeakKeyDictionary
+cdef ref
+cdef getSiteManager
+cdef implementedBy
+cdef IExternalObjectDecorator
+cdef IInternalObjectExternalizer
+
+# Constants
+cdef _NOT_SEEDED
+cdef _tables
+
+
+@cython.final
+@cython.internal
+cdef class _LeafConverterTable(object):
+    cdef readonly registry
+    cdef readonly generation
+    cdef readonly dict converters
+
+cdef _LeafConverterTable _last_table
+
+cdef bint _has_decorators(components, spec) except -1
+
+cdef _seed(components, kind, obj, name)
+
+@cython.locals(
+    table=_LeafConverterTable,
+)
+cpdef find_leaf_converter(obj, name, ExternalizationPolicy policy)
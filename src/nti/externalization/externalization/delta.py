@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Externalizing only what changed.
+
+The documents produced here are `JSON merge patches
+<https://www.rfc-editor.org/rfc/rfc7386>`_: a mapping holds only the
+keys whose values changed, nested mappings are patched recursively,
+anything else (including sequences) is replaced whole, and a key
+mapped to None is removed.
+
+.. versionadded:: 3.4.0
+"""
+
+from collections.abc import Mapping
+from numbers import Real
+
+try:
+    from persistent.timestamp import TimeStamp
+except ModuleNotFoundError: # pragma: no cover
+    TimeStamp = None
+
+from .externalizer import to_external_object
+from .standard_fields import get_last_modified_time
+
+__all__ = [
+    'to_external_delta',
+    'apply_external_delta',
+]
+
+_Z64 = b'\x00' * 8
+_MISSING = object()
+
+
+def _committed_serial(obj):
+    """
+    Return the ``_p_serial`` of the persistent object *obj* (which
+    must have a ``_p_jar``), or None if it has never been committed or
+    is modified. This activates a ghost.
+    """
+    if not obj._p_oid:
+        return None
+    if obj._p_changed is None:
+        obj._p_activate()
+    if obj._p_changed:
+        return None
+    serial = obj._p_serial
+    return serial if serial != _Z64 else None
+
+
+def _is_changed(obj, since):
+    """
+    Return True if *obj* itself changed after *since*, False if it
+    didn't, or None if that can't be known.
+    """
+    if getattr(obj, '_p_jar', None) is not None:
+        serial = _committed_serial(obj)
+        if serial is None:
+            return True
+        if isinstance(since, bytes):
+            return serial > since
+        if TimeStamp is None: # pragma: no cover
+            return True
+        return TimeStamp(serial).timeTime() > since
+    if isinstance(since, bytes):
+        return None
+    last_modified = get_last_modified_time(obj)
+    if not last_modified:
+        return None
+    return last_modified > since
+
+
+class _Wrapped(object):
+    __slots__ = ('external',)
+
+    def __init__(self, external):
+        self.external = external
+
+
+class _Unchanged(_Wrapped):
+    """
+    Wraps the external form of an object that, along with everything
+    externalized within it, is unchanged.
+    """
+    __slots__ = ()
+
+
+class _ChangedWithin(_Wrapped):
+    """
+    Wraps the external form of an object that is itself unchanged,
+    but has something changed within it. Because its own state is
+    unchanged, it still refers to the same objects it did, so the
+    unchanged ones can be left out of its patch.
+    """
+    __slots__ = ()
+
+
+class _Changed(_Wrapped):
+    """
+    Wraps the external form of an object that itself changed. It may
+    now refer to different objects than it did, even unchanged ones,
+    so none of them can be left out of its patch.
+    """
+    __slots__ = ()
+
+
+class _DeltaFilter(object):
+    # Tracks whether each object, or anything externalized within it,
+    # changed, and wraps the external form of each object that knows
+    # when it changed in one of the _Wrapped classes. This plugs into
+    # the same hook as
+    # nti.externalization.representation.JsonFragmentCache.
+    #
+    # Objects that don't know when they changed (plain mappings and
+    # sequences, for example) are part of the state of the nearest one
+    # that does, so they are never wrapped themselves.
+
+    __slots__ = ('since', 'frames', 'changed')
+
+    def __init__(self, since):
+        self.since = since
+        # [own_changed, anything_within_changed] for each object being
+        # externalized
+        self.frames = []
+        # {id(obj): (obj, changed)} for each object externalized
+        self.changed = {}
+
+    def key_for(self, obj, name, policy, decorate): # pylint:disable=unused-argument
+        return obj
+
+    def get(self, key, last_modified_collector): # pylint:disable=unused-argument
+        return None
+
+    def begin(self, key):
+        self.frames.append([_is_changed(key, self.since), False])
+
+    def _note(self, changed):
+        if changed and self.frames:
+            self.frames[-1][1] = True
+
+    def end(self, key, external, last_modified): # pylint:disable=unused-argument
+        own_changed, within_changed = self.frames.pop()
+        changed = bool(own_changed or within_changed or external is None)
+        self.changed[id(key)] = (key, changed)
+        self._note(changed)
+        if own_changed is None:
+            return external
+        if own_changed:
+            return _Changed(external)
+        if changed:
+            return _ChangedWithin(external)
+        return _Unchanged(external)
+
+    def reuse(self, obj, name, policy, decorate): # pylint:disable=unused-argument
+        entry = self.changed.get(id(obj))
+        self._note(entry is None or entry[1])
+
+
+def _prune(external, may_omit):
+    # Drop the unchanged values from the mappings that belong to
+    # objects whose own state is unchanged (*may_omit*). A sequence is
+    # replaced whole by a patch, so unchanged values in it must be
+    # included after all, as must everything within a changed object.
+    if isinstance(external, _ChangedWithin):
+        return _prune(external.external, True)
+    if not may_omit or not isinstance(external, Mapping):
+        return _expand(external)
+    return {k: _prune(v, True)
+            for k, v in external.items()
+            if not isinstance(v, _Unchanged)}
+
+
+def _expand(external):
+    if isinstance(external, _Wrapped):
+        return _expand(external.external)
+    if isinstance(external, Mapping):
+        return {k: _expand(v) for k, v in external.items()}
+    if isinstance(external, list):
+        return [_expand(v) for v in external]
+    return external
+
+
+def _diff(old, new):
+    patch = {}
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    for key, value in new.items():
+        old_value = old.get(key, _MISSING)
+        if old_value == value:
+            continue
+        if isinstance(value, Mapping) and isinstance(old_value, Mapping):
+            value = _diff(old_value, value)
+        patch[key] = value
+    return patch
+
+
+def to_external_delta(obj, since, **kwargs):
+    """
+    Return a merge patch that updates an earlier external form of
+    *obj* to its current external form.
+
+    *since* describes the earlier form. It may be:
+
+    - The earlier external form itself, a mapping. *obj* is
+      externalized in full and the two are compared. This is exact:
+      changed, added, and removed keys are all reported.
+    - A ``_p_serial`` (8 bytes), or a time in seconds since the epoch.
+      A persistent object has changed if its committed transaction is
+      later than *since* (or it has uncommitted changes), and another
+      object if its :func:`~.get_last_modified_time` is later than
+      *since*. Objects without a modification time are considered
+      part of the nearest enclosing object that has one. If nothing
+      at all changed, the patch is empty. A sub-object is left out of
+      the patch only if neither it nor anything externalized within
+      it changed, *and* the object that refers to it did not itself
+      change (and so still refers to the same object it did at
+      *since*). Everything within an object that changed is included
+      in full. Removed keys can't be detected.
+
+    Everything is still externalized (and persistent objects are
+    loaded) to find out what changed within it; the savings are only
+    in the size of the patch. Only objects externalized through
+    :func:`.to_external_object` are examined; an object whose external
+    form is built from the state of other persistent objects directly
+    should compare against a snapshot instead.
+
+    The remaining *kwargs* are passed to :func:`.to_external_object`;
+    they may not include a *fragment_cache*.
+
+    Because None removes a key, the patch can't set a key to None.
+    When the external form of *obj* is not a mapping, it is returned
+    whole.
+    """
+    if isinstance(since, Mapping):
+        external = to_external_object(obj, **kwargs)
+        if not isinstance(external, Mapping):
+            return external
+        return _diff(since, external)
+
+    if not isinstance(since, (bytes, Real)):
+        raise TypeError("since must be a mapping, a serial, or a time", since)
+    external = to_external_object(obj, fragment_cache=_DeltaFilter(since), **kwargs)
+    if isinstance(external, _Unchanged):
+        return {}
+    return _prune(external, False)
+
+
+def apply_external_delta(external, patch):
+    """
+    Return a new copy of the external form *external* with the merge
+    patch *patch* (for example, from :func:`to_external_delta`)
+    applied. *external* is not modified.
+    """
+    if not isinstance(patch, Mapping):
+        return patch
+    result = dict(external) if isinstance(external, Mapping) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_external_delta(result.get(key), value)
+    return result
@@ -12,6 +12,7 @@ from collections.abc import Callable
 from collections.abc import Mapping
 from collections.abc import MutableMapping
 from collections.abc import Set
+from decimal import Decimal
 from typing import Any
 from weakref import WeakKeyDictionary
 
@@ -28,11 +29,16 @@ from zope.interface.common.sequence import IFiniteSequence
 from nti.externalization._base_interfaces import PRIMITIVES
 from nti.externalization._base_interfaces import NotGiven
 from nti.externalization._base_interfaces import get_default_externalization_policy
+from nti.externalization._base_interfaces import get_standard_external_fields
 from nti.externalization._threadlocal import ThreadLocalManager
 from nti.externalization.extension_points import get_current_request
+from nti.externalization.extension_points import prefetch_external_objects
+from nti.externalization.extension_points import prepare_external_identifiers
 from nti.externalization.externalization.decorate import decorate_external_object
 from nti.externalization.externalization.dictionary import internal_to_standard_external_dictionary
+from nti.externalization.externalization.leaves import find_leaf_converter
 from nti.externalization.externalization.replacers import DefaultNonExternalizableReplacer
+from nti.externalization.externalization.standard_fields import get_last_modified_time
 from nti.externalization.interfaces import IExternalizationPolicy
 from nti.externalization.interfaces import IExternalObjectDecorator
 from nti.externalization.interfaces import IInternalObjectExternalizer
@@ -48,20 +54,21 @@ logger = logging.getLogger(__name__)
 
 
 DEFAULT_EXTERNALIZATION_POLICY = get_default_externalization_policy()
+StandardExternalFields = get_standard_external_fields()
 
 # It turns out that the name we use for externalization (and really the registry, too)
 # we must keep thread-local. We call into objects without any context,
 # and they call back into us, and otherwise we would lose
 # the name that was established at the top level.
 
-# Stores tuples (name, memos)
+# Stores tuples (name, memos, policy, fragment_cache, last_modified_collector)
 
 # For Cython CDEF constants, must use type comments, not
 # type annotations, otherwise Cython 3.3 complains about the variable
 # being redeclared.
 _manager = ThreadLocalManager(
-    default=lambda: (NotGiven, None, DEFAULT_EXTERNALIZATION_POLICY)
-) # type: ThreadLocalManager[tuple[Any, Any, Any]]
+    default=lambda: (NotGiven, None, DEFAULT_EXTERNALIZATION_POLICY, None, None)
+) # type: ThreadLocalManager[tuple[Any, Any, Any, Any, Any]]
 _manager_get = _manager.get
 _manager_pop = _manager.pop
 _manager_push = _manager.push
@@ -100,6 +107,8 @@ class _ExternalizationState(object):
         'useCache',
         'decorate_callback',
         'policy',
+        'fragment_cache',
+        'last_modified_collector',
         '_kwargs',
     )
 
@@ -113,7 +122,9 @@ class _ExternalizationState(object):
                  decorate=True,
                  useCache=True,
                  decorate_callback=None,
-                 policy=DEFAULT_EXTERNALIZATION_POLICY):
+                 policy=DEFAULT_EXTERNALIZATION_POLICY,
+                 fragment_cache=None,
+                 last_modified_collector=None):
         # pylint:disable=too-many-positional-arguments
         self.name = name
         # We take a similar approach to pickle.Pickler
@@ -133,6 +144,8 @@ class _ExternalizationState(object):
         self.decorate_callback = decorate_callback
 
         self.policy = policy
+        self.fragment_cache = fragment_cache
+        self.last_modified_collector = last_modified_collector
 
         self._kwargs: dict|None = None
 
@@ -153,6 +166,7 @@ class _RecursiveCallState(dict):
 _marker = object()
 
 def _externalize_mapping(obj, state):
+    prefetch_external_objects(obj.values())
     # XXX: This winds up calling decorate_callback at least twice.
     result = internal_to_standard_external_dictionary(
         obj,
@@ -165,21 +179,29 @@ def _externalize_mapping(obj, state):
     # Note that we recurse on the original items, not the things newly added.
     # NOTE: This means that Links added here will not be externalized. There
     # is an IExternalObjectDecorator that does that
+    decimal_converter = state.policy._decimal_converter # pylint:disable=protected-access
     for key, value in obj.items():
         if not isinstance(value, PRIMITIVES):
             value = _to_external_object_state(value, state,
                                               top_level=False)
+        elif decimal_converter is not None and type(value) is Decimal:
+            value = decimal_converter(value)
         result[key] = value
 
     return result
 
 
 def _externalize_sequence(obj, state):
+    prefetch_external_objects(obj)
+    prepare_external_identifiers(obj)
+    decimal_converter = state.policy._decimal_converter # pylint:disable=protected-access
     result = []
     for value in obj:
         if not isinstance(value, PRIMITIVES):
             value = _to_external_object_state(value, state,
                                               top_level=False)
+        elif decimal_converter is not None and type(value) is Decimal:
+            value = decimal_converter(value)
         result.append(value)
     result = ILocatedExternalSequence(result)
     return result
@@ -250,6 +272,56 @@ def _externalize_object(obj, state):
     return result
 
 
+def _externalize_and_decorate(obj, state):
+    # TODO: This is needless for the mapping types and sequence types. rework to avoid.
+    # Benchmarks show that simply moving it into the last block doesn't actually save much
+    # (due to all the type checks in front of it?)
+
+    result = _externalize_object(obj, state)
+    if result is None:
+        # Legacy codepaths
+
+        if hasattr(obj, "toExternalDictionary"):
+            result = obj.toExternalDictionary(**state.as_kwargs())
+        elif hasattr(obj, "toExternalList"):
+            result = obj.toExternalList()
+        elif isinstance(obj, MAPPING_TYPES):
+            result = _externalize_mapping(obj, state)
+        elif isinstance(obj, SEQUENCE_TYPES) or IFiniteSequence.providedBy(obj):
+            result = _externalize_sequence(obj, state)
+        else:
+            # Otherwise, we probably won't be able to JSON-ify it.
+            # TODO: Should this live here, or at a higher level where the ultimate
+            # external target/use-case is known?
+            replacer = state.default_non_externalizable_replacer
+            result = INonExternalizableReplacementFactory( # type:ignore[misc]
+                obj, replacer
+            )(obj) # type:ignore[call-arg]
+
+
+    decorate_external_object(
+        state.decorate, state.decorate_callback,
+        IExternalObjectDecorator, 'decorateExternalObject',
+        obj, result,
+        None, # unused registry
+        state.request
+    )
+    return result
+
+
+def _collect_last_modified(obj, result, collector):
+    # Only mappings carry a Last Modified time. Whatever a fragment
+    # cache returns is accounted for by the cache.
+    if isinstance(result, dict):
+        value = result.get(StandardExternalFields.LAST_MODIFIED)
+        if value is None:
+            return
+        if isinstance(value, str):
+            # The policy produced a timestamp string: ask the object.
+            value = get_last_modified_time(obj)
+        collector.add(value)
+
+
 def _to_external_object_state(obj, state, top_level=False):
     # pylint:disable=too-many-positional-arguments
     # This function is way to long and ugly. Given cython's 0 function call overhead,
@@ -267,6 +339,10 @@ def _to_external_object_state(obj, state, top_level=False):
         if result is None:  # mark as in progress
             state.memo[cache_key] = (obj, _marker)
         elif result is not _marker:
+            if state.fragment_cache is not None:
+                state.fragment_cache.reuse(obj, state.name, state.policy, state.decorate)
+            if state.last_modified_collector is not None:
+                state.last_modified_collector.add(value[2])
             return result
         else:
             logger.debug("Recursive call to object %r.", obj)
@@ -277,42 +353,54 @@ def _to_external_object_state(obj, state, top_level=False):
             return _RecursiveCallState(result)
 
     try:
-        # TODO: This is needless for the mapping types and sequence types. rework to avoid.
-        # Benchmarks show that simply moving it into the last block doesn't actually save much
-        # (due to all the type checks in front of it?)
-
-        result = _externalize_object(obj, state)
-        if result is None:
-            # Legacy codepaths
-
-            if hasattr(obj, "toExternalDictionary"):
-                result = obj.toExternalDictionary(**state.as_kwargs())
-            elif hasattr(obj, "toExternalList"):
-                result = obj.toExternalList()
-            elif isinstance(obj, MAPPING_TYPES):
-                result = _externalize_mapping(obj, state)
-            elif isinstance(obj, SEQUENCE_TYPES) or IFiniteSequence.providedBy(obj):
-                result = _externalize_sequence(obj, state)
-            else:
-                # Otherwise, we probably won't be able to JSON-ify it.
-                # TODO: Should this live here, or at a higher level where the ultimate
-                # external target/use-case is known?
-                replacer = state.default_non_externalizable_replacer
-                result = INonExternalizableReplacementFactory( # type:ignore[misc]
-                    obj, replacer
-                )(obj) # type:ignore[call-arg]
-
-
-        decorate_external_object(
-            state.decorate, state.decorate_callback,
-            IExternalObjectDecorator, 'decorateExternalObject',
-            obj, result,
-            None, # unused registry
-            state.request
-        )
+        result = None
+        fragment_key = None
+        converter = None
+        # Leaf values (dates, numbers, etc) don't need adapters. When we're
+        # not decorating, the callback still expects to be called, though.
+        if (state.decorate
+                or state.decorate_callback is NotGiven
+                or state.decorate_callback is None):
+            converter = find_leaf_converter(obj, state.name, state.policy)
+
+        last_modified = None
+        if converter is not None:
+            result = converter(obj)
+        else:
+            collector = state.last_modified_collector
+            if collector is not None:
+                # Collect the times within this object separately, so
+                # they can be remembered for it.
+                collector.begin()
+            try:
+                if state.fragment_cache is not None:
+                    fragment_key = state.fragment_cache.key_for(obj, state.name, state.policy,
+                                                                state.decorate)
+                    if fragment_key is not None:
+                        result = state.fragment_cache.get(fragment_key, collector)
+
+                if result is None:
+                    if fragment_key is None:
+                        result = _externalize_and_decorate(obj, state)
+                        if collector is not None:
+                            _collect_last_modified(obj, result, collector)
+                    else:
+                        state.fragment_cache.begin(fragment_key)
+                        try:
+                            result = _externalize_and_decorate(obj, state)
+                            if collector is not None:
+                                _collect_last_modified(obj, result, collector)
+                        finally:
+                            # If that raised, result is None, and this records the failure.
+                            result = state.fragment_cache.end(
+                                fragment_key, result,
+                                collector.last_modified if collector is not None else NotGiven)
+            finally:
+                if collector is not None:
+                    last_modified = collector.end()
 
         if state.useCache:  # save result
-            state.memo[cache_key] = (obj, result)
+            state.memo[cache_key] = (obj, result, last_modified)
         return result
     except state.catch_components as t:
         if top_level or state.catch_component_action is None:
@@ -342,6 +430,8 @@ def to_external_object(
         default_non_externalizable_replacer=DefaultNonExternalizableReplacer,
         policy_name=NotGiven,
         policy=NotGiven,
+        fragment_cache=NotGiven,
+        last_modified_collector=NotGiven,
 ):
     """
     Translates the object into a form suitable for external
@@ -385,17 +475,32 @@ def to_external_object(
         is used.
     :param str policy_name: If no *policy* is given, then this is used to
         lookup a utility. If this is used, the utility must exist.
+    :param fragment_cache: If given, a
+        :class:`~nti.externalization.representation.JsonFragmentCache`
+        used to replace cacheable sub-objects with their already-encoded
+        JSON. The result is then only suitable for encoding with
+        :class:`~nti.externalization.representation.JsonRepresenter`.
+        Like *policy*, if this is not given, the value established by
+        the most recent caller to this method is used.
+    :param last_modified_collector: If given, a
+        :class:`~nti.externalization.externalization.LastModifiedCollector`
+        to which the ``Last Modified`` time of every object externalized
+        is added. This is inherited like *fragment_cache*.
 
     .. versionchanged:: 3.1.0
        Remove the deprecated *registry* argument.
+    .. versionchanged:: 3.4.0
+       Add the *fragment_cache* and *last_modified_collector* arguments.
+       A :class:`decimal.Decimal` is converted if the policy has an
+       entry for it in its ``leaf_converters``.
     """
     # pylint:disable=too-many-positional-arguments
     # Catch the primitives up here, quickly. This catches
-    # numbers, strings, and None.
-    if isinstance(obj, PRIMITIVES):
+    # numbers, strings, and None. Decimals may need the policy.
+    if isinstance(obj, PRIMITIVES) and type(obj) is not Decimal:
         return obj
 
-    manager_top = _manager_get() # (name, memos, policy)
+    manager_top = _manager_get() # (name, memos, policy, fragment_cache)
     if name is NotGiven:
         name = manager_top[0]
     if name is NotGiven:
@@ -410,6 +515,15 @@ def to_external_object(
         else:
             policy = manager_top[2]
 
+    if type(obj) is Decimal:
+        converter = (policy.leaf_converters or {}).get(Decimal)
+        return converter(obj) if converter is not None else obj
+
+    if fragment_cache is NotGiven:
+        fragment_cache = manager_top[3]
+    if last_modified_collector is NotGiven:
+        last_modified_collector = manager_top[4]
+
     memos = manager_top[1]
     if memos is None:
         # Don't live beyond this dynamic function call
@@ -418,9 +532,10 @@ def to_external_object(
     state = _ExternalizationState(memos, name, catch_components, catch_component_action,
                                   request,
                                   default_non_externalizable_replacer,
-                                  decorate, useCache, decorate_callback, policy)
+                                  decorate, useCache, decorate_callback, policy,
+                                  fragment_cache, last_modified_collector)
 
-    _manager_push((name, memos, policy))
+    _manager_push((name, memos, policy, fragment_cache, last_modified_collector))
 
     try:
         return _to_external_object_state(obj, state, top_level=True)
@@ -428,6 +543,14 @@ def to_external_object(
         _manager_pop()
 
 
+def _current_policy():
+    """
+    The policy a call to `to_external_object` made now would use
+    if not given one.
+    """
+    return _manager_get()[2]
+
+
 from nti.externalization._compat import \
     import_c_accel  # pylint:disable=wrong-import-position,wrong-import-order
 
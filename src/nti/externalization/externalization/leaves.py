@@ -0,0 +1,143 @@
+# cython: auto_pickle=False,embedsignature=True,always_allow_keywords=False
+# -*- coding: utf-8 -*-
+"""
+Externalizing leaf values without adapters.
+
+Values such as dates, times, durations and non-primitive numbers are
+externalized by adapters to
+:class:`~nti.externalization.interfaces.IInternalObjectExternalizer`
+that simply turn them into a string. Looking up and creating such an
+adapter for each value is much more expensive than the conversion
+itself. Adapter factories that don't need any of the arguments to
+``toExternalObject`` can advertise an equivalent one-argument function
+as their ``__external_leaf_converter__``; the converters of the
+registered adapters are collected in a table indexed by type, which
+the externalization driver consults before it looks for any adapter.
+
+.. versionadded:: 3.4.0
+"""
+
+from weakref import WeakKeyDictionary
+from weakref import ref
+
+from zope.component import getSiteManager
+from zope.interface import implementedBy
+
+from nti.externalization.interfaces import IExternalObjectDecorator
+from nti.externalization.interfaces import IInternalObjectExternalizer
+
+__all__ = [
+    'find_leaf_converter',
+]
+
+_NOT_SEEDED = object()
+
+
+class _LeafConverterTable(object):
+    __slots__ = ('registry', 'generation', 'converters')
+
+    def __init__(self, registry, generation):
+        self.registry = ref(registry)
+        # The generations of the adapter registry the converters were
+        # seeded from and of its bases. Registering or unregistering
+        # anything in any of them changes that.
+        self.generation = generation
+        # {(type, name): converter or None}
+        self.converters = {}
+
+
+#: {AdapterRegistry: _LeafConverterTable}
+_tables = WeakKeyDictionary()
+# Almost always, there is only one registry in use; this
+# is the table we used last.
+_last_table = None
+
+try:
+    from zope.testing import cleanup
+except ImportError: # pragma: no cover
+    pass
+else:
+    cleanup.addCleanUp(_tables.clear)
+
+
+def _has_decorators(components, spec):
+    for registration in components.registeredSubscriptionAdapters():
+        if (registration.provided.isOrExtends(IExternalObjectDecorator)
+                and spec.isOrExtends(registration.required[0])):
+            return True
+    return any(_has_decorators(base, spec)
+               for base in getattr(components, '__bases__', ()))
+
+
+def _seed(components, kind, obj, name):
+    # Only types whose instances can't provide interfaces of their own
+    # (they have no instance dictionary to store them in), and that
+    # aren't proxies, adapt the same way for every instance.
+    if (obj.__class__ is not kind
+            or getattr(kind, '__dictoffset__', None) != 0
+            or hasattr(kind, 'toExternalObject')):
+        return None
+    spec = implementedBy(kind)
+    lookup = components.adapters.lookup
+    factory = None
+    if name:
+        factory = lookup((spec,), IInternalObjectExternalizer, name)
+    if factory is None:
+        factory = lookup((spec,), IInternalObjectExternalizer, '')
+    converter = getattr(factory, '__external_leaf_converter__', None)
+    if converter is None or _has_decorators(components, spec):
+        # Decorators get the original object and want to see
+        # whatever the adapter produced; leave those to the full
+        # process.
+        return None
+    return converter
+
+
+def find_leaf_converter(obj, name, policy):
+    """
+    Return a function of one argument that externalizes *obj* the
+    same way that its adapter to
+    :class:`~nti.externalization.interfaces.IInternalObjectExternalizer`
+    named *name* (or the default adapter) would, or None if there
+    isn't one.
+
+    The :attr:`~.ExternalizationPolicy.leaf_converters` of *policy*
+    are checked first. Otherwise, a converter is only found when the
+    adapter factory provides one and there are no
+    :class:`~nti.externalization.interfaces.IExternalObjectDecorator`
+    subscribers for the type of *obj*. The answers are cached for each
+    adapter registry until something is registered in it.
+    """
+    kind = type(obj)
+    overrides = policy.leaf_converters
+    if overrides:
+        converter = overrides.get(kind, _NOT_SEEDED)
+        if converter is not _NOT_SEEDED:
+            return converter
+
+    global _last_table # pylint:disable=global-statement
+    components = getSiteManager()
+    registry = components.adapters
+    # This is how the registry's own lookup cache notices changes.
+    # pylint:disable=protected-access
+    ro = registry.ro
+    if len(ro) == 1:
+        generation = registry._generation
+    else:
+        generation = tuple([r._generation for r in ro])
+    table = _last_table
+    if table is None or table.registry() is not registry:
+        table = _tables.get(registry)
+    if table is None or table.generation != generation:
+        table = _tables[registry] = _LeafConverterTable(registry, generation)
+    _last_table = table
+
+    key = (kind, name)
+    converter = table.converters.get(key, _NOT_SEEDED)
+    if converter is _NOT_SEEDED:
+        converter = table.converters[key] = _seed(components, kind, obj, name)
+    return converter
+
+
+from nti.externalization._compat import import_c_accel # pylint:disable=wrong-import-position,wrong-import-order
+import_c_accel(globals(), 'nti.externalization.externalization._leaves')
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Writing repeated objects once.
+
+.. versionadded:: 3.4.0
+"""
+
+from nti.externalization.interfaces import EXTERNAL_REFERENCE_KEY
+from nti.externalization.interfaces import StandardExternalFields
+
+__all__ = [
+    'collapse_shared_references',
+]
+
+_OID = StandardExternalFields.OID
+
+
+def collapse_shared_references(external):
+    """
+    Replace all but the first occurrence of each repeated mapping in
+    the external value *external* with a reference to it, a mapping
+    whose only key is :data:`~.EXTERNAL_REFERENCE_KEY` and whose value
+    is the :attr:`~.StandardExternalFields.OID` of the repeated
+    mapping. Returns *external*, which is modified in place.
+
+    Only the same mapping object occurring more than once is replaced;
+    this is what :func:`~.to_external_object` produces when it
+    externalizes the same object more than once. Mappings without an
+    OID are left as they are. "First" is in the order of iteration,
+    which is the order encoders write unless they sort keys;
+    :func:`~nti.externalization.internalization.resolve_shared_references`
+    doesn't depend on the order.
+    """
+    if isinstance(external, (dict, list)):
+        _collapse(external, {id(external): external})
+    return external
+
+
+def _collapse(container, seen):
+    # seen keeps the mappings alive so their ids are not reused.
+    items = container.items() if isinstance(container, dict) else enumerate(container)
+    refs = None
+    for key, value in items:
+        if not isinstance(value, (dict, list)):
+            continue
+        if id(value) not in seen:
+            seen[id(value)] = value
+            _collapse(value, seen)
+            continue
+        oid = value.get(_OID) if isinstance(value, dict) else None
+        if oid:
+            if refs is None:
+                refs = []
+            refs.append((key, {EXTERNAL_REFERENCE_KEY: oid}))
+    if refs:
+        for key, ref in refs:
+            container[key] = ref
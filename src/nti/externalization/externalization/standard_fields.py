@@ -10,6 +10,7 @@ Functions to find standard fields.
 from datetime import datetime as DateTime
 from datetime import timezone as TimeZone
 from calendar import timegm as dt_tuple_to_unix
+from functools import lru_cache
 
 
 from zope.security.management import system_user
@@ -41,16 +42,27 @@ def datetime_to_unix_time(dt):
 
 _datetime_to_string = None
 
-def datetime_to_string(dt):
+def _format_datetime(dt):
     global _datetime_to_string # pylint:disable=global-statement
     if _datetime_to_string is None:
         from nti.externalization.datetime_ext import datetime_to_string as dts
         _datetime_to_string = dts
+    return _datetime_to_string(dt).toExternalObject()
+
+def _format_timestamp(ts):
+    return _format_datetime(DateTime.fromtimestamp(ts, TimeZone.utc))
+
+# Many objects, especially those created in bulk, share times, so we
+# remember the strings for the most recently used ones.
+_datetime_strings = lru_cache(maxsize=4096)(_format_datetime)
+_timestamp_strings = lru_cache(maxsize=4096)(_format_timestamp)
+
+def datetime_to_string(dt):
     if dt is not None:
-        return _datetime_to_string(dt).toExternalObject()
+        return _datetime_strings(dt)
 
 def timestamp_to_string(ts):
-    return datetime_to_string(DateTime.fromtimestamp(ts, TimeZone.utc))
+    return _timestamp_strings(ts)
 
 _LAST_MOD_FIELDS = (
     StandardInternalFields.LAST_MODIFIED,
@@ -86,6 +98,57 @@ def get_last_modified_time(context, default=None, policy=DEFAULT_EXTERNALIZATION
     return holder.get(StandardExternalFields.LAST_MODIFIED, default)
 
 
+class LastModifiedCollector(object):
+    """
+    Collects the greatest last modified time (see
+    :func:`get_last_modified_time`) of all the objects in an
+    externalized graph.
+
+    Pass an instance as the *last_modified_collector* argument of
+    :func:`~nti.externalization.to_external_object`. Afterwards, its
+    `last_modified` can be used for an HTTP ``Last-Modified`` header
+    without walking the graph again.
+
+    .. versionadded:: 3.4.0
+    """
+
+    __slots__ = ('last_modified', '_outer')
+
+    def __init__(self):
+        #: The greatest time seen, in fractional seconds since the epoch,
+        #: or None if no object had one.
+        self.last_modified = None
+        self._outer = []
+
+    def add(self, value):
+        """
+        Record the time *value*, if it is not None.
+        """
+        if value is not None and (self.last_modified is None or value > self.last_modified):
+            self.last_modified = value
+
+    def begin(self):
+        """
+        Start collecting the times within one object.
+
+        Until the matching :meth:`end`, :attr:`last_modified` is the
+        greatest time seen within it.
+        """
+        self._outer.append(self.last_modified)
+        self.last_modified = None
+
+    def end(self):
+        """
+        Finish collecting the times within one object, and return the
+        greatest of them (or None). They are included in the enclosing
+        object.
+        """
+        within = self.last_modified
+        self.last_modified = self._outer.pop()
+        self.add(within)
+        return within
+
+
 _CREATED_TIME_FIELDS = (
     StandardInternalFields.CREATED_TIME,
 )
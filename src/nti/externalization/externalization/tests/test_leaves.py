@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+# disable: accessing protected members, too many methods
+# pylint: disable=W0212,R0904
+
+import datetime
+import decimal
+import fractions
+
+from zope import component
+from zope import interface
+from zope.interface.common.idatetime import IDateTime
+
+from hamcrest import assert_that
+from hamcrest import is_
+from hamcrest import none
+from hamcrest import same_instance
+
+from nti.externalization.datetime_ext import datetime_to_string
+from nti.externalization.datetime_ext import date_to_string
+from nti.externalization.datetime_ext import duration_to_string
+from nti.externalization.externalization import to_external_object
+from nti.externalization.interfaces import IExternalObjectDecorator
+from nti.externalization.interfaces import IInternalObjectExternalizer
+from nti.externalization.numbers import second_chance_number_externalizer
+from nti.externalization._base_interfaces import ExternalizationPolicy
+from nti.externalization._base_interfaces import get_default_externalization_policy
+from nti.externalization.tests import ExternalizationLayerTest
+
+from ..leaves import find_leaf_converter
+
+DEFAULT_POLICY = get_default_externalization_policy()
+
+
+class MyDateTime(datetime.datetime):
+    # Instances have a __dict__, so they could provide anything.
+    pass
+
+
+@interface.implementer(IInternalObjectExternalizer)
+@component.adapter(IDateTime)
+class NamedDateTimeExternalizer(object):
+
+    def __init__(self, context):
+        self.context = context
+
+    def toExternalObject(self, **unused_kwargs):
+        return 'named'
+
+
+@interface.implementer(IExternalObjectDecorator)
+@component.adapter(IDateTime)
+class DateTimeDecorator(object):
+
+    def __init__(self, context):
+        pass
+
+    def decorateExternalObject(self, original, external):
+        raise AssertionError("Strings can't be decorated")
+
+
+class TestFindLeafConverter(ExternalizationLayerTest):
+
+    VALUES = (
+        datetime.datetime(2001, 2, 3, 4, 5, 6),
+        datetime.date(2001, 2, 3),
+        datetime.timedelta(days=3, seconds=7),
+        fractions.Fraction(1, 3),
+        complex(1, 2),
+    )
+
+    def test_matches_adapters(self):
+        for value in self.VALUES:
+            converter = find_leaf_converter(value, '', DEFAULT_POLICY)
+            adapter = IInternalObjectExternalizer(value)
+            assert_that(converter,
+                        is_(same_instance(type(adapter).__external_leaf_converter__)))
+            assert_that(converter(value), is_(adapter.toExternalObject()))
+            assert_that(to_external_object(value), is_(adapter.toExternalObject()))
+
+        assert_that(to_external_object(list(self.VALUES)),
+                    is_(['2001-02-03T04:05:06Z', '2001-02-03', 'P3DT7S',
+                         '1/3', '(1+2j)']))
+
+    def test_adapter_factories(self):
+        for factory in (datetime_to_string, date_to_string,
+                        duration_to_string, second_chance_number_externalizer):
+            self.assertTrue(callable(factory.__external_leaf_converter__))
+
+    def test_not_for_types_that_may_provide_more(self):
+        value = MyDateTime(2001, 2, 3)
+        assert_that(find_leaf_converter(value, '', DEFAULT_POLICY), is_(none()))
+        assert_that(to_external_object(value), is_('2001-02-03T00:00:00Z'))
+
+    def test_not_for_objects(self):
+        assert_that(find_leaf_converter(object(), '', DEFAULT_POLICY), is_(none()))
+        assert_that(find_leaf_converter(b'abc', '', DEFAULT_POLICY), is_(none()))
+
+    def test_named_adapter(self):
+        value = datetime.datetime(2001, 2, 3)
+        gsm = component.getGlobalSiteManager()
+        # Unknown names use the default.
+        assert_that(find_leaf_converter(value, 'other', DEFAULT_POLICY),
+                    is_(same_instance(datetime_to_string.__external_leaf_converter__)))
+
+        gsm.registerAdapter(NamedDateTimeExternalizer, name='other')
+        try:
+            assert_that(find_leaf_converter(value, 'other', DEFAULT_POLICY), is_(none()))
+            assert_that(to_external_object(value, name='other'), is_('named'))
+            assert_that(to_external_object(value), is_('2001-02-03T00:00:00Z'))
+        finally:
+            gsm.unregisterAdapter(NamedDateTimeExternalizer, name='other')
+
+        assert_that(find_leaf_converter(value, 'other', DEFAULT_POLICY),
+                    is_(same_instance(datetime_to_string.__external_leaf_converter__)))
+
+    def test_decorated_types_use_adapters(self):
+        value = datetime.datetime(2001, 2, 3)
+        gsm = component.getGlobalSiteManager()
+        gsm.registerSubscriptionAdapter(DateTimeDecorator)
+        try:
+            assert_that(find_leaf_converter(value, '', DEFAULT_POLICY), is_(none()))
+            with self.assertRaises(AssertionError):
+                to_external_object(value)
+            # Without decorating, the leaf converter would be fine,
+            # but we still use the full process.
+            assert_that(to_external_object(value, decorate=False),
+                        is_('2001-02-03T00:00:00Z'))
+        finally:
+            gsm.unregisterSubscriptionAdapter(DateTimeDecorator)
+
+        assert_that(find_leaf_converter(value, '', DEFAULT_POLICY),
+                    is_(same_instance(datetime_to_string.__external_leaf_converter__)))
+
+    def test_decorate_callback(self):
+        value = datetime.datetime(2001, 2, 3)
+        calls = []
+        result = to_external_object([value], decorate=False,
+                                    decorate_callback=lambda *args: calls.append(args))
+        assert_that(result, is_(['2001-02-03T00:00:00Z']))
+        assert_that(calls, is_([(value, '2001-02-03T00:00:00Z'),
+                                ([value], ['2001-02-03T00:00:00Z'])]))
+
+    def test_policy(self):
+        value = fractions.Fraction(3, 2)
+        policy = ExternalizationPolicy(leaf_converters={
+            fractions.Fraction: float,
+            datetime.date: None,
+        })
+        assert_that(find_leaf_converter(value, '', policy), is_(same_instance(float)))
+        assert_that(to_external_object([value], policy=policy), is_([1.5]))
+        assert_that(to_external_object([value]), is_(['3/2']))
+
+        day = datetime.date(2001, 2, 3)
+        assert_that(find_leaf_converter(day, '', policy), is_(none()))
+        assert_that(to_external_object(day, policy=policy), is_('2001-02-03'))
+
+        # Other types are looked up.
+        delta = datetime.timedelta(days=1)
+        assert_that(find_leaf_converter(delta, '', policy),
+                    is_(same_instance(duration_to_string.__external_leaf_converter__)))
+
+        assert_that(ExternalizationPolicy().leaf_converters, is_(none()))
+
+    def test_policy_decimal(self):
+        # Decimals are primitives, but the policy can still convert them.
+        value = decimal.Decimal('1.5')
+        policy = ExternalizationPolicy(leaf_converters={decimal.Decimal: float})
+        assert_that(to_external_object(value, policy=policy), is_(1.5))
+        assert_that(to_external_object([value], policy=policy), is_([1.5]))
+        assert_that(to_external_object({'a': value}, policy=policy),
+                    is_({'a': 1.5}))
+
+        assert_that(to_external_object(value), is_(same_instance(value)))
+        assert_that(to_external_object([value]), is_([value]))
+        assert_that(to_external_object({'a': value}), is_({'a': value}))
@@ -1,4 +1,4 @@
-#!/usr/bin/env python
+# cython: auto_pickle=False,embedsignature=True,always_allow_keywords=False
 # -*- coding: utf-8 -*-
 """
 Functions to represent potentially large integers as the shortest
@@ -21,20 +21,23 @@ character).
 We also put a version marker at the end of the string so we can evolve
 this algorithm gracefully but still honor codes in the wild.
 
+This module is compiled with Cython on CPython.
+
+.. versionchanged:: 3.4.0
+   Add `to_external_strings` and `from_external_strings`.
 """
 
 
 __all__ = [
     'to_external_string',
     'from_external_string',
+    'to_external_strings',
+    'from_external_strings',
 ]
 
 # stdlib imports
 import string
 
-maketrans = str.maketrans
-translate = str.translate
-
 # In the first version of the protocol, the version marker, which would
 # come at the end, is always omitted. Subsequent versions will append
 # a value that cannot be produced from the _VOCABULARY
@@ -49,12 +52,20 @@ _VOCABULARY = ''.join(
     reversed(sorted(list(set(string.ascii_letters + string.digits) - set(_REMOVED))))
 )
 
-# We translate the letters we removed
-_TRANSTABLE = maketrans(_REMOVED, _REPLACE)
-
 # Leaving us a base vocabulary to map integers into
 _BASE = len(_VOCABULARY)
 
+# The value of each character, including the letters we removed,
+# which take the value of the digit that replaces them.
+_DIGIT_VALUES = {c: i for i, c in enumerate(_VOCABULARY)}
+_DIGIT_VALUES.update({removed: _DIGIT_VALUES[replacement]
+                      for removed, replacement in zip(_REMOVED, _REPLACE)})
+
+# Every two-digit string, in order, so that encoding takes half as
+# many divisions.
+_BASE_SQUARED = _BASE * _BASE
+_DIGIT_PAIRS = tuple(a + b for a in _VOCABULARY for b in _VOCABULARY)
+
 _ZERO_MARKER = '@'  # Zero is special
 
 
@@ -78,22 +89,21 @@ def from_external_string(key) -> int:
         raise ValueError("Improper key")
 
     if not isinstance(key, str):
-        # Unicode keys cause problems on Python 2: The _TRANSTABLE is coerced
-        # to Unicode, which fails because it contains non-ASCII values.
-        # So instead, we encode the unicode string to ascii, which, if it is a
-        # valid key, will work
         key = key.decode('ascii') if isinstance(key, bytes) else key.encode('ascii')
 
     # strip the version if needed
-    key = key[:-1] if key[-1] == _VERSION else key
-    key = translate(key, _TRANSTABLE)  # translate bad chars
+    if key[-1] == _VERSION:
+        key = key[:-1]
 
     if key == _ZERO_MARKER:
         return 0
 
     int_sum = 0
-    for idx, char in enumerate(reversed(key)):
-        int_sum += _VOCABULARY.index(char) * pow(_BASE, idx)
+    try:
+        for char in key:
+            int_sum = int_sum * _BASE + _DIGIT_VALUES[char]
+    except KeyError:
+        raise ValueError("Improper key", key) from None
     return int_sum
 
 
@@ -109,15 +119,42 @@ def to_external_string(integer) -> str:
 
     """
 
-    # we won't step into the while if integer is 0
-    # so we just solve for that case here
     if integer == 0:
         return _ZERO_MARKER
 
-    result = ''
-    # Simple string concat benchmarks the fastest for this size data,
-    # among a list and an array.array( 'c' )
-    while integer > 0:
-        integer, remainder = divmod(integer, _BASE)
-        result = _VOCABULARY[remainder] + result
-    return result
+    if integer < _BASE:
+        # Negative numbers have no representation.
+        return _VOCABULARY[integer] if integer > 0 else ''
+
+    pairs = []
+    while integer >= _BASE_SQUARED:
+        integer, remainder = divmod(integer, _BASE_SQUARED)
+        pairs.append(_DIGIT_PAIRS[remainder])
+    # No leading zero digit.
+    pairs.append(_DIGIT_PAIRS[integer] if integer >= _BASE else _VOCABULARY[integer])
+    pairs.reverse()
+    return ''.join(pairs)
+
+
+def to_external_strings(integers) -> list:
+    """
+    Return a list of the result of `to_external_string` for each
+    value in the iterable *integers*.
+
+    .. versionadded:: 3.4.0
+    """
+    return [to_external_string(integer) for integer in integers]
+
+
+def from_external_strings(keys) -> list:
+    """
+    Return a list of the result of `from_external_string` for each
+    value in the iterable *keys*.
+
+    .. versionadded:: 3.4.0
+    """
+    return [from_external_string(key) for key in keys]
+
+
+from nti.externalization._compat import import_c_accel # pylint:disable=wrong-import-position,wrong-import-order
+import_c_accel(globals(), 'nti.externalization._integer_strings')
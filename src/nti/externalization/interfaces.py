@@ -252,6 +252,19 @@ EXT_REPR_JSON = 'json'
 #: Constant requesting YAML format data
 EXT_REPR_YAML = 'yaml'
 
+#: Constant requesting MessagePack format data. This is only
+#: available if the ``msgpack`` extra is installed.
+#:
+#: .. versionadded:: 3.4.0
+EXT_REPR_MSGPACK = 'msgpack'
+
+#: The key of a reference to an object written out in full elsewhere
+#: in the same external value. The value is the object's
+#: :attr:`~StandardExternalFields.OID`.
+#:
+#: .. versionadded:: 3.4.0
+EXTERNAL_REFERENCE_KEY = '$ref'
+
 
 # Creating and updating new and existing objects given external forms
 
@@ -314,6 +327,31 @@ class IExternalReferenceResolver(interface.Interface):
         Resolve the external reference and return it.
         """
 
+class IExternalReferenceBulkResolver(interface.Interface):
+    """
+    Used as an adapter from an *internal* object to something that can
+    resolve many external references in a single operation.
+
+    When one of these is registered for the object being updated,
+    every reference found under the keys named in ``__external_oids__``
+    (see :class:`IInternalObjectUpdater`) is collected and passed to
+    :meth:`resolve_many` in one call, instead of looking up an
+    :class:`IExternalReferenceResolver` for each reference. This lets
+    an implementation use, for example, a single catalog query or a
+    single call to ``Connection.prefetch`` rather than loading each
+    object separately.
+
+    .. versionadded:: 3.4.0
+    """
+
+    def resolve_many(references):
+        """
+        Resolve each of the external references in the sequence *references*.
+
+        :return: A sequence of the same length as *references* giving
+            the resolved value of each reference, in order.
+        """
+
 class INamedExternalizedObjectFactoryFinder(interface.Interface):
     """
     An object that can find factories for particular named
@@ -530,13 +568,16 @@ class _ILegacySearchModuleFactory(interface.Interface):
 __all__ = [
     'DEFAULT_EXTERNALIZATION_POLICY',
     'EXT_REPR_JSON',
+    'EXT_REPR_MSGPACK',
     'EXT_REPR_YAML',
+    'EXTERNAL_REFERENCE_KEY',
     'ExternalizationPolicy',
     'IAnonymousObjectFactory',
     'IClassObjectFactory',
     'IExternalObjectDecorator',
     'IExternalObjectIO',
     'IExternalObjectRepresenter',
+    'IExternalReferenceBulkResolver',
     'IExternalReferenceResolver',
     'IExternalRepresentationReader',
     'IExternalStandardDictionaryDecorator',
@@ -21,6 +21,7 @@ __all__ = [
     'notify_modified',
     'validate_field_value',
     'validate_named_field_value',
+    'resolve_shared_references',
 ]
 
 #: .. deprecated:: 1.0
@@ -42,6 +43,8 @@ from .updater import update_from_external_object
 from .fields import validate_field_value
 from .fields import validate_named_field_value
 
+from .references import resolve_shared_references
+
 def new_from_external_object(external_object, *args, **kwargs):
     """
     Like `update_from_external_object`, but creates a new object to
@@ -3,10 +3,15 @@ import cython
 
 
 # imports
+cdef IExternalReferenceBulkResolver
 cdef IExternalReferenceResolver
 cdef MutableSequence
 cdef component
 
+cdef list _collect_external_oids(oid_keys, externalObject)
+cdef _resolve_oids_in_bulk(bulk_resolver, list found)
+cdef _resolve_oids_individually(updating_object, list found)
+
 # XXX: This is only public for testing
 cpdef resolve_externals(object_io, updating_object, externalObject,
                         context=*)
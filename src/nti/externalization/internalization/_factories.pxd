@@ -16,6 +16,9 @@ cdef IClassObjectFactory
 cdef IExternalizedObjectFactoryFinder
 cdef IFactory
 cdef IMimeObjectFactory
+cdef MimeObjectFactory
+cdef resolve
+cdef threading
 
 # optimizations
 
@@ -24,6 +27,9 @@ cdef component_queryAdapter
 
 # module contents
 
+cdef dict _lazy_mime_factories
+cdef _lazy_mime_factories_lock
+
 @cython.final
 @cython.internal
 cdef class _DefaultExternalizedObjectFactoryFinder(object):
@@ -32,6 +38,7 @@ cdef class _DefaultExternalizedObjectFactoryFinder(object):
 
 
 cdef _search_for_class_factory(externalized_object, class_name)
+cdef _register_lazy_mime_factory(mime_type)
 cdef _search_for_mime_factory(externalized_object, mime_type)
 cpdef find_factory_for_class_name(str class_name)
 cdef _find_factory_for_mime_or_class(externalized_object)
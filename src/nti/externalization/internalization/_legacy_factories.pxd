@@ -25,4 +25,4 @@ cdef set _ext_factory_warnings
 cpdef search_for_external_factory(str class_name)
 
 cdef register_factories_from_search_set()
-cdef register_factories_from_module(module)
+cpdef register_factories_from_module(module, lazy=*)
@@ -10,19 +10,20 @@ from collections.abc import MutableSequence
 
 from zope import component
 
+from nti.externalization.interfaces import IExternalReferenceBulkResolver
 from nti.externalization.interfaces import IExternalReferenceResolver
 
 __all__ = [
     'resolve_externals',
 ]
 
-def resolve_externals(object_io, updating_object, externalObject,
-                      context=None):
-    # pylint:disable=too-complex
-    # Run the resolution steps on the external object
-    # TODO: Document this.
 
-    for keyPath in getattr(object_io, '__external_oids__', ()):
+def _collect_external_oids(oid_keys, externalObject):
+    # Return a list of ``(keyPath, values, unwrap)`` triples, one for
+    # each key present in *externalObject*. The *values* are always a
+    # mutable sequence that can be updated in place.
+    found = []
+    for keyPath in oid_keys:
         # TODO: This version is very simple, generalize it
         # TODO: This check seems weird. Why do we do it this way
         # instead of getting the object and seeing if it's false?
@@ -33,14 +34,60 @@ def resolve_externals(object_io, updating_object, externalObject,
         if not isinstance(externalObjectOid, MutableSequence):
             externalObjectOid = [externalObjectOid, ]
             unwrap = True
+        found.append((keyPath, externalObjectOid, unwrap))
+    return found
+
+
+def _resolve_oids_in_bulk(bulk_resolver, found):
+    references = []
+    for _, externalObjectOid, _ in found:
+        references.extend(externalObjectOid)
+
+    if not references:
+        return
+
+    resolved = bulk_resolver.resolve_many(references)
+    if len(resolved) != len(references):
+        raise ValueError("Bulk resolver returned the wrong number of values",
+                         bulk_resolver, len(references), len(resolved))
+
+    start = 0
+    for _, externalObjectOid, _ in found:
+        end = start + len(externalObjectOid)
+        externalObjectOid[:] = resolved[start:end]
+        start = end
 
+
+def _resolve_oids_individually(updating_object, found):
+    for _, externalObjectOid, _ in found:
         for i in range(0, len(externalObjectOid)): # pylint:disable=consider-using-enumerate
             resolver = component.queryMultiAdapter((updating_object, externalObjectOid[i]),
                                                    IExternalReferenceResolver)
             if resolver:
                 externalObjectOid[i] = resolver.resolve(externalObjectOid[i])
-        if unwrap and keyPath in externalObject:  # Only put it in if it was there to start with
-            externalObject[keyPath] = externalObjectOid[0]
+
+
+def resolve_externals(object_io, updating_object, externalObject,
+                      context=None):
+    # pylint:disable=too-complex
+    # Run the resolution steps on the external object
+    # TODO: Document this.
+
+    oid_keys = getattr(object_io, '__external_oids__', ())
+    if oid_keys:
+        found = _collect_external_oids(oid_keys, externalObject)
+        if found:
+            # If the object can resolve everything at once, let it; this
+            # takes one adapter lookup instead of one per reference.
+            bulk_resolver = IExternalReferenceBulkResolver(updating_object, None)
+            if bulk_resolver is not None:
+                _resolve_oids_in_bulk(bulk_resolver, found)
+            else:
+                _resolve_oids_individually(updating_object, found)
+
+            for keyPath, externalObjectOid, unwrap in found:
+                if unwrap:
+                    externalObject[keyPath] = externalObjectOid[0]
 
     for ext_key, resolver_func in getattr(object_io, '__external_resolvers__', {}).items():
         extValue = externalObject.get(ext_key)
@@ -12,11 +12,14 @@ are registered in the component manager.
 # Turn those off in general so we can see through the noise.
 # pylint:disable=fixme
 import logging
+import threading
 from collections.abc import Callable
 
 from zope import component
 from zope import interface
+from zope.dottedname.resolve import resolve
 
+from nti.externalization.factory import MimeObjectFactory
 from nti.externalization.interfaces import IClassObjectFactory
 from nti.externalization.interfaces import IExternalizedObjectFactoryFinder
 from nti.externalization.interfaces import IFactory
@@ -38,6 +41,47 @@ __all__ = [
     'find_factory_for',
 ]
 
+#: {mime_type: (site manager, dotted name of the factory)}
+_lazy_mime_factories = {}
+_lazy_mime_factories_lock = threading.RLock()
+
+try:
+    from zope.testing.cleanup import addCleanUp  # pylint: disable=ungrouped-imports
+except ImportError: # pragma: no cover
+    pass
+else:
+    addCleanUp(_lazy_mime_factories.clear)
+
+
+def _add_lazy_mime_factory(mime_type, factory_name):
+    # A configuration action of ``ext:registerMimeFactories lazy="true"``.
+    # Like the ``utility`` action it replaces, the factory belongs to
+    # the site manager that's current when the action executes.
+    with _lazy_mime_factories_lock:
+        _lazy_mime_factories[mime_type] = (component.getSiteManager(), factory_name)
+
+
+def _register_lazy_mime_factory(mime_type):
+    with _lazy_mime_factories_lock:
+        registration = _lazy_mime_factories.get(mime_type)
+        if registration is not None:
+            registry, factory_name = registration
+            # Let this throw ImportError, it's a programming bug
+            value = resolve(factory_name)
+            if not callable(value) or not getattr(value, '__external_can_create__', False):
+                raise TypeError("Object %r must be callable and set __external_can_create__ to true"
+                                % (value,))
+            factory = MimeObjectFactory(value,
+                                        title=factory_name.rsplit('.', 1)[-1],
+                                        interfaces=list(interface.implementedBy(value)))
+            registry.registerUtility(factory, IMimeObjectFactory, mime_type)
+            del _lazy_mime_factories[mime_type]
+            logger.debug("Registered lazy mime factory %s = %s", mime_type, factory_name)
+    # Whether we registered it or another thread did while we waited,
+    # it's only ours to use if its registry is visible from here.
+    return component_queryUtility(IMimeObjectFactory, mime_type)
+
+
 def _search_for_mime_factory(externalized_object, mime_type):
     if not mime_type:
         return None
@@ -55,6 +99,12 @@ def _search_for_mime_factory(externalized_object, mime_type):
     if factory is not None:
         return factory
 
+    # One that hasn't been registered yet?
+    if _lazy_mime_factories:
+        factory = _register_lazy_mime_factory(mime_type)
+        if factory is not None:
+            return factory
+
     # Is there a default?
     factory = IMimeObjectFactory(externalized_object, None)
 
@@ -136,11 +136,24 @@ def register_factories_from_search_set():
     for module in modules:
         register_factories_from_module(module)
 
-def register_factories_from_module(module):
+def register_factories_from_module(module, lazy=False):
     """
     Given a module object, find all the factories it contains
     and register them in the global site manager.
+
+    :param bool lazy: If true, *module* may also be the name of a
+        module. Instead of being examined now, it is imported if
+        needed and its factories are registered the first time a
+        legacy factory is searched for, as for
+        :func:`register_legacy_search_module`.
+
+    .. versionchanged:: 3.4.0
+       Add the *lazy* argument.
     """
+    if lazy:
+        LEGACY_FACTORY_SEARCH_MODULES.add(module)
+        return
+
     gsm = component.getGlobalSiteManager()
     for name, factory in find_factories_in_module(module):
         registered = gsm.queryUtility(_ILegacySearchModuleFactory, name)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Resolving references to repeated objects.
+
+.. versionadded:: 3.4.0
+"""
+
+from nti.externalization.interfaces import EXTERNAL_REFERENCE_KEY
+from nti.externalization.interfaces import StandardExternalFields
+
+__all__ = [
+    'resolve_shared_references',
+]
+
+_OID = StandardExternalFields.OID
+
+
+def _is_reference(value):
+    return len(value) == 1 and isinstance(value.get(EXTERNAL_REFERENCE_KEY), str)
+
+
+def resolve_shared_references(external):
+    """
+    Undo :func:`~nti.externalization.externalization.collapse_shared_references`:
+    replace each reference in the external value *external* with
+    the mapping that has the referenced OID, so that each occurrence
+    is the same mapping object. Returns *external*, which is modified
+    in place.
+
+    References may come before or after the mapping they refer to.
+    References to OIDs that aren't written out in *external* are left
+    alone.
+    """
+    if not isinstance(external, (dict, list)):
+        return external
+    targets = {}
+    containers = []
+    # Start from a wrapper so the root is treated like any other value.
+    pending = [[external]]
+    while pending:
+        container = pending.pop()
+        containers.append(container)
+        values = container.values() if isinstance(container, dict) else container
+        for value in values:
+            if isinstance(value, dict):
+                if _is_reference(value):
+                    continue
+                oid = value.get(_OID)
+                if oid and oid not in targets:
+                    targets[oid] = value
+                pending.append(value)
+            elif isinstance(value, list):
+                pending.append(value)
+
+    if targets:
+        for container in containers:
+            items = container.items() if isinstance(container, dict) else enumerate(container)
+            refs = [(key, targets.get(value[EXTERNAL_REFERENCE_KEY]))
+                    for key, value in items
+                    if isinstance(value, dict) and _is_reference(value)]
+            for key, target in refs:
+                if target is not None:
+                    container[key] = target
+    return external
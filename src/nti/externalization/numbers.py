@@ -20,6 +20,9 @@ class second_chance_number_externalizer(object):
     def __init__(self, context):
         self.context = context
 
+    # See :mod:`nti.externalization.externalization.leaves`.
+    __external_leaf_converter__ = str
+
     def toExternalObject(self, **unused_kwargs):
         return str(self.context)
 
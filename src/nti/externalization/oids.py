@@ -7,7 +7,9 @@ Functions for finding and parsing OIDs.
 # stdlib imports
 import binascii
 import collections
+import functools
 from collections.abc import Sequence
+from weakref import WeakKeyDictionary
 
 try:
     from ZODB.interfaces import IConnection
@@ -31,7 +33,10 @@ from nti.externalization.proxy import removeAllProxies
 
 __all__ = [
     'to_external_oid',
+    'to_external_oids',
+    'prepare_external_oids',
     'from_external_oid',
+    'from_external_oids',
     'ParsedOID',
 ]
 
@@ -66,6 +71,73 @@ def to_external_oid(self, default=None, add_to_connection=False,
 
     :return: A :class:`bytes` string.
     """
+    # pylint:disable=too-many-positional-arguments
+    return _to_external_oid(self, default, add_to_connection, add_to_intids, use_cache,
+                            _LOOKUP)
+
+toExternalOID = to_external_oid
+
+
+def to_external_oids(objects, default=None, add_to_connection=False,
+                     add_to_intids=False):
+    """
+    to_external_oids(objects, default=None, add_to_connection=False, add_to_intids=False) -> list
+
+    Return a list of the results of calling :func:`to_external_oid`
+    with the given arguments for each of the *objects*, but faster:
+    the :class:`~zope.intid.interfaces.IIntIds` utility is only
+    looked up once.
+
+    .. versionadded:: 3.4.0
+    """
+    intids = component.queryUtility(IIntIds)
+    return [
+        _to_external_oid(obj, default, add_to_connection, add_to_intids, True, intids)
+        for obj in objects
+    ]
+
+
+def prepare_external_oids(objects):
+    """
+    prepare_external_oids(objects) -> None
+
+    Compute the external OIDs of the persistent *objects* with
+    :func:`to_external_oids`, caching them where
+    :func:`to_external_oid` will find them.
+
+    This is meant to be installed as the
+    :func:`~nti.externalization.extension_points.prepare_external_identifiers`
+    hook.
+
+    .. versionadded:: 3.4.0
+    """
+    persistent = [obj for obj in objects if getattr(obj, '_p_oid', None)]
+    if len(persistent) > 1:
+        to_external_oids(persistent)
+
+
+# {connection: b':' + hexlify(database_name)}
+_db_name_suffixes = WeakKeyDictionary() # type: WeakKeyDictionary
+
+def _db_name_suffix(jar):
+    try:
+        return _db_name_suffixes[jar]
+    except (KeyError, TypeError):
+        pass
+    db_name:str = jar.db().database_name
+    suffix = b':' + binascii.hexlify(bytes_(db_name))
+    try:
+        _db_name_suffixes[jar] = suffix
+    except TypeError: # pragma: no cover
+        # Not weakly referenceable.
+        pass
+    return suffix
+
+
+_LOOKUP = object()
+
+def _to_external_oid(self, default, add_to_connection, add_to_intids, use_cache,
+                     intutility):
     # pylint:disable=too-many-positional-arguments,too-complex
     # TODO: Simplify
     # pylint:disable=too-many-branches
@@ -118,10 +190,10 @@ def to_external_oid(self, default=None, add_to_connection=False,
         pass
 
     if jar:
-        db_name:str = jar.db().database_name
-        oid = oid + b':' + binascii.hexlify(bytes_(db_name))
+        oid = oid + _db_name_suffix(jar)
 
-    intutility = component.queryUtility(IIntIds)
+    if intutility is _LOOKUP:
+        intutility = component.queryUtility(IIntIds)
     if intutility is not None:
         intid = intutility.queryId(self)
         if intid is None and add_to_intids:
@@ -137,8 +209,6 @@ def to_external_oid(self, default=None, add_to_connection=False,
         pass
     return oid
 
-toExternalOID = to_external_oid
-
 #: The fields of a parsed OID: ``oid``, ``db_name`` and ``intid``
 ParsedOID = collections.namedtuple('ParsedOID', ['oid', 'db_name', 'intid'])
 
@@ -154,7 +224,45 @@ def from_external_oid(ext_oid):
     :return: A three-tuple, :class:`ParsedOID`. Only the OID is
              guaranteed to be present; the other fields may be empty
              (``db_name``) or `None` (``intid``).
+
+    .. versionchanged:: 3.4.0
+       The results for the most recently used few thousand values
+       are cached.
+    """
+    try:
+        return _cached_parse_external_oid(ext_oid)
+    except TypeError:
+        # Unhashable (or invalid, in which case this raises again).
+        return _parse_external_oid(ext_oid)
+
+fromExternalOID = from_external_oid
+
+
+def from_external_oids(ext_oids):
+    """
+    Parse each of the external OIDs in *ext_oids* as with
+    :func:`from_external_oid`, grouping them by database so that
+    callers can load the objects from each database together.
+
+    :return: A dictionary mapping each database name (as found in
+       :attr:`ParsedOID.db_name`) to a dictionary mapping each
+       distinct external OID for that database to its
+       :class:`ParsedOID`.
+
+    .. versionadded:: 3.4.0
     """
+    result = {}
+    for ext_oid in ext_oids:
+        parsed = from_external_oid(ext_oid)
+        try:
+            by_oid = result[parsed.db_name]
+        except KeyError:
+            by_oid = result[parsed.db_name] = {}
+        by_oid[ext_oid] = parsed
+    return result
+
+
+def _parse_external_oid(ext_oid):
     # But, for legacy reasons, we accept directly the bytes given
     # in _p_oid, so we have to be careful with our literals here
     # to avoid Unicode[en|de]codeError
@@ -192,4 +300,7 @@ def from_external_oid(ext_oid):
 
     return ParsedOID(oid_string, name_s, intid)
 
-fromExternalOID = from_external_oid
+# ParsedOID is immutable, so the results can be shared.
+_cached_parse_external_oid = functools.lru_cache(8192)(
+    _parse_external_oid
+)
@@ -21,6 +21,7 @@ import warnings
 try:
     from persistent import UPTODATE
     from persistent import CHANGED
+    from persistent import GHOST
     from persistent import Persistent
     from persistent.list import PersistentList
     from persistent.mapping import PersistentMapping
@@ -29,6 +30,7 @@ except ModuleNotFoundError as ex:
     assert ex.name == 'persistent'
     UPTODATE = None
     CHANGED = 'Fake Changed'
+    GHOST = 'Fake Ghost'
     class Persistent: # type:ignore[no-redef]
         """Mock"""
     PersistentList = list
@@ -40,6 +42,7 @@ except ModuleNotFoundError as ex:
 from zope import interface
 
 from nti.externalization.datastructures import ExternalizableDictionaryMixin
+from nti.externalization.extension_points import prefetch_external_objects
 from nti.externalization.externalization import toExternalObject
 from nti.externalization.interfaces import IInternalObjectExternalizer
 from nti.externalization.oids import toExternalOID
@@ -52,6 +55,8 @@ from nti.externalization.proxy import removeAllProxies
 __all__ = [
     'getPersistentState',
     'setPersistentStateChanged',
+    'prefetch_ghosts',
+    'dereference_weak_refs',
     'PersistentExternalizableDictionary',
     'PersistentExternalizableList',
     'PersistentExternalizableWeakList',
@@ -113,6 +118,76 @@ def setPersistentStateChanged(obj):
         pass
 
 
+def prefetch_ghosts(objects):
+    """
+    Ask the connection of the persistent ghosts among *objects* to
+    prefetch their state from its storage, all at once. Accessing
+    them afterwards is then served from the storage's cache instead of
+    taking one round trip to the database for each object.
+
+    Nothing happens unless there are at least two ghosts in a
+    connection, or if the storage doesn't support prefetching (see
+    :meth:`ZODB.interfaces.IConnection.prefetch`). Unlike
+    :func:`getPersistentState`, which reports ghosts as up to date,
+    this only considers objects that really are ghosts.
+
+    This is suitable for installing as the implementation of
+    :func:`nti.externalization.extension_points.prefetch_external_objects`.
+
+    .. versionadded:: 3.4.0
+    """
+    oids_by_jar = {}
+    for obj in objects:
+        try:
+            if obj._p_state != GHOST:
+                continue
+            jar = obj._p_jar
+            oid = obj._p_oid
+        except AttributeError:
+            continue
+        if jar is not None and oid:
+            oids_by_jar.setdefault(jar, []).append(oid)
+
+    for jar, oids in oids_by_jar.items():
+        if len(oids) > 1:
+            prefetch = getattr(jar, 'prefetch', None)
+            if prefetch is not None:
+                prefetch(oids)
+
+
+def dereference_weak_refs(refs):
+    """
+    Return a list of the objects that the
+    :class:`persistent.wref.WeakRef` objects in *refs* refer to, with
+    None for those that have gone away.
+
+    Resolving a reference the first time loads the record of its
+    object. Here, the unresolved references are grouped by connection
+    and prefetched in one request (see
+    :meth:`ZODB.interfaces.IConnection.prefetch`) before they are
+    resolved, so the loads are answered from the storage's cache.
+    That also makes activating the objects afterwards cheap.
+
+    .. versionadded:: 3.4.0
+    """
+    oids_by_jar = {}
+    for wref in refs:
+        try:
+            wref._v_ob # pylint:disable=pointless-statement
+        except AttributeError:
+            jar = getattr(wref, 'dm', None)
+            if jar is not None:
+                oids_by_jar.setdefault(jar, []).append(wref.oid)
+
+    for jar, oids in oids_by_jar.items():
+        if len(oids) > 1:
+            prefetch = getattr(jar, 'prefetch', None)
+            if prefetch is not None:
+                prefetch(oids)
+
+    return [wref() for wref in refs]
+
+
 def _weakRef_toExternalObject(self):
     val = self()
     return toExternalObject(val) if val is not None else None
@@ -165,6 +240,7 @@ class PersistentExternalizableList(PersistentList): # pylint:disable=too-many-an
     """
 
     def toExternalList(self):
+        prefetch_external_objects(self)
         result = [toExternalObject(x) for x in self if x is not None]
         return result
 
@@ -192,19 +268,32 @@ class PersistentExternalizableWeakList(PersistentExternalizableList): # pylint:d
         If you have subclasses that use writable properties and which should
         bypass the normal attribute setter implementation, please
         mixin this superclass (first) yourself.
+    .. versionchanged:: 3.4.0
+        Iterating, comparing, ``count`` and ``index`` resolve all the
+        weak references at once with :func:`dereference_weak_refs`,
+        and keep the results until the list is changed.
     """
 
+    # The referents of the weak references, resolved all at once by
+    # _live_items() and cached until the list is mutated (or becomes
+    # a ghost, which also discards it).
+    _v_live_items = None
+
     def __init__(self, initlist=None):
         if initlist is not None:
             initlist = [self.__wrap(x) for x in initlist]
         super().__init__(initlist or ())
 
     def __getitem__(self, i):
+        live = self._v_live_items
+        if live is not None and isinstance(i, int):
+            return live[i]
         return super().__getitem__(i)()
 
-    # NOTE: __iter__ is implemented with __getitem__ so we don't reimplement
-    # (unless we're subclassing stdlib list)
-    # However, __eq__ isn't, it wants to directly compare lists
+    def __iter__(self):
+        return iter(self._live_items())
+
+    # __eq__ would directly compare the lists of weak refs
     def __eq__(self, other):
         # If we just compare lists, weak refs will fail badly
         # if they're compared with non-weak refs
@@ -214,18 +303,39 @@ class PersistentExternalizableWeakList(PersistentExternalizableList): # pylint:d
         if len(self) != len(other):
             return False
 
-        return all(obj1 == obj2 for obj1, obj2 in izip(self, other))
+        return all(obj1 == obj2 for obj1, obj2 in izip(self._live_items(), other))
 
     if PersistentList is list:
-        def __iter__(self):
-            for i in super().__iter__():
-                yield i()
+        def _weak_refs(self):
+            return list(super().__iter__())
 
         def __mul__(self, n):
             # Returns a plain list object.
             plain = super().__mul__(n)
             return self.__class__(plain)
+    else:
+        def _weak_refs(self):
+            return self.data
+
+    def _live_items(self):
+        """
+        Return a list of the referents of all the weak references,
+        with None for those that have gone away.
 
+        The references that aren't resolved yet are resolved
+        together, after asking their connection to prefetch them (see
+        :func:`prefetch_ghosts`). The list is cached until this object
+        is changed or deactivated; it must not be modified.
+
+        .. versionadded:: 3.4.0
+        """
+        live = self._v_live_items
+        if live is None:
+            live = self._v_live_items = dereference_weak_refs(self._weak_refs())
+        return live
+
+    def _invalidate_live_items(self):
+        self._v_live_items = None
 
     __hash__ = None # type:ignore[assignment]
 
@@ -234,9 +344,15 @@ class PersistentExternalizableWeakList(PersistentExternalizableList): # pylint:d
 
     def remove(self, item):
         super().remove(self.__wrap(PWeakRef(item)))
+        self._invalidate_live_items()
 
     def __setitem__(self, i, item):
         super().__setitem__(i, self.__wrap(PWeakRef(item)))
+        self._invalidate_live_items()
+
+    def __delitem__(self, i):
+        super().__delitem__(i)
+        self._invalidate_live_items()
 
     # Unfortunately, these are not implemented in terms of the primitives, so
     # we need to overide each one. They can throw exceptions, so we're careful
@@ -249,31 +365,48 @@ class PersistentExternalizableWeakList(PersistentExternalizableList): # pylint:d
         # any iterable.
         result = super().__iadd__(
             [self.__wrap(PWeakRef(o)) for o in other])
+        self._invalidate_live_items()
         return result
 
     def __imul__(self, n):
         result = super().__imul__(n)
+        self._invalidate_live_items()
         return result
 
     def append(self, item):
         super().append(self.__wrap(PWeakRef(item)))
+        self._invalidate_live_items()
 
     def insert(self, i, item):
         super().insert(i, self.__wrap(PWeakRef(item)))
+        self._invalidate_live_items()
 
     def pop(self, i=-1):
         rtn = super().pop(i)
+        self._invalidate_live_items()
         return rtn()
 
+    def clear(self):
+        super().clear()
+        self._invalidate_live_items()
+
+    def reverse(self):
+        super().reverse()
+        self._invalidate_live_items()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._invalidate_live_items()
+
     def extend(self, other):
         for x in other:
             self.append(x)
 
     def count(self, item):
-        return super().count(self.__wrap(PWeakRef(item)))
+        return self._live_items().count(item)
 
     def index(self, item, *args):
-        return super().index(self.__wrap(PWeakRef(item)), *args)
+        return self._live_items().index(item, *args)
 
 
 def NoPickle(cls):
@@ -6,10 +6,18 @@ External representation support.
 The provided implementations of
 `~nti.externalization.interfaces.IExternalObjectIO` live here. We
 provide and register two, one for `JSON <.EXT_REPR_JSON>` and one for
-`YAML <.EXT_REPR_YAML>`.
+`YAML <.EXT_REPR_YAML>`. If the ``msgpack`` extra is installed, we
+also register one for `MessagePack <.EXT_REPR_MSGPACK>`.
 """
+import codecs
 import decimal
+import hashlib
+import json
+import mmap
+import re
+import threading
 from typing import cast
+from weakref import WeakKeyDictionary
 
 try:
     from persistent import Persistent
@@ -24,16 +32,27 @@ try:
     import orjson
     _HAS_ORJSON = True
 except ModuleNotFoundError:
-    import json
     _HAS_ORJSON = False
+try:
+    import msgpack
+    _HAS_MSGPACK = True
+except ModuleNotFoundError:
+    _HAS_MSGPACK = False
 
 import yaml
 from zope import component
 from zope import interface
 
+from ._base_interfaces import ExternalizationPolicy
 from ._base_interfaces import NotGiven as _NotGiven
+from ._base_interfaces import get_default_externalization_policy
+from ._compat import PURE_PYTHON
+from .externalization import collapse_shared_references
 from .externalization import toExternalObject
+from .externalization.externalizer import _current_policy
+from .internalization import update_from_external_object
 from .interfaces import EXT_REPR_JSON
+from .interfaces import EXT_REPR_MSGPACK
 from .interfaces import EXT_REPR_YAML
 from .interfaces import IExternalObjectIO
 from .interfaces import IExternalObjectRepresenter
@@ -43,8 +62,20 @@ __all__ = [
     'to_json_representation',
     'to_json_representation_fast',
     'to_json_representation_sorted',
+    'to_json_representation_with_etag',
+    'compute_etag',
+    'iter_json_sequence',
+    'aiter_json_sequence',
+    'aiter_external_representation',
+    'write_json_sequence',
+    'iter_external_stream',
+    'iter_from_external_stream',
+    'load_from_external_stream',
     'WithRepr',
+    'HashingWriter',
+    'JsonFragmentCache',
     'JsonRepresenter',
+    'MsgPackRepresenter',
     'OrJsonRepresenter',
     'StdJsonRepresenter',
     'YamlRepresenter',
@@ -52,17 +83,27 @@ __all__ = [
 
 # Driver functions
 
-def _to_external_representation(obj, io, name=_NotGiven,
+def _to_external_representation(obj, io, name=_NotGiven, fragment_cache=_NotGiven,
+                                shared_references=False,
                                 **repr_kwargs) -> str|bytes:
 
-    ext = toExternalObject(obj, name=name)
+    if repr_kwargs.get('second_pass', True):
+        policy = _NotGiven
+    else:
+        # Nothing will be converted after externalization, so
+        # Decimals have to be handled during it.
+        policy = _decimal_converting_policy(_current_policy())
+    ext = toExternalObject(obj, name=name, fragment_cache=fragment_cache,
+                           policy=policy)
+    if shared_references:
+        ext = collapse_shared_references(ext)
     return io.dump(ext, **repr_kwargs)
 
 def to_external_representation(obj, ext_format=EXT_REPR_JSON,
-                               name=_NotGiven,
+                               name=_NotGiven, shared_references=False,
                                **repr_kwargs) -> str|bytes:
     """
-    to_external_representation(obj, ext_format='json', name=NotGiven, **repr_kwargs) -> str|bytes
+    to_external_representation(obj, ext_format='json', name=NotGiven, shared_references=False, **repr_kwargs) -> str|bytes
 
     Transforms (and returns) the *obj* into its external (string)
     representation.
@@ -74,6 +115,12 @@ def to_external_representation(obj, ext_format=EXT_REPR_JSON,
         `.EXT_REPR_YAML`, or the
         name of some other utility that implements
         `~nti.externalization.interfaces.IExternalObjectRepresenter`
+    :param bool shared_references: If true, an object that occurs
+        more than once is written in full only the first time, and as
+        a reference after that; see
+        :func:`~nti.externalization.externalization.collapse_shared_references`.
+        Readers must then use
+        :func:`~nti.externalization.internalization.resolve_shared_references`.
 
     The *repr_kwargs* are passed to the dump method of
     the representer.
@@ -82,6 +129,8 @@ def to_external_representation(obj, ext_format=EXT_REPR_JSON,
        Added *repr_kwargs*
     .. versionchanged:: 3.1.0
        Removed the deprecated 'registry' param
+    .. versionchanged:: 3.4.0
+       Added *shared_references*
     """
 
     # It would seem nice to be able to do this in one step during
@@ -93,7 +142,9 @@ def to_external_representation(obj, ext_format=EXT_REPR_JSON,
         name=ext_format
     )
 
-    return _to_external_representation(obj, io, name, **repr_kwargs)
+    return _to_external_representation(obj, io, name,
+                                       shared_references=shared_references,
+                                       **repr_kwargs)
 
 
 def to_json_representation(obj) -> str:
@@ -103,8 +154,12 @@ def to_json_representation(obj) -> str:
     """
     return cast(str, to_external_representation(obj, EXT_REPR_JSON))
 
-def to_json_representation_fast(obj) -> bytes:
+def to_json_representation_fast(obj, fp=None, second_pass=True,
+                                fragment_cache=_NotGiven,
+                                shared_references=False) -> bytes|int:
     """
+    to_json_representation_fast(obj, fp=None, second_pass=True, fragment_cache=NotGiven, shared_references=False) -> bytes
+
     A convenience function that calls
     :func:`to_external_representation` with `.EXT_REPR_JSON`
     and additional parameters to optimize for speed.
@@ -113,13 +168,34 @@ def to_json_representation_fast(obj) -> bytes:
     uses :class:`JsonRepresenter`. It is also only
     fastest when using orjson.
 
+    :param fp: If given, a file-like object opened for binary writing;
+        the encoded bytes are written directly to it (with no intermediate
+        str) and the result of its ``write`` method is returned.
+    :param bool second_pass: See the ``dump`` method of :class:`JsonRepresenter`.
+        If this is false, :class:`decimal.Decimal` values are converted
+        while externalizing instead. Nothing else is: values that
+        :class:`~nti.externalization.interfaces.IExternalObjectDecorator`
+        subscribers add to the external form (such as links) are only
+        externalized by the second pass, so output that may be
+        decorated requires this to be true.
+    :param fragment_cache: A :class:`JsonFragmentCache` (or a view of one)
+        passed to :func:`~nti.externalization.to_external_object`.
+    :param bool shared_references: See :func:`to_external_representation`.
+
     .. versionadded:: 3.0.0
     .. versionchanged:: 3.1.0
        Now properly externalizes the object instead of relying on
        the second-chance externalization mechanism.
+    .. versionchanged:: 3.4.0
+       Add the *fp*, *second_pass*, *fragment_cache* and
+       *shared_references* parameters.
     """
     return cast(bytes, _to_external_representation(obj, JsonRepresenter,
-                                                   sort_keys=False, as_str=False))
+                                                   fragment_cache=fragment_cache,
+                                                   shared_references=shared_references,
+                                                   fp=fp,
+                                                   sort_keys=False, as_str=False,
+                                                   second_pass=second_pass))
 
 def to_json_representation_sorted(obj) -> str:
     """
@@ -136,6 +212,214 @@ def to_json_representation_sorted(obj) -> str:
                                                  sort_keys=True))
 
 
+class _JsonSequenceEncoder(object):
+    """
+    Accumulates the encoded JSON of a sequence of items (or, if
+    *mapping* is true, of the items of an object), handing it back in
+    chunks of at least *chunk_size* bytes.
+    """
+
+    def __init__(self, ndjson, name, chunk_size, mapping=False):
+        # pylint:disable=too-many-positional-arguments
+        if ndjson:
+            start, self._sep, self._end, self._suffix = b'', b'', b'', b'\n'
+        elif mapping:
+            start, self._sep, self._end, self._suffix = b'{', b',', b'}', b''
+        else:
+            start, self._sep, self._end, self._suffix = b'[', b',', b']', b''
+        self._name = name
+        self._chunk_size = chunk_size
+        self._dump = JsonRepresenter.dump
+        self._pending = [start]
+        self._pending_size = 0
+        self._item_sep = b''
+
+    def _take(self):
+        chunk = b''.join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        return chunk
+
+    def add(self, item, key=None):
+        """
+        Externalize and encode *item*, preceded by *key* if this is a
+        mapping. If a chunk is ready, return it, otherwise return None.
+        """
+        ext = toExternalObject(item, name=self._name)
+        encoded = self._dump(ext, as_str=False)
+        if key is not None:
+            encoded = self._dump(key, as_str=False) + b':' + encoded
+        encoded = self._item_sep + encoded + self._suffix
+        self._item_sep = self._sep
+        self._pending.append(encoded)
+        self._pending_size += len(encoded)
+        if self._pending_size >= self._chunk_size:
+            return self._take()
+        return None
+
+    def finish(self):
+        """
+        Return the final (possibly empty) chunk.
+        """
+        self._pending.append(self._end)
+        return self._take()
+
+
+def iter_json_sequence(iterable, ndjson=False, name=_NotGiven,
+                       chunk_size=65536):
+    """
+    iter_json_sequence(iterable, ndjson=False, name=NotGiven, chunk_size=65536) -> bytes...
+
+    Externalize and encode each item of *iterable* as it is produced,
+    yielding the JSON as a series of :class:`bytes` chunks.
+
+    Each item is externalized separately with
+    :func:`nti.externalization.to_external_object` (passing *name*)
+    and encoded with :class:`JsonRepresenter`; nothing but the current
+    chunk is retained, so memory use does not grow with the number of
+    items. This is suitable for, e.g., the ``values()`` of a large
+    BTree container, or a WSGI response body.
+
+    :param bool ndjson: If false (the default), the output is a single
+        JSON array. If true, the output is newline-delimited JSON, one
+        item per line.
+    :param int chunk_size: Encoded items are collected until at least
+        this many bytes are available before yielding them. Set to 0
+        to yield as soon as each item is encoded.
+
+    .. versionadded:: 3.4.0
+    """
+    encoder = _JsonSequenceEncoder(ndjson, name, chunk_size)
+    for item in iterable:
+        chunk = encoder.add(item)
+        if chunk is not None:
+            yield chunk
+    chunk = encoder.finish()
+    if chunk:
+        yield chunk
+
+
+async def aiter_json_sequence(iterable, ndjson=False, name=_NotGiven,
+                              chunk_size=65536):
+    """
+    aiter_json_sequence(iterable, ndjson=False, name=NotGiven, chunk_size=65536) -> bytes...
+
+    An asynchronous generator version of :func:`iter_json_sequence`,
+    for use as the body of an ASGI response.
+
+    The first chunk is produced as soon as enough items have been
+    externalized to fill it, so a server can begin sending before
+    the whole sequence has been externalized. No more work is done
+    until the consumer asks for the next chunk.
+
+    *iterable* may be an ordinary or an asynchronous iterable.
+    Externalization of each item is synchronous.
+
+    .. versionadded:: 3.4.0
+    """
+    encoder = _JsonSequenceEncoder(ndjson, name, chunk_size)
+    if hasattr(iterable, '__aiter__'):
+        async for item in iterable:
+            chunk = encoder.add(item)
+            if chunk is not None:
+                yield chunk
+    else:
+        for item in iterable:
+            chunk = encoder.add(item)
+            if chunk is not None:
+                yield chunk
+    chunk = encoder.finish()
+    if chunk:
+        yield chunk
+
+
+async def aiter_external_representation(obj, ext_format=EXT_REPR_JSON,
+                                        name=_NotGiven, chunk_size=65536,
+                                        **repr_kwargs):
+    """
+    aiter_external_representation(obj, ext_format='json', name=NotGiven, chunk_size=65536, **repr_kwargs) -> bytes...
+
+    An asynchronous generator that yields the result of
+    :func:`to_external_representation` as :class:`bytes` chunks of at
+    most *chunk_size*.
+
+    Only two cases are streamed, and only when writing JSON with no
+    *repr_kwargs*: a :class:`list` or :class:`tuple`, and a
+    :class:`dict` whose keys are all strings. Their items (or values)
+    are externalized and encoded one at a time, as in
+    :func:`aiter_json_sequence`, so the first chunk is available
+    before the rest have been externalized. (As there, each is
+    externalized separately; for a dict, any
+    :class:`~nti.externalization.interfaces.IExternalObjectDecorator`
+    subscribers for the dict itself are not applied.)
+
+    Any other object, including the objects an application usually
+    externalizes, is completely externalized and encoded before the
+    first chunk is yielded; for those, this only splits the result
+    into chunks.
+
+    :raises ValueError: If *chunk_size* is not positive.
+
+    .. versionadded:: 3.4.0
+    """
+    # pylint:disable=too-many-positional-arguments
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive", chunk_size)
+
+    kind = type(obj)
+    if ext_format != EXT_REPR_JSON or repr_kwargs:
+        chunks = None
+    elif kind in (list, tuple):
+        chunks = iter_json_sequence(obj, name=name, chunk_size=chunk_size)
+    elif kind is dict and all([type(k) is str for k in obj]): # pylint:disable=unidiomatic-typecheck
+        chunks = _iter_json_mapping(obj, name, chunk_size)
+    else:
+        chunks = None
+
+    if chunks is None:
+        result = to_external_representation(obj, ext_format, name, **repr_kwargs)
+        if isinstance(result, str):
+            result = result.encode('utf-8')
+        chunks = (result,)
+
+    for chunk in chunks:
+        if len(chunk) <= chunk_size:
+            yield chunk
+            continue
+        with memoryview(chunk) as view:
+            for i in range(0, len(view), chunk_size):
+                yield bytes(view[i:i + chunk_size])
+
+
+def _iter_json_mapping(mapping, name, chunk_size):
+    encoder = _JsonSequenceEncoder(False, name, chunk_size, mapping=True)
+    for key, value in mapping.items():
+        chunk = encoder.add(value, key)
+        if chunk is not None:
+            yield chunk
+    yield encoder.finish()
+
+
+def write_json_sequence(iterable, fp, ndjson=False, name=_NotGiven,
+                        chunk_size=65536) -> int:
+    """
+    write_json_sequence(iterable, fp, ndjson=False, name=NotGiven, chunk_size=65536) -> int
+
+    Write the chunks produced by :func:`iter_json_sequence` to the
+    binary file-like object *fp* as they are produced.
+
+    :return: The total number of bytes written.
+
+    .. versionadded:: 3.4.0
+    """
+    # pylint:disable=too-many-positional-arguments
+    written = 0
+    for chunk in iter_json_sequence(iterable, ndjson, name, chunk_size):
+        fp.write(chunk)
+        written += len(chunk)
+    return written
+
+
 # JSON
 
 class _FakeDecimalDumper:
@@ -146,9 +430,33 @@ class _FakeDecimalDumper:
     def represent_scalar(self, _tag, d):
         return float(d)
 
+_fake_decimal_dumper = _FakeDecimalDumper()
+
+def _decimal_to_number(obj):
+    return _yaml_represent_decimal(_fake_decimal_dumper, obj)
+
+# {policy: policy that also converts Decimals}
+_decimal_converting_policies = WeakKeyDictionary() # type: WeakKeyDictionary
+
+def _decimal_converting_policy(policy):
+    if policy.leaf_converters and decimal.Decimal in policy.leaf_converters:
+        # Including one we made.
+        return policy
+    try:
+        return _decimal_converting_policies[policy]
+    except KeyError:
+        pass
+    leaf_converters = {decimal.Decimal: _decimal_to_number}
+    leaf_converters.update(policy.leaf_converters or {})
+    result = ExternalizationPolicy(
+        use_iso8601_for_unix_timestamp=policy.use_iso8601_for_unix_timestamp,
+        leaf_converters=leaf_converters)
+    _decimal_converting_policies[policy] = result
+    return result
+
 def _second_pass_to_external_object(obj):
     if isinstance(obj, decimal.Decimal):
-        return _yaml_represent_decimal(_FakeDecimalDumper(), obj)
+        return _decimal_to_number(obj)
     result = toExternalObject(obj, name='second-pass')
     if result is obj:
         raise TypeError(repr(obj) + " is not serializable")
@@ -163,9 +471,10 @@ class OrJsonRepresenter:
     """
 
     @staticmethod
-    def dump(obj, fp=None, sort_keys=False, as_str=True, **_unused) -> str|bytes:
+    def dump(obj, fp=None, sort_keys=False, as_str=True, second_pass=True,
+             **_unused) -> str|bytes:
         """
-        dump(obj, fp=None, sort_keys=False, as_str=True) -> str|bytes
+        dump(obj, fp=None, sort_keys=False, as_str=True, second_pass=True) -> str|bytes
 
         Given an object that is known to already be in an externalized form,
         convert it to JSON. This can be about 10% faster then requiring a pass
@@ -184,10 +493,24 @@ class OrJsonRepresenter:
 
            Other keyword arguments are ignored.
 
+        .. versionchanged:: 3.4.0
+           Added the *second_pass* parameter. If set to false, no
+           second-pass conversion is done and the encoder never calls back
+           into Python; anything it can't encode natively (including
+           :class:`decimal.Decimal`) raises :exc:`TypeError`. Use this when the
+           object is known to be fully externalized; in particular, values
+           added by decorators are not externalized until the second pass. (The driver functions
+           in this module that accept *second_pass* convert Decimals
+           while externalizing when it is false.)
         """
-        result = orjson.dumps(obj,
-                              option=orjson.OPT_SORT_KEYS if sort_keys else 0,
-                              default=_second_pass_to_external_object)
+        # pylint:disable=too-many-positional-arguments
+        if second_pass:
+            result = orjson.dumps(obj,
+                                  option=orjson.OPT_SORT_KEYS if sort_keys else 0,
+                                  default=_second_pass_to_external_object)
+        else:
+            result = orjson.dumps(obj,
+                                  option=orjson.OPT_SORT_KEYS if sort_keys else 0)
         if as_str:
             result = result.decode('utf-8') # type:ignore[assignment]
         if fp:
@@ -195,6 +518,19 @@ class OrJsonRepresenter:
         return result
 
     def load(self, stream):
+        """
+        load(stream) -> object
+
+        .. versionchanged:: 3.4.0
+           In addition to str, bytes, bytearray and memoryview, accept
+           a :class:`mmap.mmap`. None of these are copied.
+        """
+        if isinstance(stream, mmap.mmap):
+            # orjson reads any contiguous buffer, but only if it's
+            # presented as a memoryview. Release it promptly so the
+            # map can be closed.
+            with memoryview(stream) as view:
+                return orjson.loads(view)
         return orjson.loads(stream)
 
 
@@ -206,9 +542,10 @@ class StdJsonRepresenter:
     """
 
     @staticmethod
-    def dump(obj, fp=None, sort_keys=False, as_str=True, **_unused) -> str|bytes:
+    def dump(obj, fp=None, sort_keys=False, as_str=True, second_pass=True,
+             **_unused) -> str|bytes:
         """
-        dump(obj, fp=None, sort_keys=False, as_str=True) -> str|bytes
+        dump(obj, fp=None, sort_keys=False, as_str=True, second_pass=True) -> str|bytes
 
         Given an object that is known to already be in an externalized form,
         convert it to JSON. This can be about 10% faster then requiring a pass
@@ -227,10 +564,16 @@ class StdJsonRepresenter:
 
            Other keyword arguments are ignored.
 
+        .. versionchanged:: 3.4.0
+           Added the *second_pass* parameter. See :meth:`OrJsonRepresenter.dump`.
         """
-        result = json.dumps(obj, # pylint: disable=used-before-assignment
-                            sort_keys=sort_keys,
-                            default=_second_pass_to_external_object)
+        # pylint:disable=too-many-positional-arguments
+        if second_pass:
+            result = json.dumps(obj,
+                                sort_keys=sort_keys,
+                                default=_second_pass_to_external_object)
+        else:
+            result = json.dumps(obj, sort_keys=sort_keys)
         if not as_str:
             result = result.encode('utf-8') # type:ignore[assignment]
         if fp:
@@ -238,6 +581,17 @@ class StdJsonRepresenter:
         return result
 
     def load(self, stream):
+        """
+        load(stream) -> object
+
+        .. versionchanged:: 3.4.0
+           Accept a :class:`memoryview` or :class:`mmap.mmap` in addition
+           to str, bytes and bytearray.
+        """
+        if isinstance(stream, (memoryview, mmap.mmap)):
+            # The json module won't take these directly; decoding them
+            # is what it would do with bytes anyway.
+            stream = str(stream, 'utf-8')
         return json.loads(stream)
 
 
@@ -254,6 +608,641 @@ else:
 to_json_representation_externalized = JsonRepresenter.dump
 
 
+_Z64 = b'\x00' * 8
+DEFAULT_EXTERNALIZATION_POLICY = get_default_externalization_policy()
+
+def _committed_identity(obj):
+    """
+    Return ``(oid, database_name, serial)`` for a persistent object
+    whose current state is committed and unmodified, otherwise None.
+    This may activate a ghost.
+    """
+    try:
+        jar = obj._p_jar
+        oid = obj._p_oid
+        if jar is None or not oid:
+            return None
+        if obj._p_changed is None:
+            obj._p_activate()
+        if obj._p_changed:
+            # Modified in this transaction; the serial is stale.
+            return None
+        serial = obj._p_serial
+        db_name = jar.db().database_name
+    except AttributeError:
+        return None
+    if serial == _Z64:
+        return None
+    return oid, db_name, serial
+
+def _dependencies_current(jar, dependencies):
+    """
+    Return whether each of the persistent objects described by the
+    ``(oid, database_name, serial)`` tuples in *dependencies* is still
+    at that serial and unmodified, as seen by the connection *jar*.
+    This may activate them.
+    """
+    try:
+        db_name = jar.db().database_name
+        for oid, dep_db_name, serial in dependencies:
+            conn = jar if dep_db_name == db_name else jar.get_connection(dep_db_name)
+            dep = conn.get(oid)
+            if dep._p_changed is None:
+                dep._p_activate()
+            if dep._p_changed or dep._p_serial != serial:
+                return False
+    except (KeyError, POSError):
+        return False
+    return True
+
+def compute_etag(data) -> str:
+    """
+    Return a strong HTTP entity tag (including the quotes) for the
+    bytes *data*.
+
+    .. versionadded:: 3.4.0
+    """
+    return '"%s"' % hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class HashingWriter(object):
+    """
+    A binary file-like object that computes the ETag (see
+    :func:`compute_etag`) of everything written to it, optionally
+    passing the data on to another file-like object.
+
+    Pass one of these as the *fp* of any of the functions or
+    representers in this module to compute the ETag of their output
+    as it is produced, instead of in a second pass over it::
+
+        writer = HashingWriter(response.body_file)
+        to_json_representation_fast(obj, fp=writer)
+        response.etag = writer.etag
+
+    .. versionadded:: 3.4.0
+    """
+
+    def __init__(self, fp=None):
+        #: The wrapped file-like object, if any.
+        self.fp = fp
+        #: The total number of bytes written.
+        self.bytes_written = 0
+        self._hash = hashlib.blake2b(digest_size=16)
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self._hash.update(data)
+        self.bytes_written += len(data)
+        if self.fp is not None:
+            return self.fp.write(data)
+        return len(data)
+
+    @property
+    def etag(self) -> str:
+        """The ETag of the data written so far."""
+        return '"%s"' % self._hash.hexdigest()
+
+
+def to_json_representation_with_etag(obj, fp=None, second_pass=True,
+                                     fragment_cache=_NotGiven) -> tuple:
+    """
+    Like :func:`to_json_representation_fast`, but return a tuple of
+    its result and the ETag (see :func:`compute_etag`) of the JSON.
+
+    .. versionadded:: 3.4.0
+    """
+    if fp is None:
+        data = to_json_representation_fast(obj, second_pass=second_pass,
+                                           fragment_cache=fragment_cache)
+        return data, compute_etag(data)
+    writer = HashingWriter(fp)
+    result = to_json_representation_fast(obj, fp=writer, second_pass=second_pass,
+                                         fragment_cache=fragment_cache)
+    return result, writer.etag
+
+
+class JsonFragmentCache(object):
+    """
+    A size-bounded cache of the encoded JSON bytes of persistent objects.
+
+    Pass one of these (or a view from :meth:`for_audience`) as the
+    *fragment_cache* argument to
+    :func:`~nti.externalization.to_external_object` (or to
+    :func:`to_json_representation_fast`). Each persistent object
+    encountered that is committed and unmodified is externalized and
+    decorated once, encoded to JSON, and replaced in the external
+    structure by an ``orjson.Fragment`` holding those bytes. The next
+    time it is encountered, the bytes are spliced into the output
+    without externalizing, decorating or re-encoding the object or
+    anything it contains.
+
+    An entry is used only if the object's serial (``_p_serial``) is
+    unchanged, and so are the serials of all the persistent objects
+    that were externalized within it (checking those may load them,
+    but does not externalize them). If any of those had uncommitted
+    changes at the time, nothing containing them is cached.
+
+    Entries are keyed by the object's oid and database, and by the
+    externalizer name, policy, whether decoration was requested, and
+    the *audience* this view was created for. Decorators often vary
+    their output by request (for example, by the authenticated user);
+    when they do, callers must use a distinct audience for each
+    variation or cached output will leak between them.
+
+    The external structure produced when this is in use contains opaque
+    fragments and is only suitable for encoding with
+    :class:`JsonRepresenter`. Without ``orjson``, nothing is cached.
+
+    This object is safe to share between threads.
+
+    .. versionadded:: 3.4.0
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        """
+        :param int max_bytes: The maximum total size of the cached
+           fragments. When exceeded, the least recently used entries
+           are discarded.
+        """
+        self.max_bytes = max_bytes
+        self.audience = None
+        # {data_key: (serial, fragment, size, dependencies, etag)}
+        self._data = {}
+        self._size = [0]
+        self._lock = threading.Lock()
+        # A stack of [dependencies, poisoned] for the objects being
+        # externalized by each thread.
+        self._local = threading.local()
+
+    def for_audience(self, audience):
+        """
+        Return a view of this cache, sharing its storage, whose entries
+        are distinct from those of any other audience. The *audience*
+        must be hashable.
+        """
+        view = type(self).__new__(type(self))
+        view.__dict__.update(self.__dict__)
+        view.audience = audience
+        return view
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def size_bytes(self):
+        """The total size of the cached fragments."""
+        return self._size[0]
+
+    def clear(self):
+        """Discard all entries, for all audiences."""
+        with self._lock:
+            self._data.clear()
+            self._size[0] = 0
+
+    def _frames(self):
+        try:
+            return self._local.frames
+        except AttributeError:
+            frames = self._local.frames = []
+            return frames
+
+    def _poison(self):
+        for frame in self._frames():
+            frame[1] = True
+
+    def _depend(self, data_key, serial, dependencies):
+        frames = self._frames()
+        if frames:
+            parent_deps = frames[-1][0]
+            parent_deps.add((data_key[0], data_key[1], serial))
+            parent_deps.update(dependencies)
+
+    def key_for(self, obj, name, policy, decorate):
+        """
+        Return an opaque key to use with the other methods, or None if
+        *obj* is not cacheable. This may activate a ghost.
+        """
+        if not _HAS_ORJSON:
+            return None
+        identity = _committed_identity(obj)
+        if identity is None:
+            if getattr(obj, '_p_changed', None):
+                # Nothing containing uncommitted state can be cached.
+                self._poison()
+            return None
+        oid, db_name, serial = identity
+        return ((oid, db_name, name, policy, decorate, self.audience), serial, obj._p_jar)
+
+    def _entry(self, key):
+        data_key, serial, jar = key
+        with self._lock:
+            entry = self._data.pop(data_key, None)
+            if entry is None:
+                return None
+            if entry[0] == serial:
+                # Re-inserting makes this the most recently used.
+                self._data[data_key] = entry
+        if entry[0] == serial and _dependencies_current(jar, entry[3]):
+            return entry
+        with self._lock:
+            if self._data.get(data_key) is entry:
+                del self._data[data_key]
+                self._size[0] -= entry[2]
+        return None
+
+    def get(self, key, last_modified_collector=None):
+        """
+        Return the cached fragment for *key*, or None.
+
+        If the fragment is returned, the object being externalized
+        that contains it now depends on its contents, and the
+        greatest ``Last Modified`` time within it is added to the
+        :class:`~nti.externalization.externalization.LastModifiedCollector`
+        *last_modified_collector*, if given. (If that wasn't collected
+        when the fragment was cached, it's a miss.)
+        """
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        if last_modified_collector is not None:
+            if entry[5] is _NotGiven:
+                return None
+            last_modified_collector.add(entry[5])
+        self._depend(key[0], key[1], entry[3])
+        return entry[1]
+
+    def begin(self, key):
+        """
+        Note that the object for *key* is about to be externalized.
+        """
+        self._frames().append([set(), False])
+
+    def end(self, key, external, last_modified=_NotGiven):
+        """
+        Finish externalizing the object for *key*, whose external
+        form is *external* (None if that failed). Encode it and cache
+        it, if possible, and return the fragment that should replace
+        it (or *external*, unchanged).
+
+        *last_modified* is the greatest ``Last Modified`` time within
+        it, if that was collected.
+        """
+        dependencies, poisoned = self._frames().pop()
+        if external is None:
+            self._poison()
+            return None
+        if poisoned:
+            return external
+        data_key, serial, _ = key
+        dependencies = tuple(dependencies)
+        self._depend(data_key, serial, dependencies)
+        try:
+            encoded = orjson.dumps(external, default=_second_pass_to_external_object)
+        except TypeError:
+            return external
+        fragment = orjson.Fragment(encoded)
+        size = len(encoded)
+        if size > self.max_bytes:
+            return fragment
+        data = self._data
+        with self._lock:
+            old = data.pop(data_key, None)
+            if old is not None:
+                self._size[0] -= old[2]
+            data[data_key] = (serial, fragment, size, dependencies, compute_etag(encoded),
+                              last_modified)
+            self._size[0] += size
+            while self._size[0] > self.max_bytes:
+                oldest = next(iter(data))
+                self._size[0] -= data.pop(oldest)[2]
+        return fragment
+
+    def etag_for(self, obj, name='', policy=DEFAULT_EXTERNALIZATION_POLICY, decorate=True):
+        """
+        Return the ETag (see :func:`compute_etag`) of the JSON that
+        :func:`to_json_representation_fast` would currently produce
+        for *obj* using this cache, if that is already cached, or None.
+
+        This doesn't externalize or encode anything, so it can cheaply
+        answer a conditional request. The arguments are as for
+        :func:`~nti.externalization.to_external_object`.
+        """
+        key = self.key_for(obj, name, policy, decorate)
+        if key is None:
+            return None
+        entry = self._entry(key)
+        return entry[4] if entry is not None else None
+
+    def reuse(self, obj, name, policy, decorate):
+        """
+        Note that the already-externalized *obj* is being included again.
+        """
+        key = self.key_for(obj, name, policy, decorate)
+        if key is None:
+            return
+        with self._lock:
+            entry = self._data.get(key[0])
+        if entry is None or entry[0] != key[1]:
+            # We don't know what it contained.
+            self._poison()
+        else:
+            self._depend(key[0], key[1], entry[3])
+
+
+# MessagePack
+
+@interface.named(EXT_REPR_MSGPACK)
+@interface.implementer(IExternalObjectIO)
+class MsgPackRepresenter(object):
+    """
+    IO object using ``msgpack`` for binary input/output.
+
+    This is only usable if the ``msgpack`` extra is installed.
+    Values the packer doesn't know how to handle, including
+    :class:`decimal.Decimal`, are converted the same way the JSON
+    representers convert them.
+
+    .. versionadded:: 3.4.0
+    """
+
+    @staticmethod
+    def dump(obj, fp=None, **_unused) -> bytes|int:
+        """
+        dump(obj, fp=None) -> bytes
+
+        If *fp* is given, the packed bytes are written to it and the
+        number of bytes written is returned. When *obj* is a list, tuple or
+        dict, it is packed and written one item at a time, so the
+        complete output is never held in memory.
+
+        Other keyword arguments are ignored.
+        """
+        packer = msgpack.Packer(default=_second_pass_to_external_object)
+        if fp is None:
+            return packer.pack(obj)
+
+        if isinstance(obj, (list, tuple)):
+            written = fp.write(packer.pack_array_header(len(obj)))
+            for value in obj:
+                written += fp.write(packer.pack(value))
+        elif isinstance(obj, dict):
+            written = fp.write(packer.pack_map_header(len(obj)))
+            for key, value in obj.items():
+                written += fp.write(packer.pack(key))
+                written += fp.write(packer.pack(value))
+        else:
+            written = fp.write(packer.pack(obj))
+        return written
+
+    @staticmethod
+    def load(stream):
+        """
+        Load from *stream*, which may be any bytes-like object (including a
+        :class:`memoryview` or :class:`mmap.mmap`, which are not copied)
+        or a file object open for binary reading.
+        """
+        if hasattr(stream, 'read'):
+            return msgpack.unpack(stream)
+        return msgpack.unpackb(stream)
+
+
+# Streaming JSON input
+
+# Only these four characters are whitespace between JSON tokens.
+_JSON_NON_WS = re.compile(r'[^ \t\n\r]')
+_JSON_NUMBER_TAIL = re.compile(r'[-+.eE0-9]*')
+_JSON_LITERALS = ('true', 'false', 'null', 'NaN', 'Infinity', '-Infinity')
+
+
+def _json_error_is_truncation(text, error):
+    # Could *error*, raised decoding *text*, go away given more text?
+    # Most errors are reported where decoding stopped, which for
+    # truncated text is its end; the others are reported at the
+    # start of the token that was cut off.
+    pos = error.pos
+    if pos >= len(text) or error.msg.startswith('Unterminated string'):
+        return True
+    if error.msg == 'Expecting value':
+        # 'tru' of 'true'
+        tail = text[pos:]
+        return any(literal.startswith(tail) for literal in _JSON_LITERALS)
+    if error.msg.startswith('Invalid \\uXXXX escape'):
+        # Room for a surrogate pair, 'uXXXX\\uXXXX'.
+        return len(text) - pos < 11
+    return False
+
+class _JsonArrayReader(object):
+    """
+    Incrementally decodes the elements of a top-level JSON array from
+    an iterable of chunks.
+
+    Only the text of the element currently being decoded (plus at most
+    the unconsumed remainder of one chunk) is held in memory.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder('utf-8')().decode
+        self._raw_decode = json.JSONDecoder().raw_decode
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, min_size=1):
+        # Add at least *min_size* characters of new text to the
+        # unconsumed portion of the buffer, discarding what's been
+        # consumed. Returns false if there was nothing left to read.
+        if self._eof:
+            return False
+        parts = [self._buf[self._pos:]]
+        size = 0
+        while size < min_size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                text = self._decode(b'', True)
+                self._eof = True
+            elif isinstance(chunk, str):
+                text = chunk
+            else:
+                text = self._decode(chunk)
+            parts.append(text)
+            size += len(text)
+            if self._eof:
+                break
+        self._buf = ''.join(parts)
+        self._pos = 0
+        return True
+
+    def _next_char(self):
+        # Skip whitespace and return the next character without consuming
+        # it, or the empty string at the end of the data.
+        while True:
+            match = _JSON_NON_WS.search(self._buf, self._pos)
+            if match is not None:
+                self._pos = match.start()
+                return self._buf[self._pos]
+            self._pos = len(self._buf)
+            if not self._fill():
+                return ''
+
+    def _next_value(self):
+        while True:
+            try:
+                value, end = self._raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as ex:
+                if not _json_error_is_truncation(self._buf, ex):
+                    raise
+                # Double the amount of text we're looking at so that
+                # very large elements don't get re-parsed once per
+                # chunk.
+                if not self._fill(max(len(self._buf) - self._pos, 1)):
+                    raise
+                continue
+            if (not self._eof
+                    and type(value) in (int, float) # pylint:disable=unidiomatic-typecheck
+                    and _JSON_NUMBER_TAIL.match(self._buf, end).end() == len(self._buf)):
+                # A number at the end of the buffer may be truncated
+                # (e.g., '1.' of '1.5'); we can't know until we see
+                # something that can't be part of it.
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _expect(self, chars):
+        char = self._next_char()
+        if not char or char not in chars:
+            raise ValueError("Expected one of %r in JSON array, found %r"
+                             % (chars, char or 'end of data'))
+        self._pos += 1
+        return char
+
+    def __iter__(self):
+        self._expect('[')
+        if self._next_char() == ']':
+            self._pos += 1
+        else:
+            while True:
+                self._next_char()
+                yield self._next_value()
+                if self._expect(',]') == ']':
+                    break
+        if self._next_char():
+            raise ValueError("Extra data after JSON array")
+
+
+def _iter_ndjson(chunks):
+    load = JsonRepresenter().load
+    pending = b''
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield load(line)
+    if pending.strip():
+        yield load(pending)
+
+
+def _iter_chunks(stream, chunk_size):
+    read = getattr(stream, 'read', None)
+    if read is None:
+        # Already an iterable of chunks, such as a WSGI input
+        # iterator.
+        yield from stream
+        return
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def iter_external_stream(stream, ndjson=False, chunk_size=65536):
+    """
+    Incrementally read external values from a JSON *stream*.
+
+    If *ndjson* is false (the default), the stream must contain a single
+    JSON array, and each of its elements is yielded as soon as it has
+    been parsed. Otherwise, the stream is newline-delimited JSON, and
+    each non-blank line is yielded. The whole document is never held
+    in memory.
+
+    :param stream: Either a file-like object with a ``read`` method,
+        which will be called with *chunk_size*, or an iterable of
+        chunks. Chunks may be bytes (UTF-8) or text.
+
+    .. versionadded:: 3.4.0
+    """
+    chunks = _iter_chunks(stream, chunk_size)
+    if ndjson:
+        return _iter_ndjson(chunks)
+    return iter(_JsonArrayReader(chunks))
+
+
+def iter_from_external_stream(stream, ndjson=False, context=None,
+                              require_updater=False, notify=True,
+                              chunk_size=65536):
+    """
+    Like :func:`iter_external_stream`, but create and yield an internal
+    object for each value as soon as it has been read.
+
+    Each value is handled the same way as an element of a sequence
+    passed to
+    :func:`~nti.externalization.internalization.update_from_external_object`:
+    if :func:`~nti.externalization.internalization.find_factory_for` finds a
+    factory for it, a new object is created and updated from the value
+    and yielded; otherwise, the value itself is yielded. The *context*,
+    *require_updater* and *notify* arguments are passed through.
+
+    .. versionadded:: 3.4.0
+    """
+    # pylint:disable=too-many-positional-arguments
+    for value in iter_external_stream(stream, ndjson, chunk_size):
+        # Wrapping each value in a one-element sequence gets us the
+        # exact sequence semantics without reimplementing them.
+        yield update_from_external_object(None, [value],
+                                          context=context,
+                                          require_updater=require_updater,
+                                          notify=notify)[0]
+
+
+def load_from_external_stream(stream, sink, batch_size=100, ndjson=False,
+                              **kwargs) -> int:
+    """
+    Read internal objects from *stream* as with
+    :func:`iter_from_external_stream`, and call *sink* with a list of at
+    most *batch_size* of them at a time. This is convenient for committing
+    a transaction or flushing a database connection periodically during a
+    large import.
+
+    Remaining keyword arguments are passed to
+    :func:`iter_from_external_stream`.
+
+    :return: The total number of objects passed to *sink*.
+    :raises ValueError: If *batch_size* is not positive.
+
+    .. versionadded:: 3.4.0
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive", batch_size)
+    count = 0
+    batch = []
+    for obj in iter_from_external_stream(stream, ndjson, **kwargs):
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            sink(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        sink(batch)
+        count += len(batch)
+    return count
+
+
 
 # YAML
 
@@ -266,12 +1255,17 @@ class _ExtDumper(yaml.SafeDumper):
     Therefore we must register their base types as multi-representers.
     """
 
-# The difference between 'add_representer' and 'add_multi_representer'
-# is that the multi version accepts subclasses, but the plain version
-# requires an exact type match.
-_ExtDumper.add_multi_representer(list, _ExtDumper.represent_list)
-_ExtDumper.add_multi_representer(dict, _ExtDumper.represent_dict)
-_ExtDumper.add_multi_representer(str, _ExtDumper.represent_str)
+_HAS_LIBYAML = getattr(yaml, '__with_libyaml__', False)
+
+if _HAS_LIBYAML:
+    class _CExtDumper(yaml.CSafeDumper): # pylint:disable=too-many-ancestors
+        """
+        The same as `_ExtDumper`, but emitting with libyaml.
+        """
+    _EXT_DUMPERS = (_ExtDumper, _CExtDumper)
+else: # pragma: no cover
+    _CExtDumper = None
+    _EXT_DUMPERS = (_ExtDumper,)
 
 def _yaml_represent_decimal(dumper, data):
     s = str(data)
@@ -289,27 +1283,59 @@ def _yaml_represent_decimal(dumper, data):
     if data.is_infinite():
         return dumper.represent_float(float('-inf') if data.is_signed() else float('+inf'))
     return dumper.represent_scalar('tag:yaml.org,2002:float', str(data).lower())
-_ExtDumper.add_representer(decimal.Decimal, _yaml_represent_decimal)
 
 # PyYAML uses the multi dumper on ``None`` as the fallback when
 # nothing else can be found.
 def _yaml_represent_unknown(dumper, data):
     ext_obj = _second_pass_to_external_object(data)
     return dumper.represent_data(ext_obj)
-_ExtDumper.add_multi_representer(None, _yaml_represent_unknown) # type:ignore[arg-type]
-
 
+def _yaml_represent_str(dumper, data):
+    # libyaml only accepts exact strings as scalar values.
+    return dumper.represent_str(str(data))
+
+for _dumper in _EXT_DUMPERS:
+    # The difference between 'add_representer' and 'add_multi_representer'
+    # is that the multi version accepts subclasses, but the plain version
+    # requires an exact type match.
+    _dumper.add_multi_representer(list, _dumper.represent_list)
+    _dumper.add_multi_representer(dict, _dumper.represent_dict)
+    _dumper.add_multi_representer(str, _yaml_represent_str)
+    _dumper.add_representer(decimal.Decimal, _yaml_represent_decimal)
+    _dumper.add_multi_representer(None, _yaml_represent_unknown) # type:ignore[arg-type]
+del _dumper
+
+
+def _yaml_construct_str(loader, node):
+    # yaml defines strings to be unicode, but
+    # the default reader encodes anything that can be
+    # represented as ASCII back to bytes. We don't
+    # want that.
+    return loader.construct_scalar(node)
 
 class _UnicodeLoader(yaml.SafeLoader):
+    construct_yaml_str = _yaml_construct_str
+
+if _HAS_LIBYAML:
+    class _CUnicodeLoader(yaml.CSafeLoader): # pylint:disable=too-many-ancestors
+        """
+        The same as `_UnicodeLoader`, but parsing with libyaml.
+        """
+        construct_yaml_str = _yaml_construct_str
+    _UNICODE_LOADERS = (_UnicodeLoader, _CUnicodeLoader)
+else: # pragma: no cover
+    _CUnicodeLoader = None
+    _UNICODE_LOADERS = (_UnicodeLoader,)
+
+for _loader in _UNICODE_LOADERS:
+    _loader.add_constructor('tag:yaml.org,2002:str', _yaml_construct_str)
+del _loader
 
-    def construct_yaml_str(self, node):
-        # yaml defines strings to be unicode, but
-        # the default reader encodes anything that can be
-        # represented as ASCII back to bytes. We don't
-        # want that.
-        return self.construct_scalar(node)
-_UnicodeLoader.add_constructor('tag:yaml.org,2002:str',
-                               _UnicodeLoader.construct_yaml_str)
+# The libyaml parser produces exactly the same objects, so it's always
+# used when available. The emitter is only used on request (see
+# YamlRepresenter.dump).
+_YAML_FAST_DUMPER = _ExtDumper if PURE_PYTHON or not _HAS_LIBYAML else _CExtDumper
+_YAML_LOADER = _UnicodeLoader if PURE_PYTHON or not _HAS_LIBYAML else _CUnicodeLoader
 
 
 @interface.named(EXT_REPR_YAML)
@@ -320,11 +1346,18 @@ class YamlRepresenter(object):
     """
 
     @staticmethod
-    def dump(obj, fp=None, **_unused) -> str:
+    def dump(obj, fp=None, use_libyaml=False, **_unused) -> str:
         """
-        dump(obj, fp=None) -> str
+        dump(obj, fp=None, use_libyaml=False) -> str
 
         Other keyword arguments are ignored.
+
+        .. versionchanged:: 3.4.0
+           Add the *use_libyaml* parameter. If true, and libyaml is
+           available, use it to emit mappings and sequences, which is
+           several times faster. The output loads identically, and is
+           usually byte-for-byte identical, but libyaml folds long
+           double-quoted (escaped) strings at different places.
         """
         # The default_flow_style changed in PyYaml 5.1 from None to False.
         # Using False produces multi-line, indented, verbose output. While being human readable,
@@ -332,11 +1365,22 @@ class YamlRepresenter(object):
         # produces JSON-compatible output in many cases. Using None (the old default)
         # produces backwards-compatible output that's a hybrid of indented and JSON-like.
         # https://github.com/yaml/pyyaml/issues/199
-        return yaml.dump(obj, stream=fp, Dumper=_ExtDumper, default_flow_style=True)
+        # libyaml omits the explicit document end marker ("...")
+        # after a bare top-level scalar; those are cheap to dump anyway.
+        dumper = (_YAML_FAST_DUMPER
+                  if use_libyaml and isinstance(obj, (dict, list))
+                  else _ExtDumper)
+        return yaml.dump(obj, stream=fp, Dumper=dumper, default_flow_style=True)
 
     @staticmethod
     def load(stream):
-        return yaml.load(stream, Loader=_UnicodeLoader)
+        """
+        load(stream) -> object
+
+        .. versionchanged:: 3.4.0
+           Use libyaml, when available. The results are unchanged.
+        """
+        return yaml.load(stream, Loader=_YAML_LOADER)
 
 
 # Misc
@@ -0,0 +1,452 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+A cache of external representations shared between processes.
+
+:class:`MappedRepresentationCache` stores the output of
+:func:`~nti.externalization.representation.to_external_representation`
+for committed persistent objects in a memory-mapped file. Because the
+file outlives any one process, a freshly started worker can serve
+objects that any worker on the same host has already serialized,
+straight from the operating system's page cache.
+
+.. versionadded:: 3.4.0
+"""
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+try:
+    import fcntl
+except ModuleNotFoundError: # pragma: no cover
+    fcntl = None # type:ignore[assignment]
+
+from zope import component
+
+from ._base_interfaces import NotGiven
+from .externalization import toExternalObject
+from .externalization.externalizer import _current_policy
+from .interfaces import EXT_REPR_JSON
+from .interfaces import IExternalObjectRepresenter
+from .interfaces import IExternalizationPolicy
+from .representation import _committed_identity
+from .representation import _dependencies_current
+
+__all__ = [
+    'MappedRepresentationCache',
+    'to_external_representation_cached',
+]
+
+# The file begins with a header, followed by a fixed-size hash
+# index of *slots*, followed by the data region. The data region is
+# used as a ring: records are appended at the write position, and
+# when it reaches the end, it starts again from the beginning,
+# overwriting the oldest records. Each index slot holds the digest of
+# a key, the offset and length of its record, and a CRC of its
+# payload; a slot only produces a hit if the record at that offset
+# still carries the same digest and the payload still matches the
+# CRC, so overwritten records, colliding slots, and records torn by a
+# crashed writer all read as misses.
+#
+# A payload is a kind byte, the dependencies (a count, followed by
+# the length-prefixed oid, database name and serial of each), and
+# the value.
+_MAGIC_PREFIX = b'NTIXRC'
+_MAGIC = _MAGIC_PREFIX + b'02'
+_HEADER = struct.Struct('<8sIQQ') # magic, slot count, data size, write position
+_HEADER_SIZE = 64
+_SLOT = struct.Struct('<16sQII') # digest, offset, length, crc32
+_RECORD = struct.Struct('<16sI') # digest, payload length
+_COUNT = struct.Struct('<I')
+_DEPENDENCY = struct.Struct('<HHH') # lengths of oid, database name, serial
+
+_KIND_BYTES = b'b'
+_KIND_STR = b's'
+
+
+class MappedRepresentationCache(object):
+    """
+    A size-bounded cache of serialized external representations,
+    backed by a memory-mapped file.
+
+    Entries are keyed by digests that include the object's oid,
+    database name and ``_p_serial``, so committing a change to an
+    object naturally orphans its old entries. An entry may also
+    record the serials of the other persistent objects its value was
+    derived from; it's a miss once any of those change. Space is reclaimed
+    oldest-first: the data region is a ring that new entries
+    overwrite. An entry is also lost if another key hashes to the
+    same index slot; sizing *slots* well above the expected number of
+    live entries keeps that rare.
+
+    Any number of processes on one host may open the same *path*
+    concurrently. Readers hold a shared ``flock`` on the file and
+    writers an exclusive one (on platforms without :mod:`fcntl`, only
+    threads within one process are synchronized). An instance may be
+    shared between threads, and is reopened automatically in a child
+    process after a ``fork``, so it is safe to create before a
+    pre-forking server starts its workers.
+
+    If *path* already holds a cache, its existing geometry is used
+    and *max_bytes* and *slots* are ignored. A cache in an older
+    format is replaced with a new file (processes that already have
+    the old one open keep using it until they reopen). If *path*
+    holds anything else, a :exc:`ValueError` is raised. The file is
+    created readable only by its owner.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, slots=65536):
+        """
+        :param str path: The file to use. It is created if needed.
+        :param int max_bytes: The size of the data region. Entries
+           larger than a quarter of this are not cached.
+        :param int slots: The number of index slots.
+        """
+        self.path = path
+        self._requested = (slots, max_bytes)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._fd = -1
+        self._map = None
+        self.slots = 0
+        self.max_bytes = 0
+        self._open()
+
+    def _open(self):
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                self._flock(fd, True)
+                try:
+                    ready = self._initialize(fd)
+                finally:
+                    self._funlock(fd)
+                if ready:
+                    self._map = mmap.mmap(fd, _HEADER_SIZE + self.slots * _SLOT.size + self.max_bytes)
+            except BaseException:
+                os.close(fd)
+                raise
+            if ready:
+                break
+            # The file at our path was replaced; open that one instead.
+            os.close(fd)
+        self._fd = fd
+        self._pid = os.getpid()
+
+    def _initialize(self, fd):
+        # Return whether *fd* can be mapped, or False if it's no longer
+        # the file at our path. Other processes may have the file
+        # mapped, so it is never shrunk: touching a page past the end
+        # of a mapped file raises SIGBUS. A cache in an older format
+        # is replaced by a new file instead, leaving anyone still
+        # using the old one undisturbed.
+        try:
+            if not os.path.samestat(os.fstat(fd), os.stat(self.path)):
+                return False
+        except FileNotFoundError:
+            return False
+        header = os.pread(fd, _HEADER.size, 0)
+        if header[:len(_MAGIC)] == _MAGIC and len(header) == _HEADER.size:
+            _, slots, max_bytes, _ = _HEADER.unpack(header)
+        elif not header:
+            # Newly created; nobody can have mapped it yet.
+            slots, max_bytes = self._requested
+            os.pwrite(fd, _HEADER.pack(_MAGIC, slots, max_bytes, 0), 0)
+        elif header.startswith(_MAGIC_PREFIX):
+            self._replace()
+            return False
+        else:
+            raise ValueError("Not a representation cache", self.path)
+        size = _HEADER_SIZE + slots * _SLOT.size + max_bytes
+        if os.fstat(fd).st_size < size:
+            os.ftruncate(fd, size)
+        self.slots = slots
+        self.max_bytes = max_bytes
+        return True
+
+    def _replace(self):
+        slots, max_bytes = self._requested
+        tmp = '%s.%d.tmp' % (self.path, os.getpid())
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.pwrite(fd, _HEADER.pack(_MAGIC, slots, max_bytes, 0), 0)
+            os.ftruncate(fd, _HEADER_SIZE + slots * _SLOT.size + max_bytes)
+        finally:
+            os.close(fd)
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def _flock(fd, exclusive):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    @staticmethod
+    def _funlock(fd):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _check_pid(self):
+        # After a fork, the child shares our open file description,
+        # and with it our flock; it needs its own.
+        if self._pid != os.getpid():
+            self._map.close()
+            os.close(self._fd)
+            self._open()
+
+    def close(self):
+        """Unmap and close the file."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                os.close(self._fd)
+                self._map = None
+                self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def key_for(obj, *parts):
+        """
+        Return the key for *obj* qualified by *parts* (which must have
+        a stable :func:`repr`), or None if *obj* is not a committed,
+        unmodified persistent object. This may activate a ghost.
+        """
+        identity = _committed_identity(obj)
+        if identity is None:
+            return None
+        return hashlib.blake2b(repr(identity + parts).encode('utf-8'),
+                               digest_size=16).digest()
+
+    def _slot_offset(self, key):
+        return _HEADER_SIZE + (int.from_bytes(key[:8], 'little') % self.slots) * _SLOT.size
+
+    def get(self, key, jar=None):
+        """
+        Return the str or bytes stored for *key*, or None.
+
+        If the entry was stored with *dependencies*, they are checked
+        using the connection *jar* (which may activate them); without
+        a *jar*, such an entry is a miss.
+        """
+        with self._lock:
+            self._check_pid()
+            mm = self._map
+            self._flock(self._fd, False)
+            try:
+                digest, offset, length, crc = _SLOT.unpack_from(mm, self._slot_offset(key))
+                if digest != key:
+                    return None
+                start = _HEADER_SIZE + self.slots * _SLOT.size + offset
+                if _RECORD.unpack_from(mm, start) != (key, length):
+                    return None
+                start += _RECORD.size
+                payload = mm[start:start + length]
+            finally:
+                self._funlock(self._fd)
+        if zlib.crc32(payload) != crc:
+            return None
+        kind = payload[:1]
+        dependencies, start = _unpack_dependencies(payload, 1)
+        if dependencies and (jar is None or not _dependencies_current(jar, dependencies)):
+            return None
+        if kind == _KIND_STR:
+            return payload[start:].decode('utf-8')
+        return payload[start:]
+
+    def set(self, key, value, dependencies=()):
+        """
+        Store *value*, a str or bytes, for *key*.
+
+        *dependencies* are the ``(oid, database_name, serial)`` of
+        other persistent objects that *value* was derived from.
+        """
+        if isinstance(value, str):
+            kind = _KIND_STR
+            value = value.encode('utf-8')
+        else:
+            kind = _KIND_BYTES
+        payload = kind + _pack_dependencies(dependencies) + bytes(value)
+        length = len(payload)
+        needed = _RECORD.size + length
+        if needed > self.max_bytes // 4:
+            return
+        crc = zlib.crc32(payload)
+        with self._lock:
+            self._check_pid()
+            mm = self._map
+            self._flock(self._fd, True)
+            try:
+                offset = _HEADER.unpack_from(mm, 0)[3]
+                if offset + needed > self.max_bytes:
+                    offset = 0
+                start = _HEADER_SIZE + self.slots * _SLOT.size + offset
+                _RECORD.pack_into(mm, start, key, length)
+                mm[start + _RECORD.size:start + needed] = payload
+                _SLOT.pack_into(mm, self._slot_offset(key), key, offset, length, crc)
+                _HEADER.pack_into(mm, 0, _MAGIC, self.slots, self.max_bytes, offset + needed)
+            finally:
+                self._funlock(self._fd)
+
+    def clear(self):
+        """
+        Discard all entries, for all processes.
+        """
+        with self._lock:
+            self._check_pid()
+            mm = self._map
+            self._flock(self._fd, True)
+            try:
+                mm[_HEADER_SIZE:_HEADER_SIZE + self.slots * _SLOT.size] = (
+                    b'\0' * (self.slots * _SLOT.size)
+                )
+                _HEADER.pack_into(mm, 0, _MAGIC, self.slots, self.max_bytes, 0)
+            finally:
+                self._funlock(self._fd)
+
+
+def _pack_dependencies(dependencies):
+    parts = [_COUNT.pack(len(dependencies))]
+    for oid, db_name, serial in dependencies:
+        db_name = db_name.encode('utf-8')
+        parts.append(_DEPENDENCY.pack(len(oid), len(db_name), len(serial)))
+        parts.append(oid)
+        parts.append(db_name)
+        parts.append(serial)
+    return b''.join(parts)
+
+
+def _unpack_dependencies(payload, start):
+    count, = _COUNT.unpack_from(payload, start)
+    start += _COUNT.size
+    dependencies = []
+    for _ in range(count):
+        oid_len, db_len, serial_len = _DEPENDENCY.unpack_from(payload, start)
+        start += _DEPENDENCY.size
+        oid = payload[start:start + oid_len]
+        start += oid_len
+        db_name = payload[start:start + db_len].decode('utf-8')
+        start += db_len
+        serial = payload[start:start + serial_len]
+        start += serial_len
+        dependencies.append((oid, db_name, serial))
+    return dependencies, start
+
+
+class _DependencyCollector(object):
+    # Records the identity of every persistent object externalized
+    # beneath the root. This plugs into the same hook as
+    # nti.externalization.representation.JsonFragmentCache, but never
+    # caches anything itself.
+
+    __slots__ = ('root', 'dependencies', 'cacheable')
+
+    def __init__(self, root):
+        self.root = root
+        self.dependencies = set()
+        self.cacheable = True
+
+    def key_for(self, obj, name, policy, decorate): # pylint:disable=unused-argument
+        if obj is not self.root:
+            identity = _committed_identity(obj)
+            if identity is not None:
+                self.dependencies.add(identity)
+            elif getattr(obj, '_p_changed', None):
+                # Uncommitted state can't be cached.
+                self.cacheable = False
+        return None
+
+    def get(self, key, last_modified_collector):
+        "Never called; :meth:`key_for` always returns None."
+
+    def begin(self, key):
+        "Never called; :meth:`key_for` always returns None."
+
+    def end(self, key, external, last_modified): # pylint:disable=unused-argument
+        return external
+
+    def reuse(self, obj, name, policy, decorate):
+        "Already recorded by :meth:`key_for`."
+
+
+def _dotted_name(obj):
+    return '%s.%s' % (getattr(obj, '__module__', None),
+                      getattr(obj, '__qualname__', type(obj).__qualname__))
+
+
+def _policy_key(policy):
+    # Stable across processes, unlike the policy's repr.
+    converters = policy.leaf_converters or {}
+    return (policy.use_iso8601_for_unix_timestamp,
+            sorted((_dotted_name(kind), _dotted_name(converter))
+                   for kind, converter in converters.items()))
+
+
+def _site_key(registry):
+    # Adapters, decorators and policies are all found in the site.
+    if getattr(registry, '_p_jar', None) is not None:
+        return _committed_identity(registry)
+    return (_dotted_name(registry), getattr(registry, '__name__', None))
+
+
+def to_external_representation_cached(obj, cache, ext_format=EXT_REPR_JSON,
+                                      name=NotGiven, policy_name=NotGiven,
+                                      audience=None, **repr_kwargs):
+    """
+    to_external_representation_cached(obj, cache, ext_format='json', name=NotGiven, policy_name=NotGiven, audience=None, **repr_kwargs) -> str|bytes
+
+    Like :func:`~nti.externalization.representation.to_external_representation`,
+    but first consult the :class:`MappedRepresentationCache` *cache*,
+    and store the result there when *obj* is a committed, unmodified
+    persistent object.
+
+    The cache key includes *ext_format*, *name*, the externalization
+    policy (the one named by *policy_name*, or else the one that is
+    currently active), the current site manager, *audience* and the
+    *repr_kwargs*. A policy is identified by its settings, using the
+    dotted names of its leaf converters. A persistent site manager is
+    identified by its oid and serial, and nothing is cached while it
+    has uncommitted changes; any other is identified by its class and
+    ``__name__``. Decorators often vary their
+    output by request (for example, by the authenticated user); when
+    they do, callers must pass a distinct (and stable across
+    processes) *audience* for each variation, or cached output will
+    leak between them.
+
+    The entry also records the serials of the other persistent
+    objects externalized beneath *obj*, and is only used while none
+    of them have changed (checking may load them). If any of them has
+    uncommitted changes, nothing is cached. Persistent objects whose
+    state is read without being externalized themselves are not
+    tracked.
+
+    The *repr_kwargs* must not include *fp*.
+    """
+    if policy_name is not NotGiven:
+        policy = component.getUtility(IExternalizationPolicy, policy_name)
+    else:
+        policy = _current_policy()
+    site = _site_key(component.getSiteManager())
+    key = None
+    if site is not None:
+        key = cache.key_for(obj, ext_format, name, _policy_key(policy), site, audience,
+                            sorted(repr_kwargs.items()))
+    if key is not None:
+        result = cache.get(key, obj._p_jar)
+        if result is not None:
+            return result
+
+    io = component.getUtility(IExternalObjectRepresenter, name=ext_format)
+    collector = _DependencyCollector(obj) if key is not None else NotGiven
+    result = io.dump(toExternalObject(obj, name=name, policy=policy,
+                                      fragment_cache=collector),
+                     **repr_kwargs)
+    if key is not None and collector.cacheable:
+        cache.set(key, result, sorted(collector.dependencies))
+    return result
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks dumping and loading YAML with and without libyaml.
+
+"""
+
+import decimal
+import sys
+
+import pyperf as perf
+import yaml
+
+from nti.externalization import representation
+
+INNER_LOOPS = 10
+
+DATA = [
+    {
+        'Class': 'Address',
+        'MimeType': 'application/vnd.nextthought.benchmarks.address',
+        'full_name': 'Steve Jobs',
+        'street_address_1': '1313 Mockingbird Lane',
+        'city': 'Salem',
+        'postal_code': '6666',
+        'amount': decimal.Decimal('12.50'),
+        'tags': ['a', 'b', 'é'],
+        'Last Modified': 1234567890.5,
+        'flag': None,
+    }
+] * 100
+
+
+def dump_time_func(loops, dumper):
+    begin = perf.perf_counter()
+    for _ in range(loops):
+        for _ in range(INNER_LOOPS):
+            yaml.dump(DATA, Dumper=dumper, default_flow_style=True)
+    end = perf.perf_counter()
+    return end - begin
+
+def load_time_func(loops, loader, text):
+    begin = perf.perf_counter()
+    for _ in range(loops):
+        for _ in range(INNER_LOOPS):
+            yaml.load(text, Loader=loader)
+    end = perf.perf_counter()
+    return end - begin
+
+
+def main(runner=None):
+    if not representation._HAS_LIBYAML: # pragma: no cover
+        print("libyaml is not available", file=sys.stderr)
+        return
+
+    text = yaml.dump(DATA, Dumper=representation._ExtDumper, default_flow_style=True)
+    # The fast paths are only useful if they change nothing.
+    assert yaml.dump(DATA, Dumper=representation._CExtDumper,
+                     default_flow_style=True) == text
+    assert (yaml.load(text, Loader=representation._CUnicodeLoader)
+            == yaml.load(text, Loader=representation._UnicodeLoader))
+
+    runner = runner or perf.Runner()
+    for kind, dumper, loader in (
+            ('python', representation._ExtDumper, representation._UnicodeLoader),
+            ('libyaml', representation._CExtDumper, representation._CUnicodeLoader),
+    ):
+        runner.bench_time_func(__name__ + ": dump " + kind,
+                               dump_time_func,
+                               dumper,
+                               inner_loops=INNER_LOOPS)
+        runner.bench_time_func(__name__ + ": load " + kind,
+                               load_time_func,
+                               loader, text,
+                               inner_loops=INNER_LOOPS)
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,10 @@ Tests for autopackage.py
 
 """
 
+import json
+import os
+import sys
+import tempfile
 import unittest
 
 from zope import interface
@@ -19,7 +23,9 @@ from hamcrest import is_
 from hamcrest import is_not as does_not
 from hamcrest import none
 
+from ..autopackage import AutoPackageManifest
 from ..autopackage import AutoPackageSearchingScopedInterfaceObjectIO as AutoPackage
+from ..autopackage import get_manifest
 
 # disable: accessing protected members, too many methods
 # pylint: disable=W0212,R0904
@@ -161,3 +167,95 @@ class TestAutoPackageIO(unittest.TestCase):
                     contains_string('AP for <InterfaceClass'))
         assert_that(repr(AP(E())),
                     contains_string('IExt>'))
+
+
+class TestAutoPackageManifest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'manifest.json')
+
+    def test_stamp(self):
+        this = sys.modules[__name__]
+        stamp = AutoPackageManifest.stamp([this, None, this])
+        assert_that(stamp, is_([[__name__,
+                                 os.stat(__file__).st_mtime_ns,
+                                 os.stat(__file__).st_size]]))
+        # Built-in modules are ignored.
+        assert_that(AutoPackageManifest.stamp([this, sys]), is_(stamp))
+
+        class Missing(object):
+            __name__ = 'missing'
+            __file__ = os.path.join(os.path.dirname(__file__), 'missing.py')
+
+        assert_that(AutoPackageManifest.stamp([this, Missing()]), is_(none()))
+
+    def test_get_set(self):
+        manifest = AutoPackageManifest(self.path)
+        stamp = AutoPackageManifest.stamp([sys.modules[__name__]])
+        assert_that(manifest.get('key', stamp), is_(none()))
+
+        manifest.set('key', stamp, {'mod': ['A']})
+        manifest.set('uncachable', None, {'mod': ['B']})
+        assert_that(manifest.get('key', stamp), is_({'mod': ['A']}))
+        assert_that(manifest.get('key', [['other', 0, 0]]), is_(none()))
+        assert_that(manifest.get('key', None), is_(none()))
+
+        # Another process sees it, and its entries are merged.
+        other = AutoPackageManifest(self.path)
+        assert_that(other.get('key', stamp), is_({'mod': ['A']}))
+        assert_that(other.get('uncachable', None), is_(none()))
+        manifest.set('key2', stamp, {})
+        other.set('key3', stamp, {})
+        with open(self.path, encoding='utf-8') as f:
+            assert_that(sorted(json.load(f)['entries']), is_(['key', 'key2', 'key3']))
+
+        assert_that(get_manifest(self.path), is_(get_manifest(self.path)))
+        assert_that(get_manifest(self.path).get('key3', stamp), is_({}))
+
+    def test_bad_files_are_ignored(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('not json')
+        manifest = AutoPackageManifest(self.path)
+        assert_that(manifest.get('key', []), is_(none()))
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': -1, 'entries': {'key': {'stamp': [], 'value': 1}}}, f)
+        assert_that(AutoPackageManifest(self.path).get('key', []), is_(none()))
+
+        # Unwritable locations don't raise.
+        manifest = AutoPackageManifest(os.path.join(self.path, 'nope', 'manifest.json'))
+        manifest.set('key', [], 1)
+        assert_that(manifest.get('key', []), is_(1))
+
+    def test_find_factories_not_in_module(self):
+        class IExt(interface.Interface):
+            interface.taggedValue('__external_class_name__', 'Ext')
+
+        @interface.implementer(IExt)
+        class Hidden(object):
+            pass
+
+        path = self.path
+
+        class AP(AutoPackage):
+            _ap_manifest = AutoPackageManifest(path)
+            _ext_search_module = sys.modules[__name__]
+
+            @classmethod
+            def _ap_enumerate_module_names(cls):
+                return ('test_autopackage', 'test_zcml')
+
+            @classmethod
+            def _ap_enumerate_externalizable_root_interfaces(cls, unused_ifaces):
+                return (IExt,)
+
+            @classmethod
+            def _ap_find_potential_factories_in_module(cls, module):
+                yield Hidden
+
+        reg = AP._ap_find_factories('nti.externalization.tests')
+        assert_that(reg, has_property('Hidden', Hidden))
+        # It couldn't be found again, so nothing was recorded.
+        self.assertFalse(os.path.exists(path))
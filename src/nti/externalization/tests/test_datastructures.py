@@ -358,6 +358,60 @@ class TestInterfaceObjectIO(CleanUp,
         assert_that(result,
                     is_({'Class': self.__class__.__name__}))
 
+    def test_toExternalObject_schema_order(self):
+        from zope import schema
+
+        class IOrdered(interface.Interface):
+            zeta = schema.TextLine()
+            alpha = schema.Int()
+            plain = interface.Attribute("Not a field")
+            middle = schema.Bool()
+
+        @interface.implementer(IOrdered)
+        class Ordered(object):
+            plain = 'p'
+            middle = True
+            alpha = 1
+            zeta = 'z'
+
+        inst = self._makeOne(Ordered(), iface_upper_bound=IOrdered)
+        assert_that(inst._ext_ordered_keys(),
+                    is_(('zeta', 'alpha', 'middle', 'plain')))
+        assert_that(list(inst.toExternalObject()),
+                    is_(['Class', 'zeta', 'alpha', 'middle', 'plain']))
+
+    def test_ordered_keys_follow_all_possible_keys(self):
+        from zope import schema
+        from nti.externalization.datastructures import InterfaceObjectIO
+
+        class IExtra(interface.Interface):
+            extra = schema.TextLine()
+
+        class IOrdered(interface.Interface):
+            zeta = schema.TextLine()
+            alpha = schema.Int()
+
+        @interface.implementer(IOrdered, IExtra)
+        class Ordered(object):
+            zeta = 'z'
+            alpha = 1
+            extra = 'e'
+            other = 'o'
+
+        class IO(InterfaceObjectIO):
+            keys = frozenset(['zeta', 'alpha'])
+            def _ext_all_possible_keys(self):
+                return self.keys
+
+        inst = IO(Ordered(), iface_upper_bound=IOrdered)
+        assert_that(inst._ext_ordered_keys(), is_(('zeta', 'alpha')))
+        # The cached order isn't used for different keys, and the
+        # fields of the other interfaces provided keep their order.
+        inst.keys = frozenset(['other', 'alpha', 'zeta', 'extra'])
+        assert_that(inst._ext_ordered_keys(), is_(('extra', 'zeta', 'alpha', 'other')))
+        inst.keys = frozenset(['zeta', 'alpha'])
+        assert_that(inst._ext_ordered_keys(), is_(('zeta', 'alpha')))
+
     def test_toExternalObject_external_class_name_iro(self):
 
         class IBruce(interface.Interface):
@@ -655,6 +709,36 @@ class TestExternalizableInstanceDict(CommonTestMixin,
         return FUT()
 
 
+    def test_keys_in_assignment_order(self):
+        class O(object):
+            pass
+        o = O()
+        o.zeta = 1
+        o.alpha = 2
+        o._private = 3
+        inst = self._makeOne(o)
+        assert_that(inst._ext_keys(), is_(['zeta', 'alpha']))
+        assert_that(list(inst.toExternalObject()),
+                    is_(['Class', 'zeta', 'alpha']))
+
+    def test_ordered_keys_follow_all_possible_keys(self):
+        from nti.externalization.datastructures import _ExternalizableInstanceDict
+        class O(object):
+            computed = 'c'
+        o = O()
+        o.zeta = 1
+        o.hidden = 2
+        o.alpha = 3
+
+        class IO(_ExternalizableInstanceDict):
+            def _ext_all_possible_keys(self):
+                return frozenset(['zeta', 'alpha', 'computed'])
+
+        inst = IO(o)
+        assert_that(inst._ext_keys(), is_(['zeta', 'alpha', 'computed']))
+        assert_that(inst.toExternalObject(),
+                    is_({'Class': 'O', 'zeta': 1, 'alpha': 3, 'computed': 'c'}))
+
     def test_can_also_subclass_persistent(self):
         try:
             from persistent import Persistent
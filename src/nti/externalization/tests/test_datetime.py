@@ -107,6 +107,42 @@ class TestDatetime(ExternalizationLayerTest):
                                          local_tzname='US/Eastern'),
                     is_(IDateTime('2014-01-20T05:00Z')))
 
+    def test_fast_path_matches_isodate(self):
+        import isodate
+        from nti.externalization.datetime_ext import _as_utc_naive
+
+        for string in ('2014-01-20T00:00:00Z',
+                       '2014-01-20T00:00:00.5-05:00',
+                       '2014-01-20T00:00:00.123456+05:30',
+                       '2014-01-20T00:00:00',
+                       '2014-01-20T00:00Z'):
+            for assume_local in (False, True):
+                expected = _as_utc_naive(isodate.parse_datetime(string),
+                                         assume_local, 'US/Central')
+                assert_that(datetime_from_string(string, assume_local, 'US/Central'),
+                            is_(expected))
+
+        # Valid shapes with invalid values raise the same errors.
+        with self.assertRaises(ValueError) as fast:
+            datetime_from_string('2014-02-30T00:00:00Z')
+        with self.assertRaises(ValueError) as slow:
+            isodate.parse_datetime('2014-02-30T00:00:00Z')
+        assert_that(str(fast.exception), is_(str(slow.exception)))
+
+        with self.assertRaises(InvalidValue):
+            datetime_from_string('2014-01-20')
+
+    def test_batch(self):
+        from nti.externalization.datetime_ext import dates_from_strings
+        from nti.externalization.datetime_ext import datetimes_from_strings
+
+        strings = ['2014-01-20T00:00:00', '2014-01-20T00:00:00-05:00']
+        assert_that(datetimes_from_strings(strings, assume_local=True,
+                                           local_tzname='US/Eastern'),
+                    is_([IDateTime('2014-01-20T05:00Z')] * 2))
+        assert_that(dates_from_strings(['1982-01-31', '19820131']),
+                    is_([date(1982, 1, 31)] * 2))
+
     def test_timedelta_to_string(self):
         the_delt = timedelta(weeks=16)
         assert_that(the_delt, externalizes(is_('P112D')))
@@ -129,6 +165,12 @@ class TestTzinfo(unittest.TestCase):
             zone = _local_tzinfo('dne')
             assert_that(zone, is_(pytz.timezone('Etc/GMT+5')))
 
+            # The cached answer follows changes to the settings.
+            os.environ['TZ'] = 'CST+06'
+            time.tzset()
+            zone = _local_tzinfo('dne')
+            assert_that(zone, is_(pytz.timezone('Etc/GMT+6')))
+
 
 def doctest_setUp(_):
     xmlconfig.file('configure.zcml', nti.externalization)
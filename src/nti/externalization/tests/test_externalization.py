@@ -677,6 +677,30 @@ class TestToExternalObject(ExternalizationLayerTest):
         assert_that(ex_dic,
                     has_entry(StandardExternalFields.CREATED_TIME, is_(expected_string)))
 
+    def test_timestamp_to_string_cached(self):
+        from ..externalization import standard_fields
+        from ..externalization.standard_fields import timestamp_to_string
+        from ..externalization.standard_fields import datetime_to_string
+
+        assert_that(timestamp_to_string(8675309.5), is_('1970-04-11T09:48:29Z'))
+        # Cached
+        assert_that(timestamp_to_string(8675309.5),
+                    is_(same_instance(timestamp_to_string(8675309.5))))
+        dt = datetime.datetime.fromtimestamp(8675309.5, datetime.timezone.utc)
+        assert_that(datetime_to_string(dt), is_('1970-04-11T09:48:29Z'))
+        # The least recently used entries are the ones evicted.
+        cache = standard_fields._timestamp_strings
+        cache.cache_clear()
+        maxsize = cache.cache_info().maxsize
+        for ts in range(maxsize):
+            timestamp_to_string(ts)
+        timestamp_to_string(0)
+        timestamp_to_string(maxsize)
+        hits = cache.cache_info().hits
+        timestamp_to_string(0)
+        assert_that(cache.cache_info().hits, is_(hits + 1))
+        assert_that(cache.cache_info().currsize, is_(maxsize))
+
     def test_to_stand_dict_prefers_direct_fields(self):
         if dub_interfaces is None:
             self.skipTest('zope.dublincore not installed')
@@ -696,6 +720,26 @@ class TestToExternalObject(ExternalizationLayerTest):
                     has_entry(StandardExternalFields.CREATED_TIME, is_(X.createdTime)))
 
 
+    def test_last_modified_collector(self):
+        from ..externalization import LastModifiedCollector
+        from ..interfaces import ExternalizationPolicy
+
+        class X(ExternalizableInstanceDict):
+            def __init__(self, lastModified, children=()):
+                self.lastModified = lastModified
+                self.children = list(children)
+
+        tree = X(10, [X(30, [X(20)]), X(5)])
+        for policy in (None, ExternalizationPolicy(use_iso8601_for_unix_timestamp=True)):
+            collector = LastModifiedCollector()
+            kwargs = {'policy': policy} if policy is not None else {}
+            toExternalObject(tree, last_modified_collector=collector, **kwargs)
+            assert_that(collector.last_modified, is_(30))
+
+        collector = LastModifiedCollector()
+        toExternalObject([{'a': 1}], last_modified_collector=collector)
+        assert_that(collector.last_modified, is_(none()))
+
     def test_stand_ext_props(self):
         self.assertIn(StandardExternalFields.CREATED_TIME,
                       StandardExternalFields.EXTERNAL_KEYS)
@@ -922,3 +966,139 @@ class TestDeprecatedImports(unittest.TestCase):
             sif = getattr(externalization, 'StandardInternalFields')
 
         assert_that(sif, is_(same_instance(interfaces.StandardInternalFields)))
+
+
+try:
+    from persistent import Persistent
+except ModuleNotFoundError: # pragma: no cover
+    Persistent = None
+else:
+    class DeltaNode(Persistent):
+        calls = 0
+        value = None
+        children = ()
+
+        def toExternalObject(self, **kwargs):
+            type(self).calls += 1
+            return {
+                'value': self.value,
+                'children': [toExternalObject(c, **kwargs) for c in self.children],
+                'first': toExternalObject(self.children[0]) if self.children else None,
+            }
+
+
+class TestExternalDelta(ExternalizationLayerTest):
+
+    def test_snapshot(self):
+        from ..externalization import apply_external_delta
+        from ..externalization import to_external_delta
+
+        obj = {'a': 1, 'b': {'c': 2, 'd': 3}, 'e': [1], 'f': 'gone'}
+        before = toExternalObject(obj)
+        del obj['f']
+        obj['b']['d'] = 4
+        obj['g'] = 'new'
+        patch = to_external_delta(obj, since=before)
+        assert_that(patch, is_({'b': {'d': 4}, 'f': None, 'g': 'new'}))
+        assert_that(apply_external_delta(before, patch), is_(toExternalObject(obj)))
+        assert_that(to_external_delta(obj, since=toExternalObject(obj)), is_({}))
+        # Non-mappings are replaced whole
+        assert_that(to_external_delta([1, 2], since={}), is_([1, 2]))
+        assert_that(apply_external_delta({'a': 1}, [1, 2]), is_([1, 2]))
+
+    def test_last_modified_watermark(self):
+        from ..externalization import to_external_delta
+
+        class X(ExternalizableInstanceDict):
+            def __init__(self, lastModified, **kwargs):
+                self.lastModified = lastModified
+                self.__dict__.update(kwargs)
+
+        obj = X(30, old=X(10, name='old'), new=X(40, name='new'),
+                items=[X(10, name='item')], plain={'inner': X(10)})
+        patch = to_external_delta(obj, since=35)
+        assert_that(patch, is_not(has_key('old')))
+        assert_that(patch['new'], has_entry('name', 'new'))
+        # Sequences can't be patched, so they're complete...
+        assert_that(patch['items'][0], has_entry('name', 'item'))
+        # ...but mappings are
+        assert_that(patch['plain'], is_({}))
+        assert_that(to_external_delta(obj, since=40), is_({}))
+        # Everything within a changed object is included.
+        patch = to_external_delta(obj, since=15)
+        assert_that(patch['old'], has_entry('name', 'old'))
+        assert_that(patch['plain']['inner'], has_entry('Last Modified', 10))
+        assert_that(calling(to_external_delta).with_args(obj, since='15'),
+                    raises(TypeError))
+
+    def test_last_modified_watermark_replaced_child(self):
+        from ..externalization import apply_external_delta
+        from ..externalization import to_external_delta
+
+        class X(ExternalizableInstanceDict):
+            def __init__(self, lastModified, **kwargs):
+                self.lastModified = lastModified
+                self.__dict__.update(kwargs)
+
+        obj = X(30, child=X(10, name='a'))
+        before = toExternalObject(obj)
+        # The new child is older than the watermark, but it's not
+        # what was there before.
+        obj.child = X(5, name='b')
+        obj.lastModified = 40
+        patch = to_external_delta(obj, since=30)
+        assert_that(patch['child'], has_entry('name', 'b'))
+        assert_that(apply_external_delta(before, patch), is_(toExternalObject(obj)))
+
+    def test_serial_watermark(self):
+        if Persistent is None: # pragma: no cover
+            self.skipTest("Requires persistent")
+        import transaction
+        from ZODB import DB
+        from ZODB.MappingStorage import MappingStorage
+
+        from ..externalization import to_external_delta
+
+        db = DB(MappingStorage())
+        self.addCleanup(db.close)
+        self.addCleanup(transaction.abort)
+        conn = db.open()
+        root = conn.root()
+        root['obj'] = obj = DeltaNode()
+        obj.children = [DeltaNode(), DeltaNode()]
+        obj.children[0].value = 'unchanged'
+        transaction.commit()
+        since = obj._p_serial
+
+        obj.value = 'changed'
+        obj.children[1].value = 'changed'
+        obj.children = list(obj.children)
+        transaction.commit()
+        conn.cacheMinimize()
+
+        patch = to_external_delta(obj, since=since)
+        assert_that(patch, has_entry('value', 'changed'))
+        # obj itself changed, so even its unchanged children are included.
+        assert_that(patch['first'], is_({'value': 'unchanged', 'children': [], 'first': None}))
+        assert_that(patch['children'], is_([{'value': 'unchanged', 'children': [], 'first': None},
+                                            {'value': 'changed', 'children': [], 'first': None}]))
+        assert_that(to_external_delta(obj, since=obj._p_serial), is_({}))
+        assert_that(to_external_delta(obj, since=obj._p_mtime), is_({}))
+
+        # A change deep within unchanged objects is found.
+        grandchild = DeltaNode()
+        obj.children[0].children = [grandchild]
+        transaction.commit()
+        since = obj.children[0]._p_serial
+        grandchild.value = 'deep'
+        transaction.commit()
+        patch = to_external_delta(obj, since=since)
+        assert_that(patch['first'], has_entry('value', 'unchanged'))
+        assert_that(patch['first']['children'], is_([{'value': 'deep',
+                                                      'children': [],
+                                                      'first': None}]))
+        assert_that(patch, has_entry('value', 'changed'))
+        # Uncommitted changes count.
+        grandchild.value = 'deeper'
+        patch = to_external_delta(obj, since=grandchild._p_serial)
+        assert_that(patch['first']['children'][0], has_entry('value', 'deeper'))
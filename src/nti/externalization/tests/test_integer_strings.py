@@ -46,6 +46,26 @@ class TestIntStrings(unittest.TestCase):
     def test_bad_value(self):
         assert_that(calling(from_external_string).with_args(''),
                     raises(ValueError, "Improper key"))
+        assert_that(calling(from_external_string).with_args('a-b'),
+                    raises(ValueError, "Improper key"))
+
+    def test_confusable_and_version(self):
+        assert_that(from_external_string('oOQlLiI'),
+                    is_(from_external_string('0001111')))
+        assert_that(from_external_string(b'xkr$'), is_(6773))
+        assert_that(from_external_string('@'), is_(0))
+        assert_that(to_external_string(0), is_('@'))
+        assert_that(to_external_string(-1), is_(''))
+
+    def test_batch(self):
+        from nti.externalization.integer_strings import from_external_strings
+        from nti.externalization.integer_strings import to_external_strings
+        from array import array
+
+        ints = array('q', [0, 1, 54, 55, 3025, 123456789, sys.maxsize])
+        strings = to_external_strings(ints)
+        assert_that(strings, is_([to_external_string(i) for i in ints]))
+        assert_that(from_external_strings(strings), is_(list(ints)))
 
 def test_suite():
     import doctest
@@ -152,6 +152,21 @@ class TestFunctions(CleanUp,
                 del TestFunctions.__external_can_create__
                 handler.uninstall()
 
+    def test_register_factories_from_module_lazy(self):
+        from nti.externalization.internalization.legacy_factories import \
+            register_factories_from_module
+
+        register_factories_from_module(__name__, lazy=True)
+        # Nothing has been examined yet
+        assert_that(__name__, is_in(INT.LEGACY_FACTORY_SEARCH_MODULES))
+        TestFunctions.__external_can_create__ = True
+        try:
+            assert_that(INT.find_factory_for_class_name('TestFunctions'),
+                        equal_to(TestFunctions))
+        finally:
+            del TestFunctions.__external_can_create__
+        assert_that(INT.LEGACY_FACTORY_SEARCH_MODULES, is_(set()))
+
 
 class TestDefaultExternalizedObjectFactory(CleanUp,
                                            unittest.TestCase):
@@ -347,6 +362,66 @@ class TestResolveExternals(CleanUp,
         INT.externals.resolve_externals(IO(), self, ext_value)
         assert_that(ext_value, is_({'a': 'b'}))
 
+    def test_oids_bulk_resolver(self):
+        from nti.externalization.interfaces import IExternalReferenceBulkResolver
+        from nti.externalization.interfaces import IExternalReferenceResolver
+
+        class IO(object):
+            __external_oids__ = ('a', 'b', 'c')
+
+        calls = []
+        class BulkResolver(object):
+
+            def __init__(self, context):
+                pass
+
+            def resolve_many(self, references):
+                calls.append(list(references))
+                return [str(r) for r in references]
+
+        def fail(*args):
+            raise AssertionError("Should not be called")
+
+        component.provideAdapter(BulkResolver,
+                                 provides=IExternalReferenceBulkResolver,
+                                 adapts=(object,))
+        component.provideAdapter(fail,
+                                 provides=IExternalReferenceResolver,
+                                 adapts=(object, object))
+
+        ext_value = {'a': 1, 'b': [2, 3, 4]}
+        INT.externals.resolve_externals(IO(), self, ext_value)
+        assert_that(ext_value, is_({'a': '1', 'b': ['2', '3', '4']}))
+        assert_that(calls, is_([[1, 2, 3, 4]]))
+
+        # Nothing to resolve, no call.
+        del calls[:]
+        ext_value = {'b': []}
+        INT.externals.resolve_externals(IO(), self, ext_value)
+        assert_that(ext_value, is_({'b': []}))
+        assert_that(calls, is_([]))
+
+    def test_oids_bulk_resolver_wrong_length(self):
+        from nti.externalization.interfaces import IExternalReferenceBulkResolver
+
+        class IO(object):
+            __external_oids__ = ('a',)
+
+        class BulkResolver(object):
+
+            def __init__(self, context):
+                pass
+
+            def resolve_many(self, references):
+                return ()
+
+        component.provideAdapter(BulkResolver,
+                                 provides=IExternalReferenceBulkResolver,
+                                 adapts=(object,))
+
+        with self.assertRaises(ValueError):
+            INT.externals.resolve_externals(IO(), self, {'a': [1, 2]})
+
 
 class TestUpdateFromExternaObject(CleanUp,
                                   unittest.TestCase):
@@ -11,6 +11,7 @@ from zope.testing.cleanup import CleanUp
 
 from hamcrest import assert_that
 from hamcrest import is_
+from hamcrest import same_instance
 
 from ..oids import fromExternalOID
 from ..oids import toExternalOID
@@ -72,6 +73,58 @@ class TestToExternalOID(CleanUp,
         result = toExternalOID(Persistent(), add_to_intids=True)
         assert_that(result, is_(b'0x616263::y'))
 
+    def test_to_external_oids(self):
+        from zope import component
+        from zope.interface import implementer
+        try:
+            from zope.intid.interfaces import IIntIds
+        except ModuleNotFoundError:
+            self.skipTest('Intids not installed')
+        from ..extension_points import prepare_external_identifiers
+        from ..oids import prepare_external_oids
+        from ..oids import to_external_oids
+
+        @implementer(IIntIds)
+        class IntIds(object):
+            def queryId(self, obj):
+                return obj.intid
+
+        class Jar(object):
+            database_name = 'main'
+            db_calls = 0
+
+            def db(self):
+                self.db_calls += 1
+                return self
+
+        jar = Jar()
+
+        class Persistent(object):
+            _p_jar = jar
+
+            def __init__(self, oid, intid):
+                self._p_oid = oid
+                self.intid = intid
+
+        component.provideUtility(IntIds())
+        objects = [Persistent(b'abc', 1), Persistent(b'abd', None), object()]
+        results = to_external_oids(objects, default='default')
+        assert_that(results, is_([b'0x616263:6d61696e:y', b'0x616264:6d61696e', 'default']))
+        # The database name is only looked up once per connection.
+        assert_that(jar.db_calls, is_(1))
+        # By default, nothing is prepared.
+        objects = [Persistent(b'abc', 1), Persistent(b'abd', 2)]
+        prepare_external_identifiers(objects)
+        self.assertFalse(hasattr(objects[0], '_v_to_external_oid'))
+        # When asked, the results are cached...
+        prepare_external_oids(objects + [object()])
+        assert_that([o._v_to_external_oid for o in objects], # pylint:disable=protected-access
+                    is_([b'0x616263:6d61696e:y', b'0x616264:6d61696e:x']))
+        # ...where the singular version finds them
+        objects[0].intid = 42
+        assert_that(toExternalOID(objects[0]), is_(b'0x616263:6d61696e:y'))
+
+
 class TestFromExternalOID(unittest.TestCase):
 
     def test_with_intid(self):
@@ -80,3 +133,21 @@ class TestFromExternalOID(unittest.TestCase):
         assert_that(oid, is_(b'\x00\x00\x00\x00\x00abc'))
         assert_that(db_name, is_(b''))
         assert_that(intid, is_(1))
+
+    def test_cached(self):
+        parsed = fromExternalOID(b'0x616263::y')
+        assert_that(fromExternalOID(b'0x616263::y'), is_(same_instance(parsed)))
+
+    def test_batch_by_database(self):
+        from ..oids import from_external_oids
+        result = from_external_oids([b'0x616263:6d61696e:y', '0x616264:6d61696e',
+                                     b'0x616263::y', b'0x616263:6d61696e:y'])
+        assert_that(result, is_({
+            b'main': {
+                b'0x616263:6d61696e:y': fromExternalOID(b'0x616263:6d61696e:y'),
+                '0x616264:6d61696e': fromExternalOID('0x616264:6d61696e'),
+            },
+            b'': {
+                b'0x616263::y': fromExternalOID(b'0x616263::y'),
+            },
+        }))
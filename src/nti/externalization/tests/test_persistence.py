@@ -23,13 +23,17 @@ from hamcrest import calling
 from hamcrest import has_length
 from hamcrest import is_
 from hamcrest import is_not
+from hamcrest import none
 from hamcrest import raises
+from hamcrest import same_instance
 
 from ..persistence import NoPickle
 from ..persistence import PersistentExternalizableDictionary
 from ..persistence import PersistentExternalizableList
 from ..persistence import PersistentExternalizableWeakList
 from ..persistence import getPersistentState
+from ..persistence import dereference_weak_refs
+from ..persistence import prefetch_ghosts
 from ..persistence import setPersistentStateChanged
 from . import ExternalizationLayerTest
 
@@ -114,6 +118,36 @@ class TestPersistentExternalizableWeakList(ExternalizationLayerTest):
         assert_that(obj, is_not([]))
         assert_that(obj, is_not([self]))
 
+    def test_live_items(self):
+        pers = Persistent()
+        pers2 = Persistent()
+        obj = PersistentExternalizableWeakList([pers, pers2])
+
+        live = obj._live_items()
+        assert_that(live, is_([pers, pers2]))
+        assert_that(obj._live_items(), is_(same_instance(live)))
+        assert_that(list(obj), is_([pers, pers2]))
+        assert_that(obj[1], is_(same_instance(pers2)))
+
+        for mutate, expected in (
+                (lambda: obj.append(pers), [pers, pers2, pers]),
+                (lambda: obj.__setitem__(0, pers2), [pers2, pers2, pers]),
+                (lambda: obj.__delitem__(0), [pers2, pers]),
+                (obj.reverse, [pers, pers2]),
+                (lambda: obj.insert(0, pers2), [pers2, pers, pers2]),
+                (obj.pop, [pers2, pers]),
+                (lambda: obj.remove(pers2), [pers]),
+                (lambda: obj.extend([pers2]), [pers, pers2]),
+                (lambda: obj.__iadd__([pers]), [pers, pers2, pers]),
+                (lambda: obj.sort(key=lambda ref: ref() is pers), [pers2, pers, pers]),
+                (lambda: obj.__imul__(2), [pers2, pers, pers] * 2),
+                (obj.clear, []),
+        ):
+            __traceback_info__ = mutate, expected
+            mutate()
+            assert_that(list(obj), is_(expected))
+            assert_that(obj.count(pers), is_(expected.count(pers)))
+
 class TestPersistentExternalizableDict(unittest.TestCase):
 
     def test_to_external_dict(self):
@@ -174,6 +208,115 @@ class TestGetPersistentState(unittest.TestCase):
         setPersistentStateChanged(proxy) # Does nothing
 
 
+
+class TestPrefetchGhosts(ExternalizationLayerTest):
+
+    def setUp(self):
+        super().setUp()
+        try:
+            from ZODB import DB
+            from ZODB.MappingStorage import MappingStorage
+        except ModuleNotFoundError:
+            self.skipTest('ZODB not installed')
+        import transaction
+        from persistent.list import PersistentList
+        from persistent.mapping import PersistentMapping
+
+        self.db = db = DB(MappingStorage())
+        conn = db.open()
+        conn.root.items = PersistentList([PersistentMapping(a=i) for i in range(3)])
+        conn.root.ext_list = PersistentExternalizableList(conn.root.items)
+        conn.root.mapping = PersistentMapping(enumerate(conn.root.items))
+        conn.root.weak = PersistentExternalizableWeakList(conn.root.items)
+        transaction.commit()
+        conn.close()
+
+        self.conn = conn = db.open()
+        conn.cacheMinimize()
+        self.prefetched = []
+        conn.prefetch = self.prefetched.append
+
+    def tearDown(self):
+        self.conn.close()
+        self.db.close()
+        super().tearDown()
+
+    def test_prefetch_ghosts(self):
+        items = list(self.conn.root.items)
+        assert_that(items[0]._p_changed, is_(none()))
+
+        prefetch_ghosts(items + [1, object(), None])
+        assert_that(self.prefetched, is_([[x._p_oid for x in items]]))
+        # Still ghosts
+        assert_that(items[0]._p_changed, is_(none()))
+
+        # Once they're not ghosts, there's nothing to do.
+        del self.prefetched[:]
+        items[0]._p_activate()
+        items[1]._p_activate()
+        prefetch_ghosts(items)
+        assert_that(self.prefetched, is_([]))
+
+    def test_storage_without_prefetch(self):
+        del self.conn.prefetch
+        items = list(self.conn.root.items)
+        prefetch_ghosts(items)
+        assert_that(items[0]._p_changed, is_(none()))
+
+    def test_dereference_weak_refs(self):
+        weak = self.conn.root.weak
+        refs = list(weak.data)
+        items = dereference_weak_refs(refs)
+        assert_that(self.prefetched, is_([[x._p_oid for x in items]]))
+        assert_that(items, is_(list(self.conn.root.items)))
+
+        # Once resolved, there's nothing to prefetch.
+        assert_that(dereference_weak_refs(refs), is_(items))
+        assert_that(self.prefetched, has_length(1))
+
+    def test_weak_list_iteration(self):
+        weak = self.conn.root.weak
+        assert_that([x['a'] for x in weak], is_([0, 1, 2]))
+        assert_that(self.prefetched, has_length(1))
+        assert_that(weak.index(self.conn.root.items[2]), is_(2))
+        assert_that(weak.toExternalList(), has_length(3))
+        assert_that(self.prefetched, has_length(1))
+
+        # Deactivating discards the resolved items.
+        self.conn.cacheMinimize()
+        assert_that(list(weak), has_length(3))
+        assert_that(self.prefetched, has_length(2))
+
+    def test_hook(self):
+        from ..extension_points import prefetch_external_objects
+        from ..externalization import to_external_object
+
+        items = self.conn.root.items
+        to_external_object(items)
+        assert_that(self.prefetched, is_([]))
+
+        self.conn.cacheMinimize()
+        prefetch_external_objects.sethook(prefetch_ghosts)
+        try:
+            ext = to_external_object(items)
+            assert_that(self.prefetched, has_length(1))
+            assert_that(self.prefetched[0], has_length(3))
+            assert_that([x['a'] for x in ext], is_([0, 1, 2]))
+
+            self.conn.cacheMinimize()
+            del self.prefetched[:]
+            assert_that(self.conn.root.ext_list.toExternalList(), has_length(3))
+            assert_that(self.prefetched, has_length(1))
+
+            self.conn.cacheMinimize()
+            del self.prefetched[:]
+            ext = to_external_object(self.conn.root.mapping)
+            assert_that([ext[i]['a'] for i in range(3)], is_([0, 1, 2]))
+            assert_that(self.prefetched, has_length(1))
+        finally:
+            prefetch_external_objects.reset()
+
+
 class TestWeakRef(unittest.TestCase):
 
     def test_to_externalObject(self):
@@ -5,6 +5,7 @@ Tests for representation.py
 """
 
 # stdlib imports
+import json
 import re
 import unittest
 
@@ -19,7 +20,10 @@ from .. import representation
 
 from hamcrest import assert_that
 from hamcrest import contains_string
+from hamcrest import has_entry
+from hamcrest import has_length
 from hamcrest import is_
+from hamcrest import same_instance
 
 # disable: accessing protected members, too many methods
 # pylint: disable=W0212,R0904
@@ -277,6 +281,42 @@ class TestYaml(AbstractRepresenterTestMixin,
     def _simpleNumRepr(self, i):
         return str(i) + '\n...\n'
 
+    def test_libyaml_identical(self):
+        import decimal
+        import yaml
+        if not representation._HAS_LIBYAML: # pragma: no cover
+            self.skipTest("libyaml not available")
+        from nti.externalization.interfaces import LocatedExternalDict
+
+        class Unknown(object):
+            def toExternalObject(self, **_kwargs):
+                return {'unknown': [1]}
+
+        data = LocatedExternalDict({
+            'int': 1, 'float': 2.5, 'none': None, 'bool': True,
+            'text': u'ascii', 'subclass': type('SubStr', (str,), {})('sub'), 'multi': 'line\none', 'empty': '',
+            'looks_like': ['yes', '123', '  lead', '\x07bell'],
+            'long': ' '.join(['word'] * 100),
+            'decimals': [decimal.Decimal('1.5'), decimal.Decimal('NaN'),
+                         decimal.Decimal('-Infinity'), decimal.Decimal(3)],
+            'nested': [[{'a': {}}], []],
+            'unknown': Unknown(),
+        })
+        for obj in data, [data, data]:
+            pure = yaml.dump(obj, Dumper=representation._ExtDumper, default_flow_style=True)
+            fast = yaml.dump(obj, Dumper=representation._CExtDumper, default_flow_style=True)
+            assert_that(fast, is_(pure))
+            assert_that(yaml.load(pure, Loader=representation._CUnicodeLoader),
+                        is_(yaml.load(pure, Loader=representation._UnicodeLoader)))
+
+        # Folding escaped strings differs, but they load the same.
+        data['text'] = u'é unicode ☃ 😀'
+        pure = yaml.dump(data, Dumper=representation._ExtDumper, default_flow_style=True)
+        fast = self._makeOne().dump(data, use_libyaml=True)
+        assert_that(yaml.load(fast, Loader=representation._UnicodeLoader),
+                    is_(yaml.load(pure, Loader=representation._CUnicodeLoader)))
+        assert_that(self._makeOne().dump(1, use_libyaml=True), is_('1\n...\n'))
+
 
 class TestJson(AbstractRepresenterTestMixin,
                ExternalizationLayerTest):
@@ -319,11 +359,71 @@ class TestJson(AbstractRepresenterTestMixin,
         result = json.load(b'"hi"')
         assert_that(result, is_("hi"))
 
+    def test_load_buffers(self):
+        import mmap
+        data = b'{"a": [1, "\xc3\xa9"]}'
+        mapped = mmap.mmap(-1, len(data))
+        mapped.write(data)
+        self.addCleanup(mapped.close)
+        for kind in representation.StdJsonRepresenter, self._getTargetClass():
+            json = kind()
+            for buf in bytearray(data), memoryview(data), mapped:
+                __traceback_info__ = kind, buf
+                assert_that(json.load(buf), is_({'a': [1, '\xe9']}))
+
     def test_print_to_bytes(self):
         json = self._makeOne()
         result = json.dump(1, as_str=False)
         assert_that(result, is_(bytes))
 
+    def test_dump_without_second_pass(self):
+        import decimal
+        for kind in representation.StdJsonRepresenter, self._getTargetClass():
+            json = kind()
+            __traceback_info__ = kind
+            result = json.dump({'a': [1]}, second_pass=False)
+            assert_that(json.load(result), is_({'a': [1]}))
+            for bad in self, decimal.Decimal(1):
+                with self.assertRaises(TypeError) as exc:
+                    json.dump(bad, second_pass=False)
+                # The encoder's own error, not one from calling a default.
+                self.assertIsNone(exc.exception.__context__)
+
+    def test_to_json_representation_fast_fp(self):
+        import io
+        bio = io.BytesIO()
+        representation.to_json_representation_fast({'a': 'b'}, bio)
+        assert_that(bio.getvalue(), is_(representation.to_json_representation_fast({'a': 'b'})))
+        assert_that(bio.getvalue(), is_(bytes))
+
+        # Fully externalized objects don't need the second pass.
+        result = representation.to_json_representation_fast(self, second_pass=False)
+        self.assertIn(b'NonExternalizableObject', result)
+
+        # Decimals are converted while externalizing.
+        import decimal
+        result = representation.to_json_representation_fast(
+            {'a': decimal.Decimal('1.5'), 'b': [decimal.Decimal(2)]},
+            second_pass=False)
+        assert_that(result, is_(b'{"a":1.5,"b":[2]}'))
+
+    def test_decimal_converting_policies_are_weak(self):
+        import decimal
+        import gc
+        from .._base_interfaces import ExternalizationPolicy
+        policy = ExternalizationPolicy()
+        derived = representation._decimal_converting_policy(policy)
+        assert_that(derived.leaf_converters, has_entry(decimal.Decimal,
+                                                       representation._decimal_to_number))
+        assert_that(representation._decimal_converting_policy(policy),
+                    is_(same_instance(derived)))
+        assert_that(representation._decimal_converting_policy(derived),
+                    is_(same_instance(derived)))
+        count = len(representation._decimal_converting_policies)
+        del policy
+        gc.collect()
+        assert_that(representation._decimal_converting_policies, has_length(count - 1))
+
     def test_to_json_representation(self):
         result = representation.to_json_representation({})
         assert_that(result, is_('{}'))
@@ -360,3 +460,525 @@ class TestJson(AbstractRepresenterTestMixin,
                 provided=IExternalObject,
                 name="second-pass"
             )
+
+
+class TestExternalStream(ExternalizationLayerTest):
+
+    DATA = [{'a': 1}, [1, 2], "str", 12345, 1.5, None, True, {'b': {'c': [3]}},
+            False, -2, '\xe9\U0001f600']
+
+    def _iter(self, stream, **kwargs):
+        return list(representation.iter_external_stream(stream, **kwargs))
+
+    def test_json_array_chunk_sizes(self):
+        import io
+        data = json.dumps(self.DATA, indent=2).encode('utf-8')
+        for chunk_size in 1, 2, 3, 7, 64, 65536:
+            __traceback_info__ = chunk_size
+            result = self._iter(io.BytesIO(data), chunk_size=chunk_size)
+            assert_that(result, is_(self.DATA))
+
+    def test_json_array_multibyte_split(self):
+        import io
+        data = '["é中", 1]'.encode('utf-8')
+        result = self._iter(io.BytesIO(data), chunk_size=1)
+        assert_that(result, is_(['é中', 1]))
+
+    def test_json_array_iterable_of_text(self):
+        result = self._iter(['[1', '2, ', '34', ']  '])
+        assert_that(result, is_([12, 34]))
+
+    def test_json_empty_array(self):
+        assert_that(self._iter([b' [ ] ']), is_([]))
+
+    def test_json_bad_data(self):
+        for data in b'', b'{}', b'[1 2]', b'[1,', b'[1] 2', b'[{"a": ]':
+            __traceback_info__ = data
+            with self.assertRaises(ValueError):
+                self._iter([data])
+
+    def test_json_bad_data_fails_early(self):
+        read = []
+        def chunks():
+            yield b'[1, {"a": x'
+            for i in range(1000):
+                read.append(i)
+                yield b' ' * 100
+
+        with self.assertRaises(ValueError):
+            self._iter(chunks())
+        # The error was found without reading the rest of the stream.
+        assert_that(read, is_([]))
+
+    def test_load_from_external_stream_batch_size(self):
+        with self.assertRaises(ValueError):
+            representation.load_from_external_stream([b'[1]'], list, batch_size=0)
+
+    def test_ndjson(self):
+        import io
+        data = '\n'.join(json.dumps(x) for x in self.DATA) + '\n\n'
+        for chunk_size in 1, 5, 65536:
+            result = self._iter(io.BytesIO(data.encode('utf-8')),
+                                ndjson=True, chunk_size=chunk_size)
+            assert_that(result, is_(self.DATA))
+
+        # No trailing newline
+        assert_that(self._iter(['1\n', '2'], ndjson=True), is_([1, 2]))
+
+    def test_load_from_external_stream(self):
+        from zope import component
+        from ..interfaces import IMimeObjectFactory
+
+        class Thing(object):
+            def updateFromExternalObject(self, ext):
+                self.value = ext['value']
+
+        factory = lambda *args: Thing()
+        component.provideUtility(factory, IMimeObjectFactory, 'application/thing')
+        self.addCleanup(component.getGlobalSiteManager().unregisterUtility,
+                        factory, IMimeObjectFactory, 'application/thing')
+
+        data = b'[' + b','.join(
+            b'{"MimeType": "application/thing", "value": %d}' % i
+            for i in range(5)
+        ) + b', 42]'
+
+        batches = []
+        count = representation.load_from_external_stream(
+            [data], batches.append, batch_size=2)
+        assert_that(count, is_(6))
+        assert_that([len(b) for b in batches], is_([2, 2, 2]))
+        objects = [o for b in batches for o in b]
+        assert_that([o.value for o in objects[:5]], is_(list(range(5))))
+        assert_that(objects[-1], is_(42))
+
+
+class TestSharedReferences(ExternalizationLayerTest):
+
+    class Profile(object):
+        def __init__(self, oid):
+            self.oid = oid
+
+        def toExternalObject(self, **_kwargs):
+            return {'OID': self.oid, 'Username': 'user' + self.oid}
+
+    def test_round_trip(self):
+        from ..internalization import resolve_shared_references
+
+        alice = self.Profile('1')
+        bob = self.Profile('2')
+        stream = [{'Creator': alice}, {'Creator': bob}, {'Creator': alice},
+                  {'Creator': alice, 'Mentions': [bob]}]
+        data = representation.to_json_representation_fast(stream, shared_references=True)
+        external = json.loads(data)
+        assert_that(external, is_([
+            {'Creator': {'OID': '1', 'Username': 'user1'}},
+            {'Creator': {'OID': '2', 'Username': 'user2'}},
+            {'Creator': {'$ref': '1'}},
+            {'Creator': {'$ref': '1'}, 'Mentions': [{'$ref': '2'}]},
+        ]))
+
+        resolved = resolve_shared_references(external)
+        assert_that(resolved, is_(json.loads(
+            representation.to_json_representation_fast(stream))))
+        assert_that(resolved[2]['Creator'], is_(same_instance(resolved[0]['Creator'])))
+        assert_that(resolved[3]['Mentions'][0], is_(same_instance(resolved[1]['Creator'])))
+
+    def test_resolve_any_order(self):
+        from ..internalization import resolve_shared_references
+
+        external = {'a': {'$ref': 'x'}, 'b': [{'OID': 'x', 'v': 1}], 'c': {'$ref': 'y'}}
+        resolve_shared_references(external)
+        assert_that(external['a'], is_(same_instance(external['b'][0])))
+        # Unknown references are left alone
+        assert_that(external['c'], is_({'$ref': 'y'}))
+        assert_that(resolve_shared_references('abc'), is_('abc'))
+
+    def test_without_oid_unchanged(self):
+        from ..externalization import collapse_shared_references
+
+        shared = {'a': 1}
+        external = [shared, shared]
+        assert_that(collapse_shared_references(external), is_([{'a': 1}, {'a': 1}]))
+        assert_that(collapse_shared_references(1), is_(1))
+
+
+class TestMsgPack(ExternalizationLayerTest):
+
+    def setUp(self):
+        super().setUp()
+        try:
+            __import__('msgpack')
+        except ModuleNotFoundError:
+            self.skipTest('Requires msgpack')
+
+    def _makeOne(self):
+        return representation.MsgPackRepresenter()
+
+    def test_registered(self):
+        from zope import component
+        from ..interfaces import EXT_REPR_MSGPACK
+        from ..interfaces import IExternalObjectIO
+        assert_that(component.getUtility(IExternalObjectIO, EXT_REPR_MSGPACK),
+                    is_(representation.MsgPackRepresenter))
+
+    def test_round_trip(self):
+        import decimal
+        import fractions
+        rep = self._makeOne()
+        value = {
+            'str': 'é',
+            'list': [1, 2.5, None, True],
+            'decimal_int': decimal.Decimal(1),
+            'decimal_float': decimal.Decimal('1.5'),
+            'fraction': fractions.Fraction('1/3'),
+        }
+        result = rep.load(rep.dump(value))
+        assert_that(result, is_({
+            'str': 'é',
+            'list': [1, 2.5, None, True],
+            'decimal_int': 1,
+            'decimal_float': 1.5,
+            'fraction': '1/3',
+        }))
+
+    def test_to_external_representation(self):
+        from ..interfaces import EXT_REPR_MSGPACK
+        rep = self._makeOne()
+        result = representation.to_external_representation({'a': (1, 2)}, EXT_REPR_MSGPACK)
+        assert_that(result, is_(bytes))
+        assert_that(rep.load(memoryview(result)), is_({'a': [1, 2]}))
+
+    def test_dump_to_stream(self):
+        import io
+        rep = self._makeOne()
+        for value in [1, 'two', {'three': 3}], {'a': [1], 'b': None}, 'str':
+            __traceback_info__ = value
+            bio = io.BytesIO()
+            written = rep.dump(value, bio)
+            assert_that(written, is_(len(bio.getvalue())))
+            assert_that(bio.getvalue(), is_(rep.dump(value)))
+            bio.seek(0)
+            assert_that(rep.load(bio), is_(value))
+
+    def test_second_pass(self):
+        rep = self._makeOne()
+        result = rep.load(rep.dump(self))
+        assert_that(result, has_entry('Class', 'NonExternalizableObject'))
+
+
+class TestJsonSequence(ExternalizationLayerTest):
+
+    def _items(self):
+        import datetime
+        return [{'a': 1}, datetime.date(2020, 1, 2), 'str', [1, 2]]
+
+    def test_array(self):
+        for chunk_size in 0, 5, 65536:
+            chunks = list(representation.iter_json_sequence(iter(self._items()),
+                                                            chunk_size=chunk_size))
+            if chunk_size == 0:
+                assert_that(chunks, has_length(5))
+            assert_that(json.loads(b''.join(chunks)),
+                        is_([{'a': 1}, '2020-01-02', 'str', [1, 2]]))
+
+    def test_empty(self):
+        assert_that(b''.join(representation.iter_json_sequence(())), is_(b'[]'))
+        assert_that(b''.join(representation.iter_json_sequence((), ndjson=True)), is_(b''))
+
+    def test_ndjson(self):
+        import io
+        bio = io.BytesIO()
+        written = representation.write_json_sequence(self._items(), bio, ndjson=True)
+        assert_that(written, is_(len(bio.getvalue())))
+        bio.seek(0)
+        assert_that(list(representation.iter_external_stream(bio, ndjson=True)),
+                    is_([{'a': 1}, '2020-01-02', 'str', [1, 2]]))
+
+    def test_aiter_json_sequence(self):
+        import asyncio
+
+        async def agen():
+            for item in self._items():
+                yield item
+
+        async def collect(iterable, **kwargs):
+            return [chunk async for chunk in
+                    representation.aiter_json_sequence(iterable, **kwargs)]
+
+        for iterable in self._items(), agen():
+            chunks = asyncio.run(collect(iterable, chunk_size=0))
+            assert_that(chunks, has_length(5))
+            assert_that(json.loads(b''.join(chunks)),
+                        is_([{'a': 1}, '2020-01-02', 'str', [1, 2]]))
+
+        assert_that(asyncio.run(collect((), ndjson=True)), is_([]))
+
+    def test_aiter_external_representation(self):
+        import asyncio
+
+        async def collect(obj, **kwargs):
+            return [chunk async for chunk in
+                    representation.aiter_external_representation(obj, **kwargs)]
+
+        value = {'key': 'x' * 100}
+        expected = representation.to_json_representation(value).encode('utf-8')
+        chunks = asyncio.run(collect(value, chunk_size=30))
+        self.assertTrue(all(len(c) <= 30 for c in chunks))
+        assert_that(chunks, has_length(5))
+        assert_that(b''.join(chunks), is_(expected))
+
+        chunks = asyncio.run(collect(value, chunk_size=30, as_str=False))
+        assert_that(b''.join(chunks), is_(expected))
+
+        with self.assertRaises(ValueError):
+            asyncio.run(collect(value, chunk_size=0))
+
+    def test_aiter_external_representation_streams_lists(self):
+        import asyncio
+
+        externalized = []
+
+        class Item(object):
+            def __init__(self, i):
+                self.i = i
+
+            def toExternalObject(self, **_kwargs):
+                externalized.append(self.i)
+                return {'i': self.i}
+
+        async def first_chunk(obj):
+            async for chunk in representation.aiter_external_representation(
+                    obj, chunk_size=10):
+                return chunk
+
+        items = [Item(i) for i in range(100)]
+        chunk = asyncio.run(first_chunk(items))
+        # Only enough items to fill the first chunk were externalized.
+        assert_that(externalized, is_([0, 1]))
+        assert_that(chunk, has_length(10))
+
+        async def collect(obj):
+            return [chunk async for chunk in
+                    representation.aiter_external_representation(obj, chunk_size=10)]
+
+        chunks = asyncio.run(collect(items))
+        self.assertTrue(all(len(c) <= 10 for c in chunks))
+        assert_that(json.loads(b''.join(chunks)), is_([{'i': i} for i in range(100)]))
+
+        # Dictionaries stream too.
+        del externalized[:]
+        mapping = {str(i): Item(i) for i in range(100)}
+        chunk = asyncio.run(first_chunk(mapping))
+        assert_that(externalized, is_([0]))
+        assert_that(chunk, has_length(10))
+        chunks = asyncio.run(collect(mapping))
+        self.assertTrue(all(len(c) <= 10 for c in chunks))
+        assert_that(json.loads(b''.join(chunks)),
+                    is_(json.loads(representation.to_json_representation(mapping))))
+        assert_that(asyncio.run(collect({})), is_([b'{}']))
+
+
+if Persistent is not None:
+    class FragmentChild(Persistent):
+        calls = 0
+        value = 1
+        def toExternalObject(self, **_kwargs):
+            type(self).calls += 1
+            return {'value': self.value}
+
+    class FragmentParent(Persistent):
+        child = None
+        def toExternalObject(self, **_kwargs):
+            from nti.externalization import to_external_object
+            return {'child': to_external_object(self.child)}
+
+
+    class TimedChild(Persistent):
+        lastModified = 30
+        def toExternalObject(self, **_kwargs):
+            return {'Last Modified': self.lastModified}
+
+    class TimedParent(Persistent):
+        lastModified = 10
+        child = None
+        def toExternalObject(self, **_kwargs):
+            from nti.externalization import to_external_object
+            return {'Last Modified': self.lastModified,
+                    'child': to_external_object(self.child)}
+
+
+class TestJsonFragmentCache(ExternalizationLayerTest):
+
+    def setUp(self):
+        super().setUp()
+        if Persistent is None or not representation._HAS_ORJSON:
+            self.skipTest("Requires persistent and orjson")
+        FragmentChild.calls = 0
+
+    def _open(self):
+        import transaction
+        from ZODB import DB
+        from ZODB.MappingStorage import MappingStorage
+
+        Child = FragmentChild
+        db = DB(MappingStorage())
+        self.addCleanup(db.close)
+        conn = db.open()
+        self.addCleanup(transaction.abort)
+        conn.root()['child'] = Child()
+        transaction.commit()
+        return conn, Child
+
+    def test_cached_fragment_is_spliced(self):
+        import transaction
+        conn, Child = self._open()
+        cache = representation.JsonFragmentCache()
+        child = conn.root()['child']
+
+        for _ in range(2):
+            result = representation.to_json_representation_fast([child, {'a': child}],
+                                                                 fragment_cache=cache)
+            assert_that(json.loads(result),
+                        is_([{'value': 1}, {'a': {'value': 1}}]))
+        assert_that(Child.calls, is_(1))
+        assert_that(cache, has_length(1))
+
+        # A different audience is a different entry.
+        representation.to_json_representation_fast(child,
+                                                   fragment_cache=cache.for_audience('u'))
+        assert_that(Child.calls, is_(2))
+        assert_that(cache, has_length(2))
+
+        # Modified objects are not cached; committing changes the serial.
+        child.value = 2
+        assert_that(json.loads(representation.to_json_representation_fast(
+            child, fragment_cache=cache)), is_({'value': 2}))
+        assert_that(Child.calls, is_(3))
+        transaction.commit()
+        assert_that(json.loads(representation.to_json_representation_fast(
+            child, fragment_cache=cache)), is_({'value': 2}))
+        assert_that(Child.calls, is_(4))
+        assert_that(cache, has_length(2))
+
+        # Without a cache, nothing changes.
+        representation.to_json_representation_fast(child)
+        assert_that(Child.calls, is_(5))
+
+    def test_nested_persistent_objects(self):
+        import transaction
+        conn, Child = self._open()
+        root = conn.root()
+        root['parent'] = parent = FragmentParent()
+        parent.child = root['child']
+        cache = representation.JsonFragmentCache()
+        # Nothing is cached while the parent has uncommitted changes...
+        representation.to_json_representation_fast(parent, fragment_cache=cache)
+        assert_that(cache, has_length(1))
+        transaction.commit()
+        # ...but then both are.
+        representation.to_json_representation_fast(parent, fragment_cache=cache)
+        assert_that(cache, has_length(2))
+        assert_that(Child.calls, is_(1))
+
+        # Changing only the child still invalidates the parent.
+        parent.child.value = 3
+        assert_that(json.loads(representation.to_json_representation_fast(
+            parent, fragment_cache=cache)), is_({'child': {'value': 3}}))
+        transaction.commit()
+        assert_that(json.loads(representation.to_json_representation_fast(
+            parent, fragment_cache=cache)), is_({'child': {'value': 3}}))
+        calls = Child.calls
+        assert_that(json.loads(representation.to_json_representation_fast(
+            [parent, parent.child], fragment_cache=cache)),
+                    is_([{'child': {'value': 3}}, {'value': 3}]))
+        assert_that(Child.calls, is_(calls))
+
+    def test_last_modified(self):
+        import transaction
+        from nti.externalization import to_external_object
+        from nti.externalization.externalization import LastModifiedCollector
+        conn, _ = self._open()
+        root = conn.root()
+        root['parent'] = parent = TimedParent()
+        parent.child = TimedChild()
+        transaction.commit()
+
+        def collect(obj, cache):
+            collector = LastModifiedCollector()
+            to_external_object(obj, fragment_cache=cache, last_modified_collector=collector)
+            return collector.last_modified
+
+        # Cached without collecting, then used when collecting.
+        cache = representation.JsonFragmentCache()
+        representation.to_json_representation_fast(parent, fragment_cache=cache)
+        for _ in range(2):
+            assert_that(collect(parent, cache), is_(30))
+
+        # The child is included in the parent from the memo.
+        cache = representation.JsonFragmentCache()
+        assert_that(collect([parent.child, parent], cache), is_(30))
+        assert_that(collect(parent, cache), is_(30))
+
+    def test_etag_for(self):
+        conn, Child = self._open()
+        child = conn.root()['child']
+        cache = representation.JsonFragmentCache()
+        assert_that(cache.etag_for(child), is_(None))
+        data, etag = representation.to_json_representation_with_etag(child,
+                                                                     fragment_cache=cache)
+        assert_that(etag, is_(representation.compute_etag(data)))
+        assert_that(cache.etag_for(child), is_(etag))
+        assert_that(cache.etag_for(child, name='other'), is_(None))
+        assert_that(cache.for_audience(1).etag_for(child), is_(None))
+        assert_that(Child.calls, is_(1))
+
+        child.value = 42
+        assert_that(cache.etag_for(child), is_(None))
+
+    def test_size_bound(self):
+        conn, _ = self._open()
+        child = conn.root()['child']
+        cache = representation.JsonFragmentCache(max_bytes=15)
+        representation.to_json_representation_fast(child, fragment_cache=cache)
+        assert_that(cache.size_bytes, is_(len(b'{"value":1}')))
+        representation.to_json_representation_fast(child,
+                                                   fragment_cache=cache.for_audience(1))
+        assert_that(cache, has_length(1))
+        assert_that(cache.size_bytes, is_(len(b'{"value":1}')))
+        cache.clear()
+        assert_that(cache, has_length(0))
+        assert_that(cache.size_bytes, is_(0))
+
+        # Non-persistent objects are never cached.
+        assert_that(cache.key_for({}, '', None, True), is_(None))
+
+
+class TestETags(ExternalizationLayerTest):
+
+    def test_hashing_writer(self):
+        import io
+        out = io.BytesIO()
+        writer = representation.HashingWriter(out)
+        writer.write(b'[1,')
+        writer.write('2]')
+        assert_that(out.getvalue(), is_(b'[1,2]'))
+        assert_that(writer.bytes_written, is_(5))
+        assert_that(writer.etag, is_(representation.compute_etag(b'[1,2]')))
+        assert_that(writer.etag, has_length(34))
+
+        writer = representation.HashingWriter()
+        assert_that(representation.write_json_sequence([1, 2], writer), is_(5))
+        assert_that(writer.etag, is_(representation.compute_etag(b'[1,2]')))
+
+    def test_to_json_representation_with_etag(self):
+        import io
+        value = {'a': [1, 2]}
+        data, etag = representation.to_json_representation_with_etag(value)
+        assert_that(data, is_(representation.to_json_representation_fast(value)))
+        assert_that(etag, is_(representation.compute_etag(data)))
+
+        out = io.BytesIO()
+        _, etag2 = representation.to_json_representation_with_etag(value, fp=out)
+        assert_that(out.getvalue(), is_(data))
+        assert_that(etag2, is_(etag))
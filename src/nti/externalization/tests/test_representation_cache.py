@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for representation_cache.py
+"""
+import os
+import shutil
+import tempfile
+
+try:
+    from persistent import Persistent
+except ModuleNotFoundError: # pragma: no cover
+    Persistent = None
+
+from hamcrest import assert_that
+from hamcrest import is_
+from hamcrest import none
+
+from . import ExternalizationLayerTest
+from .. import representation_cache
+from ..representation_cache import MappedRepresentationCache
+from ..representation_cache import to_external_representation_cached
+
+
+if Persistent is not None:
+    class CachedThing(Persistent):
+        calls = 0
+        value = 1
+        def toExternalObject(self, **_kwargs):
+            type(self).calls += 1
+            return {'value': self.value}
+
+    class CachedParent(Persistent):
+        calls = 0
+        def __init__(self, child):
+            self.child = child
+        def toExternalObject(self, **_kwargs):
+            from ..externalization import to_external_object
+            type(self).calls += 1
+            return {'child': to_external_object(self.child)}
+
+
+class TestMappedRepresentationCache(ExternalizationLayerTest):
+
+    def setUp(self):
+        super().setUp()
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.path = os.path.join(tmpdir, 'cache')
+
+    def _makeOne(self, **kwargs):
+        cache = MappedRepresentationCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_get_set(self):
+        cache = self._makeOne(max_bytes=1024, slots=8)
+        assert_that(cache.get(b'k' * 16), is_(none()))
+        cache.set(b'k' * 16, 'text')
+        cache.set(b'b' * 16, b'bytes')
+        assert_that(cache.get(b'k' * 16), is_('text'))
+        assert_that(cache.get(b'b' * 16), is_(b'bytes'))
+
+        # Reopening, even asking for a different geometry, sees the same data.
+        other = self._makeOne(max_bytes=2048)
+        assert_that(other.max_bytes, is_(1024))
+        assert_that(other.get(b'k' * 16), is_('text'))
+
+        other.clear()
+        assert_that(cache.get(b'k' * 16), is_(none()))
+
+        # Large values aren't stored.
+        cache.set(b'k' * 16, b'x' * 1024)
+        assert_that(cache.get(b'k' * 16), is_(none()))
+
+    def test_file_permissions(self):
+        self._makeOne(max_bytes=1024, slots=8)
+        assert_that(os.stat(self.path).st_mode & 0o777, is_(0o600))
+
+    def test_refuses_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'precious data')
+        with self.assertRaises(ValueError):
+            self._makeOne(max_bytes=1024, slots=8)
+        with open(self.path, 'rb') as f:
+            assert_that(f.read(), is_(b'precious data'))
+
+    def test_replaces_older_format(self):
+        import mmap
+        with open(self.path, 'wb') as f:
+            f.write(b'NTIXRC01' + b'\0' * 65536)
+        # Another process still has the old cache mapped. Shrinking the
+        # file it maps would crash it when it next touched the end.
+        with open(self.path, 'r+b') as f:
+            old = mmap.mmap(f.fileno(), 0)
+        self.addCleanup(old.close)
+        old_stat = os.stat(self.path)
+
+        cache = self._makeOne(max_bytes=1024, slots=8)
+        assert_that(cache.max_bytes, is_(1024))
+        assert_that(os.path.samestat(old_stat, os.stat(self.path)), is_(False))
+        assert_that(os.stat(self.path).st_mode & 0o777, is_(0o600))
+        assert_that(old[-1], is_(0))
+        assert_that(old[:8], is_(b'NTIXRC01'))
+        assert_that(sorted(os.listdir(os.path.dirname(self.path))), is_(['cache']))
+
+        cache.set(b'k' * 16, b'v')
+        assert_that(self._makeOne().get(b'k' * 16), is_(b'v'))
+
+    def test_dependencies_need_jar(self):
+        cache = self._makeOne(max_bytes=1024, slots=8)
+        cache.set(b'k' * 16, b'v', [(b'\0' * 8, '', b'\1' * 8)])
+        assert_that(cache.get(b'k' * 16), is_(none()))
+
+    def test_ring_overwrites_oldest(self):
+        cache = self._makeOne(max_bytes=400, slots=64)
+        keys = [bytes([i]) * 16 for i in range(1, 11)]
+        for key in keys:
+            cache.set(key, b'x' * 60)
+        # Each record is 81 bytes, so four fit in each pass. The third
+        # pass overwrote the first two records of the second.
+        assert_that([cache.get(key) is not None for key in keys],
+                    is_([False] * 6 + [True] * 4))
+
+    def test_reopens_after_fork(self):
+        cache = self._makeOne()
+        cache.set(b'k' * 16, b'v')
+        cache._pid = -1
+        assert_that(cache.get(b'k' * 16), is_(b'v'))
+        assert_that(cache._pid, is_(os.getpid()))
+
+    def test_to_external_representation_cached(self):
+        if Persistent is None: # pragma: no cover
+            self.skipTest("Requires persistent")
+        import transaction
+        from ZODB import DB
+        from ZODB.MappingStorage import MappingStorage
+
+        CachedThing.calls = 0
+        db = DB(MappingStorage())
+        self.addCleanup(db.close)
+        conn = db.open()
+        self.addCleanup(transaction.abort)
+        conn.root()['thing'] = thing = CachedThing()
+        # Uncommitted objects aren't cached.
+        assert_that(representation_cache.MappedRepresentationCache.key_for(thing),
+                    is_(none()))
+        transaction.commit()
+
+        cache = self._makeOne()
+        for _ in range(2):
+            assert_that(to_external_representation_cached(thing, cache),
+                        is_('{"value":1}'))
+        assert_that(CachedThing.calls, is_(1))
+
+        # A "restarted" process reads it from the file.
+        cache = self._makeOne()
+        assert_that(to_external_representation_cached(thing, cache),
+                    is_('{"value":1}'))
+        assert_that(CachedThing.calls, is_(1))
+
+        # Other arguments are distinct entries.
+        to_external_representation_cached(thing, cache, as_str=False)
+        to_external_representation_cached(thing, cache, audience='u')
+        assert_that(CachedThing.calls, is_(3))
+
+        thing.value = 2
+        transaction.commit()
+        assert_that(to_external_representation_cached(thing, cache),
+                    is_('{"value":2}'))
+        assert_that(CachedThing.calls, is_(4))
+
+    def test_key_includes_policy_and_site(self):
+        if Persistent is None: # pragma: no cover
+            self.skipTest("Requires persistent")
+        import transaction
+        from unittest.mock import patch as Patch
+        from ZODB import DB
+        from ZODB.MappingStorage import MappingStorage
+        from zope import component
+        from zope.interface.registry import Components
+        from .._base_interfaces import ExternalizationPolicy
+
+        CachedThing.calls = 0
+        db = DB(MappingStorage())
+        self.addCleanup(db.close)
+        conn = db.open()
+        self.addCleanup(transaction.abort)
+        conn.root()['thing'] = thing = CachedThing()
+        transaction.commit()
+
+        cache = self._makeOne()
+        to_external_representation_cached(thing, cache)
+        assert_that(CachedThing.calls, is_(1))
+
+        # The policy that's active when none is named.
+        policy = ExternalizationPolicy(use_iso8601_for_unix_timestamp=True)
+        with Patch.object(representation_cache, '_current_policy', return_value=policy):
+            to_external_representation_cached(thing, cache)
+            to_external_representation_cached(thing, cache)
+        assert_that(CachedThing.calls, is_(2))
+
+        # A different site.
+        site = Components('site', bases=(component.getGlobalSiteManager(),))
+        component.getSiteManager.sethook(lambda context=None: site)
+        try:
+            to_external_representation_cached(thing, cache)
+            to_external_representation_cached(thing, cache)
+        finally:
+            component.getSiteManager.reset()
+        assert_that(CachedThing.calls, is_(3))
+
+        to_external_representation_cached(thing, cache)
+        assert_that(CachedThing.calls, is_(3))
+
+    def test_nested_persistent_objects(self):
+        if Persistent is None: # pragma: no cover
+            self.skipTest("Requires persistent")
+        import transaction
+        from ZODB import DB
+        from ZODB.MappingStorage import MappingStorage
+
+        CachedParent.calls = 0
+        db = DB(MappingStorage())
+        self.addCleanup(db.close)
+        conn = db.open()
+        self.addCleanup(transaction.abort)
+        conn.root()['parent'] = parent = CachedParent(CachedThing())
+        transaction.commit()
+
+        cache = self._makeOne()
+        for _ in range(2):
+            assert_that(to_external_representation_cached(parent, cache),
+                        is_('{"child":{"value":1}}'))
+        assert_that(CachedParent.calls, is_(1))
+
+        parent.child.value = 2
+        # Uncommitted changes aren't cached.
+        for _ in range(2):
+            assert_that(to_external_representation_cached(parent, cache),
+                        is_('{"child":{"value":2}}'))
+        assert_that(CachedParent.calls, is_(3))
+
+        transaction.commit()
+        for _ in range(2):
+            assert_that(to_external_representation_cached(parent, cache),
+                        is_('{"child":{"value":2}}'))
+        assert_that(CachedParent.calls, is_(4))
@@ -148,6 +148,137 @@ class TestRegisterMimeFactoriesZCML(PlacelessSetup,
         gsm = component.getGlobalSiteManager()
         assert_that(list(gsm.registeredUtilities()), is_empty())
 
+
+class TestRegisterLazyMimeFactoriesZCML(PlacelessSetup,
+                                        RegistrationMixin,
+                                        unittest.TestCase):
+
+    LAZY_TMPL = """
+        <configure xmlns:ext="http://nextthought.com/ntp/ext">
+           <include package="nti.externalization" file="meta.zcml" />
+           <ext:registerMimeFactories module="%s" lazy="yes" %s />
+           %s
+        </configure>
+        """
+
+    def _config(self, manifest='', extra=''):
+        xmlconfig.string(self.LAZY_TMPL % (__name__, manifest, extra))
+
+    def test_registered_when_needed(self):
+        from nti.externalization.internalization import find_factory_for
+
+        class O(object):
+            __external_can_create__ = True
+            mimeType = 'application/foo'
+
+        self._addFactory(O)
+        self._config()
+        gsm = component.getGlobalSiteManager()
+        assert_that(list(gsm.registeredUtilities()), is_empty())
+
+        factory = find_factory_for({'MimeType': 'application/foo'})
+        assert_that(factory, has_property('_callable', same_instance(O)))
+        assert_that(factory, has_property('title', 'Factory'))
+        assert_that(gsm.getUtility(IMimeObjectFactory, 'application/foo'),
+                    is_(same_instance(factory)))
+        assert_that(find_factory_for({'MimeType': 'application/foo'}),
+                    is_(same_instance(factory)))
+        assert_that(find_factory_for({'MimeType': 'application/bar'}), is_(none()))
+
+    def test_registered_in_configured_site(self):
+        from zope.interface.registry import Components
+        from nti.externalization.internalization import find_factory_for
+
+        class O(object):
+            __external_can_create__ = True
+            mimeType = 'application/foo'
+
+        self._addFactory(O)
+        gsm = component.getGlobalSiteManager()
+        site = Components('site', bases=(gsm,))
+        component.getSiteManager.sethook(lambda context=None: site)
+        try:
+            self._config()
+        finally:
+            component.getSiteManager.reset()
+
+        # Not visible outside the site, even once it's registered.
+        assert_that(find_factory_for({'MimeType': 'application/foo'}), is_(none()))
+        assert_that(site.getUtility(IMimeObjectFactory, 'application/foo'),
+                    has_property('_callable', same_instance(O)))
+        assert_that(gsm.queryUtility(IMimeObjectFactory, 'application/foo'), is_(none()))
+
+        component.getSiteManager.sethook(lambda context=None: site)
+        try:
+            factory = find_factory_for({'MimeType': 'application/foo'})
+        finally:
+            component.getSiteManager.reset()
+        assert_that(factory, has_property('_callable', same_instance(O)))
+
+    def test_manifest(self):
+        import os
+        import tempfile
+        from nti.externalization.autopackage import _manifests
+        from nti.externalization.internalization import find_factory_for
+
+        class O(object):
+            __external_can_create__ = True
+            mimeType = 'application/foo'
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'manifest.json')
+        manifest = 'manifest="%s"' % path
+
+        self._addFactory(O)
+        self._config(manifest)
+        assert_that(os.path.exists(path), is_(True))
+        factory = find_factory_for({'MimeType': 'application/foo'})
+        assert_that(factory, has_property('_callable', same_instance(O)))
+
+        # A new process uses what the manifest recorded, without
+        # examining the module.
+        self.cleanUp()
+        self.setUp()
+        _manifests.clear()
+
+        class P(object):
+            mimeType = 'application/foo'
+
+        setattr(self._getModule(), 'Factory', P)
+        self._config(manifest)
+        # But the factory must still be creatable when it's used.
+        with self.assertRaises(TypeError):
+            find_factory_for({'MimeType': 'application/foo'})
+
+    def test_conflicts_with_eager(self):
+        from zope.configuration.config import ConfigurationConflictError
+
+        class O(object):
+            __external_can_create__ = True
+            mimeType = 'application/foo'
+
+        self._addFactory(O)
+        with self.assertRaises(ConfigurationConflictError):
+            self._config(extra='<ext:registerMimeFactories module="%s" />' % __name__)
+
+    def test_conflicts_within_module(self):
+        from zope.configuration.config import ConfigurationConflictError
+
+        class O(object):
+            __external_can_create__ = True
+            mimeType = 'application/foo'
+
+        class P(object):
+            __external_can_create__ = True
+            mimeType = O.mimeType
+
+        self._addFactory(O)
+        self._addFactory(P, 'Factory2')
+        with self.assertRaises(ConfigurationConflictError):
+            self._config()
+
+
 class IExtRoot(interface.Interface):
     pass
 
@@ -263,6 +394,59 @@ class TestAutoPackageZCML(PlacelessSetup,
         factory = gsm.getUtility(_ILegacySearchModuleFactory, 'O')
         assert_that(factory, is_(same_instance(O)))
 
+    def test_scan_package_manifest(self):
+        import json
+        import os
+        import tempfile
+
+        from nti.externalization.autopackage import _manifests
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'manifest.json')
+        zcml = self.SCAN_THIS_MODULE.replace(
+            'register_legacy_search_module="yes"',
+            'manifest="%s"' % path)
+
+        @interface.implementer(IExtRoot)
+        class O(object):
+            pass
+
+        self._addFactory(O)
+        xmlconfig.string(zcml)
+        assert_that(O, has_property('mimeType', 'application/vnd.nextthought.tests.o'))
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)['entries']
+        assert_that(entries, has_length(1))
+        value, = [entry['value'] for entry in entries.values()]
+        assert_that(value, is_({__name__: ['Factory']}))
+
+        # Loading again (as a new process would) examines only the
+        # recorded class, not the new one.
+        @interface.implementer(IExtRoot)
+        class P(object):
+            pass
+
+        self._addFactory(P, 'Other')
+        _manifests.clear()
+        xmlconfig.string(zcml)
+        gsm = component.getGlobalSiteManager()
+        assert_that(gsm.queryUtility(IMimeObjectFactory, 'application/vnd.nextthought.tests.o'),
+                    is_not(none()))
+        self.assertNotIn('mimeType', P.__dict__)
+
+        # If the files have changed, everything is examined again.
+        for entry in entries.values():
+            entry['stamp'] = []
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'entries': entries}, f)
+        _manifests.clear()
+        xmlconfig.string(zcml)
+        assert_that(P, has_property('mimeType', 'application/vnd.nextthought.tests.p'))
+        assert_that(gsm.queryUtility(IMimeObjectFactory, 'application/vnd.nextthought.tests.p'),
+                    is_not(none()))
+
+
 class TestClassObjectFactory(PlacelessSetup,
                              RegistrationMixin,
                              unittest.TestCase):
@@ -15,6 +15,8 @@ Example (non-sensical) of all the directives:
         <include package="nti.externalization" file="meta.zcml" />
 
         <ext:registerMimeFactories module="the.module" />
+        <ext:registerMimeFactories module="other_module.things"
+            lazy="yes" manifest="var/mime-factories.json" />
 
         <ext:registerAutoPackageIO
             root_interfaces="other_module.interfaces.IExtRoot"
@@ -41,22 +43,26 @@ import logging
 
 from zope import interface
 from zope.component import zcml as component_zcml
+from zope.schema import TextLine
 from zope.configuration.fields import Bool
 from zope.configuration.fields import GlobalInterface
 from zope.configuration.fields import GlobalObject
 from zope.configuration.fields import Tokens
 from zope.configuration.fields import MessageID
+from zope.configuration.fields import Path
 from zope.configuration.fields import PythonIdentifier
 
 from ._compat import TRACE
 from .interfaces import _ILegacySearchModuleFactory
 from .autopackage import AutoPackageSearchingScopedInterfaceObjectIO
+from .autopackage import get_manifest
 from .factory import MimeObjectFactory
 from .factory import ClassObjectFactory
 from .factory import AnonymousObjectFactory
 from .interfaces import IMimeObjectFactory
 from .interfaces import IClassObjectFactory
 from .interfaces import IAnonymousObjectFactory
+from .internalization.factories import _add_lazy_mime_factory
 from .internalization.legacy_factories import find_factories_in_module
 
 __docformat__ = "restructuredtext en"
@@ -87,18 +93,44 @@ class IRegisterInternalizationMimeFactoriesDirective(interface.Interface):
 
     Factories are discovered using `.find_factories_in_module`.
 
+    If *lazy* is true, only the MIME types and the names of their
+    factories are recorded; the factory for a MIME type is imported,
+    and registered in the site manager the directive was executed
+    in, the first time it is needed. Finding the MIME types still
+    means importing *module*, unless they were recorded in the
+    *manifest* by an earlier load and the module's source file
+    hasn't changed since.
+
     See :func:`nti.externalization.internalization.find_factory_for`
     for how factories are used.
 
+    .. versionchanged:: 3.4.0
+       Add the *lazy* and *manifest* arguments. *module* is no
+       longer imported when the directive is parsed.
     """
 
-    module = GlobalObject(
+    module = TextLine(
         title="Module to scan for Mime factories to add",
+        description="The dotted name of the module, which may be relative to the package.",
         required=True,
     )
 
+    lazy = Bool(
+        title="Defer importing and registering the factories until they are needed.",
+        default=False,
+        required=False,
+    )
 
-def registerMimeFactories(_context, module):
+    manifest = Path(
+        title="If given with *lazy*, a file that records the MIME types found in *module*.",
+        description=("Later loads use the recorded MIME types instead of importing "
+                     "*module*. The file is created if needed. "
+                     "See `.AutoPackageManifest`."),
+        required=False,
+    )
+
+
+def _find_mime_factories(module):
     for object_name, value in find_factories_in_module(module, case_sensitive=True):
         __traceback_info__ = object_name, value
 
@@ -111,6 +143,23 @@ def registerMimeFactories(_context, module):
                 continue
 
         if mime_type:
+            yield object_name, value, mime_type
+
+
+def _absolute_module_name(_context, module):
+    # The names that _context.resolve() accepts, without importing them.
+    if not isinstance(module, str):
+        return module.__name__
+    if module.startswith('.'):
+        return _context.package.__name__ + (module if module != '.' else '')
+    return module
+
+
+def registerMimeFactories(_context, module, lazy=False, manifest=None):
+    if not lazy:
+        if isinstance(module, str):
+            module = _context.resolve(module)
+        for object_name, value, mime_type in _find_mime_factories(module):
             logger.log(TRACE,
                        "Registered mime factory utility %s = %s (%s)",
                        object_name, value, mime_type)
@@ -121,6 +170,33 @@ def registerMimeFactories(_context, module):
                                    provides=IMimeObjectFactory,
                                    component=factory,
                                    name=mime_type)
+        return
+
+    module_name = _absolute_module_name(_context, module)
+    found = stamp = None
+    if manifest:
+        manifest = get_manifest(manifest)
+        key = 'registerMimeFactories:' + module_name
+        stamp = manifest.stamp([module_name])
+        found = manifest.get(key, stamp)
+    if found is None:
+        module = _context.resolve(module_name)
+        found = [[mime_type, module_name + '.' + object_name]
+                 for object_name, _, mime_type in _find_mime_factories(module)]
+        if manifest:
+            manifest.set(key, stamp, found)
+
+    for mime_type, factory_name in found:
+        logger.log(TRACE,
+                   "Registered lazy mime factory %s (%s)",
+                   factory_name, mime_type)
+        # Use the same discriminator as the utility registered
+        # eagerly, so that conflicts are still found.
+        _context.action(
+            discriminator=('utility', IMimeObjectFactory, mime_type),
+            callable=_add_lazy_mime_factory,
+            args=(mime_type, factory_name),
+        )
 
 
 class IAutoPackageExternalizationDirective(interface.Interface):
@@ -143,6 +219,9 @@ class IAutoPackageExternalizationDirective(interface.Interface):
        Add the *register_legacy_search_module* keyword argument, defaulting to
        False. Previously legacy search modules would always be registered, but
        now you must explicitly ask for it.
+
+    .. versionchanged:: 3.4.0
+       Add the *manifest* argument.
     """
 
     root_interfaces = Tokens(
@@ -181,10 +260,20 @@ class IAutoPackageExternalizationDirective(interface.Interface):
         required=False,
     )
 
+    manifest = Path(
+        title="If given, a file that records the classes found in the *modules*.",
+        description=("Later loads examine only the recorded classes instead of every "
+                     "class in the *modules*, as long as the source files involved haven't "
+                     "changed. The file is created if needed. "
+                     "See `.AutoPackageManifest`."),
+        required=False,
+    )
+
 
 def autoPackageExternalization(_context, root_interfaces, modules,
                                factory_modules=None, iobase=None,
-                               register_legacy_search_module=False):
+                               register_legacy_search_module=False,
+                               manifest=None):
     # TODO: Simplify this method; refactor inta parts
     # pylint:disable=too-many-locals
     ext_module_name = root_interfaces[0].__module__
@@ -211,6 +300,8 @@ def autoPackageExternalization(_context, root_interfaces, modules,
         '_ap_enumerate_module_names': _ap_enumerate_module_names,
         '_ap_enumerate_externalizable_root_interfaces': _ap_enumerate_externalizable_root_interfaces
     }
+    if manifest:
+        cls_dict['_ap_manifest'] = get_manifest(manifest)
 
     bases = (AutoPackageSearchingScopedInterfaceObjectIO,)
     if iobase: